@@ -4,11 +4,21 @@ import logging
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, ElementClickInterceptedException, NoSuchElementException
 from selenium.webdriver.common.action_chains import ActionChains
 from dotenv import load_dotenv
+from log_setup import make_log, setup_logging
+from budget import expired as budget_expired
+from failure_capture import capture_failure
+from form_fill import fill_selects
+from grid import get_backend
+from recycling import DriverRecycler
+from network_observer import GENERATE_DESCRIPTION_PATTERN, get_observer
+from locators import Locator, clickable
+from text_index import find_by_text
+from timeouts import AdvisedWait, WaitChain
+from wizard import Step, Wizard, call
 
 load_dotenv()
 
@@ -16,40 +26,42 @@ USERNAME_Clt = os.getenv("USERNAME_Clt")
 PASSWORD = os.getenv("PASSWORD")
 LOGIN_URL = "https://preprod.kwiks.io/login"
 
-if not USERNAME_Clt or not PASSWORD:
-    print("[ERROR] USERNAME_Clt or PASSWORD environment variable is not set. Please check your .env file.")
-    exit(1)
+
+def check_credentials():
+    """True if the client account is configured (checked by main(), so the module stays importable)."""
+    if not USERNAME_Clt or not PASSWORD:
+        print("[ERROR] USERNAME_Clt or PASSWORD environment variable is not set. Please check your .env file.")
+        return False
+    return True
+
 
 # --- LOGGING SETUP ---
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+# setup_logging() runs in main(): importing this module leaves the importer's logging alone
 logger = logging.getLogger(__name__)
+log = make_log(logger)
 
-def log(msg, level="INFO"):
-    timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-    if level == "ERROR":
-        logger.error(f"[{timestamp}] {msg}")
-    elif level == "WARNING":
-        logger.warning(f"[{timestamp}] {msg}")
-    else:
-        logger.info(f"[{timestamp}] {msg}")
+ADD_NEW_MISSION = Locator("add new mission", role="*")
 
 def safe_click(driver, element, max_retries=3):
     for attempt in range(max_retries):
+        if attempt and budget_expired():
+            log("Time budget exhausted, giving up on click", "ERROR")
+            break
         try:
             if not element.is_displayed():
-                log(f"Element not displayed on attempt {attempt + 1}", "WARNING")
+                log("Element not displayed on attempt %d", "WARNING", attempt + 1)
                 time.sleep(0.5)
                 continue
             
             driver.execute_script("arguments[0].scrollIntoView({block: 'center', inline: 'center', behavior: 'smooth'});", element)
             time.sleep(0.5)
-            WebDriverWait(driver, 5).until(EC.element_to_be_clickable(element))
-            log(f"Successfully clicked element on attempt {attempt + 1}")
+            AdvisedWait(driver, "safe_click", 5).until(EC.element_to_be_clickable(element))
+            log("Successfully clicked element on attempt %d", "INFO", attempt + 1)
             element.click()
             return True
             
         except ElementClickInterceptedException:
-            log(f"Click intercepted, trying ActionChains (attempt {attempt + 1})", "WARNING")
+            log("Click intercepted, trying ActionChains (attempt %d)", "WARNING", attempt + 1)
             try:
                 ActionChains(driver).move_to_element(element).click().perform()
                 log("Clicked element with ActionChains")
@@ -61,13 +73,14 @@ def safe_click(driver, element, max_retries=3):
                     log("Clicked element with JavaScript")
                     return True
                 except Exception as js_error:
-                    log(f"JavaScript click failed: {js_error}", "ERROR")
+                    log("JavaScript click failed: %s", "ERROR", js_error)
         except Exception as e:
-            log(f"Click attempt {attempt + 1} failed: {e}", "WARNING")
+            log("Click attempt %d failed: %s", "WARNING", attempt + 1, e)
             if attempt < max_retries - 1:
                 time.sleep(1)
     
     log("All click attempts failed", "ERROR")
+    capture_failure(driver, "safe_click exhausted retries")
     return False
 
 def login(driver):
@@ -88,17 +101,18 @@ def login(driver):
             (By.CSS_SELECTOR, "input[placeholder*='Email']"),
         ]
         email_elem = None
-        for by, value in email_selectors:
-            try:
-                email_elem = WebDriverWait(driver, 8).until(
-                    EC.presence_of_element_located((by, value))
-                )
-                log(f"Found email field with selector: {by}={value}")
-                email_elem.clear()
-                email_elem.send_keys(USERNAME_Clt)
-                break
-            except TimeoutException:
-                continue
+        with WaitChain(driver, "add_mission.login.email", 8) as chain:
+            for by, value in email_selectors:
+                try:
+                    email_elem = chain.until(
+                        EC.presence_of_element_located((by, value))
+                    )
+                    log("Found email field with selector: %s=%s", "INFO", by, value)
+                    email_elem.clear()
+                    email_elem.send_keys(USERNAME_Clt)
+                    break
+                except TimeoutException:
+                    continue
         if not email_elem:
             log("Could not find the email input field", "ERROR")
             return False
@@ -112,17 +126,18 @@ def login(driver):
             (By.CSS_SELECTOR, "input[placeholder*='Password']"),
         ]
         password_elem = None
-        for by, value in password_selectors:
-            try:
-                password_elem = WebDriverWait(driver, 8).until(
-                    EC.presence_of_element_located((by, value))
-                )
-                log(f"Found password field with selector: {by}={value}")
-                password_elem.clear()
-                password_elem.send_keys(PASSWORD)
-                break
-            except TimeoutException:
-                continue
+        with WaitChain(driver, "add_mission.login.password", 8) as chain:
+            for by, value in password_selectors:
+                try:
+                    password_elem = chain.until(
+                        EC.presence_of_element_located((by, value))
+                    )
+                    log("Found password field with selector: %s=%s", "INFO", by, value)
+                    password_elem.clear()
+                    password_elem.send_keys(PASSWORD)
+                    break
+                except TimeoutException:
+                    continue
         if not password_elem:
             log("Could not find the password input field", "ERROR")
             return False
@@ -135,15 +150,16 @@ def login(driver):
             (By.XPATH, "//button[contains(text(), 'Sign in') or contains(text(), 'Sign In')]")
         ]
         login_button = None
-        for by, value in login_button_selectors:
-            try:
-                login_button = WebDriverWait(driver, 1).until(
-                    EC.element_to_be_clickable((by, value))
-                )
-                log(f"Found login button with selector: {by}={value}")
-                break
-            except TimeoutException:
-                continue
+        with WaitChain(driver, "add_mission.login.button", 1) as chain:
+            for by, value in login_button_selectors:
+                try:
+                    login_button = chain.until(
+                        EC.element_to_be_clickable((by, value))
+                    )
+                    log("Found login button with selector: %s=%s", "INFO", by, value)
+                    break
+                except TimeoutException:
+                    continue
 
         # Fallback – press ENTER on password field if button not found
         if login_button:
@@ -157,12 +173,12 @@ def login(driver):
             password_elem.send_keys(Keys.RETURN)
 
         # Wait a moment for navigation to happen
-        WebDriverWait(driver, 10).until(lambda d: d.current_url != LOGIN_URL)
+        AdvisedWait(driver, "add_mission.login.redirect", 10).until(lambda d: d.current_url != LOGIN_URL)
         log("Login successful (URL changed)")
         return True
 
     except Exception as e:
-        log(f"Login failed: {e}", "ERROR")
+        log("Login failed: %s", "ERROR", e)
         return False
 
 def click_add_new_mission(driver, timeout=15):
@@ -179,51 +195,54 @@ def click_add_new_mission(driver, timeout=15):
             "//p[contains(text(), 'Add New Hiring Process')]/ancestor::*[self::button or @role='button'][1]",  # Clickable ancestor of <p>
             "//*[contains(@class, 'add-mission') or contains(@id, 'add-mission')]",
             "//button[contains(@aria-label, 'Add New Hiring Process')]",
-            "//*[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'add new mission')]"
+            ADD_NEW_MISSION,
         ]
         
-        for selector in selectors:
-            try:
-                log(f"Trying selector: {selector}")
-                element = WebDriverWait(driver, timeout).until(
-                    EC.element_to_be_clickable((By.XPATH, selector))
-                )
+        with WaitChain(driver, "add_mission.add_new_mission", timeout) as chain:
+            for selector in selectors:
+                try:
+                    log("Trying selector: %s", "INFO", selector)
+                    condition = (clickable(selector, page="dashboard") if isinstance(selector, Locator)
+                                 else EC.element_to_be_clickable((By.XPATH, selector)))
+                    element = chain.until(condition)
                 
-                if safe_click(driver, element):
-                    log("Successfully clicked 'Add New Mission' button")
-                    return True
+                    if safe_click(driver, element):
+                        log("Successfully clicked 'Add New Mission' button")
+                        return True
                     
-            except TimeoutException:
-                log(f"Selector '{selector}' not found or not clickable", "WARNING")
-                continue
-            except Exception as e:
-                log(f"Error with selector '{selector}': {e}", "WARNING")
-                continue
+                except TimeoutException:
+                    log("Selector '%s' not found or not clickable", "WARNING", selector)
+                    continue
+                except Exception as e:
+                    log("Error with selector '%s': %s", "WARNING", selector, e)
+                    continue
         
         # If none of the common selectors work, try to find by partial text match
         try:
             log("Trying to find button by partial text match")
-            all_clickable_elements = driver.find_elements(By.XPATH, "//button | //a | //div[@role='button'] | //p")
+            # One script call collects every candidate's text; only hits come back as elements.
+            # Same test as before: "add" and "mission" anywhere in the text, any case, tried in page order
+            matches = find_by_text(driver, "mission", mode="substring",
+                                   css="button, a, div[role='button'], p", limit=None, document_order=True)
+            matches = [(element, text) for element, text in matches if "add" in text.lower()]
             
-            for element in all_clickable_elements:
+            for element, element_text in matches:
                 try:
-                    element_text = element.text.lower()
-                    if "add" in element_text and "mission" in element_text:
-                        log(f"Found potential 'Add New Mission' element with text: '{element.text}'")
-                        if safe_click(driver, element):
-                            log("Successfully clicked 'Add New Mission' button via text search")
-                            return True
+                    log("Found potential 'Add New Mission' element with text: '%s'", "INFO", element_text)
+                    if safe_click(driver, element):
+                        log("Successfully clicked 'Add New Mission' button via text search")
+                        return True
                 except Exception:
                     continue
                     
         except Exception as e:
-            log(f"Error during text-based search: {e}", "WARNING")
+            log("Error during text-based search: %s", "WARNING", e)
         
         log("Could not find 'Add New Mission' button", "ERROR")
         return False
         
     except Exception as e:
-        log(f"Failed to click 'Add New Mission': {e}", "ERROR")
+        log("Failed to click 'Add New Mission': %s", "ERROR", e)
         return False
 
 def safe_send_keys(driver, element, text, clear_first=True):
@@ -242,10 +261,10 @@ def safe_send_keys(driver, element, text, clear_first=True):
         for ch in text:
             element.send_keys(ch)
             time.sleep(0.01)
-        log(f"Successfully sent keys (first 30 chars): {text[:30]}")
+        log("Successfully sent keys (first 30 chars): %.30s", "INFO", text)
         return True
     except Exception as e:
-        log(f"Failed to send keys: {e}", "ERROR")
+        log("Failed to send keys: %s", "ERROR", e)
         return False
 
 def fill_job_title_and_generate_description(driver, job_title="Analyst Engineer Test", timeout=15):
@@ -260,15 +279,16 @@ def fill_job_title_and_generate_description(driver, job_title="Analyst Engineer
             "//label[contains(text(), 'Job Title')]/following::*[self::input or @role='textbox'][1]"
         ]
         title_input = None
-        for selector in input_selectors:
-            try:
-                log(f"Trying Job Title selector: {selector}")
-                title_input = WebDriverWait(driver, timeout).until(
-                    EC.visibility_of_element_located((By.XPATH, selector))
-                )
-                break
-            except TimeoutException:
-                continue
+        with WaitChain(driver, "add_mission.job_title", timeout) as chain:
+            for selector in input_selectors:
+                try:
+                    log("Trying Job Title selector: %s", "INFO", selector)
+                    title_input = chain.until(
+                        EC.visibility_of_element_located((By.XPATH, selector))
+                    )
+                    break
+                except TimeoutException:
+                    continue
         if not title_input:
             log("Could not find the Job Title input field", "ERROR")
             return False
@@ -278,7 +298,7 @@ def fill_job_title_and_generate_description(driver, job_title="Analyst Engineer
         time.sleep(0.3)
         title_input.clear()
         title_input.send_keys(job_title)
-        log(f"Entered job title: {job_title}")
+        log("Entered job title: %s", "INFO", job_title)
 
         # Locate Generate Description button
         log("Looking for 'Generate Description' button")
@@ -288,15 +308,16 @@ def fill_job_title_and_generate_description(driver, job_title="Analyst Engineer
             "//span[contains(text(), 'Generate Description')]/ancestor::button"
         ]
         gen_button = None
-        for selector in button_selectors:
-            try:
-                log(f"Trying Generate Description selector: {selector}")
-                gen_button = WebDriverWait(driver, timeout).until(
-                    EC.element_to_be_clickable((By.XPATH, selector))
-                )
-                break
-            except TimeoutException:
-                continue
+        with WaitChain(driver, "add_mission.generate_description", timeout) as chain:
+            for selector in button_selectors:
+                try:
+                    log("Trying Generate Description selector: %s", "INFO", selector)
+                    gen_button = chain.until(
+                        EC.element_to_be_clickable((By.XPATH, selector))
+                    )
+                    break
+                except TimeoutException:
+                    continue
         if not gen_button:
             log("Could not find Generate Description button", "ERROR")
             return False
@@ -312,20 +333,21 @@ def fill_job_title_and_generate_description(driver, job_title="Analyst Engineer
 
             # Locate the description textarea
             textarea_selectors = [
-                "//textarea[@placeholder='short description..']", 
-                "//textarea[contains(translate(@placeholder, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'description')]",  # any description placeholder
-                "//textarea",
+                (By.XPATH, "//textarea[@placeholder='short description..']"),
+                (By.CSS_SELECTOR, "textarea[placeholder*='description' i]"),  # any description placeholder
+                (By.XPATH, "//textarea"),
             ]
             description_elem = None
-            for selector in textarea_selectors:
-                try:
-                    log(f"Trying description textarea selector: {selector}")
-                    description_elem = WebDriverWait(driver, timeout).until(
-                        EC.visibility_of_element_located((By.XPATH, selector))
-                    )
-                    break
-                except TimeoutException:
-                    continue
+            with WaitChain(driver, "add_mission.description", timeout) as chain:
+                for by, selector in textarea_selectors:
+                    try:
+                        log("Trying description textarea selector: %s", "INFO", selector)
+                        description_elem = chain.until(
+                            EC.visibility_of_element_located((by, selector))
+                        )
+                        break
+                    except TimeoutException:
+                        continue
 
             if not description_elem:
                 log("Could not find description textarea", "ERROR")
@@ -344,24 +366,32 @@ def fill_job_title_and_generate_description(driver, job_title="Analyst Engineer
             ]
 
             final_generate_button = None
-            for selector in final_generate_selectors:
-                try:
-                    log(f"Trying final Generate selector: {selector}")
-                    final_generate_button = WebDriverWait(driver, timeout).until(
-                        EC.element_to_be_clickable((By.XPATH, selector))
-                    )
-                    break
-                except TimeoutException:
-                    continue
+            with WaitChain(driver, "add_mission.generate", timeout) as chain:
+                for selector in final_generate_selectors:
+                    try:
+                        log("Trying final Generate selector: %s", "INFO", selector)
+                        final_generate_button = chain.until(
+                            EC.element_to_be_clickable((By.XPATH, selector))
+                        )
+                        break
+                    except TimeoutException:
+                        continue
 
             if not final_generate_button:
                 log("Could not find final Generate button", "ERROR")
                 return False
 
+            observer = get_observer(driver)
+            since = observer.mark()
             if safe_click(driver, final_generate_button):
                 log("Clicked final 'Generate' button")
-                # Wait 10 seconds before proceeding to the Next Step
-                time.sleep(5)
+                # Continue as soon as the description-generation call answers
+                # (falls back to the old 5 s pause if no such call is seen)
+                generation = observer.wait_for_request(
+                    GENERATE_DESCRIPTION_PATTERN, since=since, start_timeout=5, finish_timeout=60,
+                    name="generate_description")
+                if generation is None and not observer.available:
+                    time.sleep(5)
 
                 # After generation, proceed by clicking 'Next Step'
                 next_step_selectors = [
@@ -369,15 +399,16 @@ def fill_job_title_and_generate_description(driver, job_title="Analyst Engineer
                     "//span[contains(text(), 'Next Step')]/ancestor::button[1]"
                 ]
                 next_button = None
-                for selector in next_step_selectors:
-                    try:
-                        log(f"Trying Next Step selector: {selector}")
-                        next_button = WebDriverWait(driver, timeout).until(
-                            EC.element_to_be_clickable((By.XPATH, selector))
-                        )
-                        break
-                    except TimeoutException:
-                        continue
+                with WaitChain(driver, "add_mission.job_title.next_step", timeout) as chain:
+                    for selector in next_step_selectors:
+                        try:
+                            log("Trying Next Step selector: %s", "INFO", selector)
+                            next_button = chain.until(
+                                EC.element_to_be_clickable((By.XPATH, selector))
+                            )
+                            break
+                        except TimeoutException:
+                            continue
 
                 if next_button and safe_click(driver, next_button):
                     log("Clicked 'Next Step' button, waiting 2 seconds before next actions")
@@ -394,42 +425,9 @@ def fill_job_title_and_generate_description(driver, job_title="Analyst Engineer
             return False
 
     except Exception as e:
-        log(f"Error in fill_job_title_and_generate_description: {e}", "ERROR")
+        log("Error in fill_job_title_and_generate_description: %s", "ERROR", e)
         return False
 
-def select_dropdown_option(driver, dropdown_label, option_text, timeout=15):
-    """Open a react-select style combobox by label text and choose option_text."""
-    try:
-        label = WebDriverWait(driver, timeout).until(
-            EC.presence_of_element_located((By.XPATH, f"//p[text()='{dropdown_label}'] | //label[text()='{dropdown_label}']"))
-        )
-        driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", label)
-        time.sleep(0.3)
-        combobox_input = label.find_element(By.XPATH, "following::*//input[@role='combobox']")
-        combobox_input.click()
-        time.sleep(0.3)
-        combobox_input.send_keys(option_text)
-
-        # Build XPath for option, choosing quote type that doesn't conflict with the value
-        if "'" in option_text and '"' not in option_text:
-            option_xpath = f'//div[@role="option" and normalize-space()="{option_text}"]'
-        else:
-            option_xpath = f"//div[@role='option' and normalize-space()='{option_text}']"
-
-        # Wait for option to appear and click it safely
-        option = WebDriverWait(driver, timeout).until(
-            EC.element_to_be_clickable((By.XPATH, option_xpath))
-        )
-        if not safe_click(driver, option):
-            log(f"Safe click failed for option {option_text}", "ERROR")
-            return False
-        log(f"Selected '{option_text}' for '{dropdown_label}'")
-        return True
-    except Exception as e:
-        log(f"Failed to select '{option_text}' for '{dropdown_label}': {e}", "ERROR")
-        return False
-
-
 def set_work_model_and_location(driver, work_model="On-Site", country="Morocco", city="Casablanca", timeout=15):
     """Set Work Model radio and choose Country & City in the next step"""
     try:
@@ -437,30 +435,28 @@ def set_work_model_and_location(driver, work_model="On-Site", country="Morocco",
         time.sleep(1)
         # Removed noisy INFO log
         work_model_selectors = [
-            f"//span[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), '{work_model.lower()}')]/ancestor::*[self::label or self::div or self::button][1]",
+            Locator(work_model, css="span", closest="label, div, button"),
             f"//*[contains(text(), '{work_model}')]/preceding::span[@class='chakra-radio__control'][1]",
         ]
         work_elem = None
-        for selector in work_model_selectors:
-            try:
-                # Reduced noisy logs
-                work_elem = WebDriverWait(driver, timeout).until(
-                    EC.element_to_be_clickable((By.XPATH, selector))
-                )
-                if safe_click(driver, work_elem):
-                    log(f"Selected Work Model: {work_model}")
-                    break
-            except TimeoutException:
-                continue
+        with WaitChain(driver, "add_mission.work_model", timeout) as chain:
+            for selector in work_model_selectors:
+                try:
+                    # Reduced noisy logs
+                    condition = (clickable(selector, page="work_model") if isinstance(selector, Locator)
+                                 else EC.element_to_be_clickable((By.XPATH, selector)))
+                    work_elem = chain.until(condition)
+                    if safe_click(driver, work_elem):
+                        log("Selected Work Model: %s", "INFO", work_model)
+                        break
+                except TimeoutException:
+                    continue
         if not work_elem:
             log("Could not find Work Model option", "ERROR")
             return False
 
-        # Select Country
-        if not select_dropdown_option(driver, "Country", country, timeout):
-            return False
-        # Select City
-        if not select_dropdown_option(driver, "City", city, timeout):
+        # Select Country, then City (its options depend on the country)
+        if not all(fill_selects(driver, {"Country": country, "City": city}, wait=timeout).values()):
             return False
 
         log("Work model and location filled, clicking 'Next Step'")
@@ -471,15 +467,16 @@ def set_work_model_and_location(driver, work_model="On-Site", country="Morocco",
             "//span[contains(text(), 'Next Step')]/ancestor::button[1]"
         ]
         next_button = None
-        for selector in next_step_selectors:
-            try:
-                # Reduced noisy logs
-                next_button = WebDriverWait(driver, timeout).until(
-                    EC.element_to_be_clickable((By.XPATH, selector))
-                )
-                break
-            except TimeoutException:
-                continue
+        with WaitChain(driver, "add_mission.work_model.next_step", timeout) as chain:
+            for selector in next_step_selectors:
+                try:
+                    # Reduced noisy logs
+                    next_button = chain.until(
+                        EC.element_to_be_clickable((By.XPATH, selector))
+                    )
+                    break
+                except TimeoutException:
+                    continue
 
         if next_button and safe_click(driver, next_button):
             log("Clicked 'Next Step' button after location, waiting 2 seconds")
@@ -490,46 +487,42 @@ def set_work_model_and_location(driver, work_model="On-Site", country="Morocco",
             return False
 
     except Exception as e:
-        log(f"Error in set_work_model_and_location: {e}", "ERROR")
+        log("Error in set_work_model_and_location: %s", "ERROR", e)
         return False
 
 def set_business_details(driver, timeout=15):
     """Fill Business Line, Skills, Education, Salary, Contract, click Add and Next Step"""
     try:
-        time.sleep(1)
-        # Business Line
-        if not select_dropdown_option(driver, "Business Line", "Information Technology & Software", timeout):
+        # Business Line, Skills and Education in one pass
+        selections = fill_selects(driver, {
+            "Business Line": "Information Technology & Software",
+            "Skills": "IT",
+            "Education Level": "Bachelor's Degree (e.g., BA, BSc, BEng)",
+        }, wait=timeout)
+        if not all(selections.values()):
             return False
-        time.sleep(1)
-        # Skills
-        if not select_dropdown_option(driver, "Skills", "IT", timeout):
-            return False
-        time.sleep(1)
-        # Education
-        if not select_dropdown_option(driver, "Education Level", "Bachelor's Degree (e.g., BA, BSc, BEng)", timeout):
-            return False
-        time.sleep(1)
         # Salary – try to locate a single salary input
         salary_selectors = [
             "//input[contains(@placeholder, 'Salary')]",
         ]
         salary_elem = None
-        for sel in salary_selectors:
-            try:
-                log(f"Trying Salary selector: {sel}")
-                salary_elem = WebDriverWait(driver, timeout).until(
-                    EC.visibility_of_element_located((By.XPATH, sel))
-                )
-                break
-            except TimeoutException:
-                continue
+        with WaitChain(driver, "add_mission.salary", timeout) as chain:
+            for sel in salary_selectors:
+                try:
+                    log("Trying Salary selector: %s", "INFO", sel)
+                    salary_elem = chain.until(
+                        EC.visibility_of_element_located((By.XPATH, sel))
+                    )
+                    break
+                except TimeoutException:
+                    continue
         if not salary_elem:
             log("Could not find Salary input", "ERROR")
             return False
         if not safe_send_keys(driver, salary_elem, "10000 dh"):
             return False
-        # Contract
-        if not select_dropdown_option(driver, "Contract", "Fixed-Term Contract", timeout):
+        # Contract after Salary, as the form expects
+        if not all(fill_selects(driver, {"Contract": "Fixed-Term Contract"}, wait=timeout).values()):
             return False
         # Click Add button
         add_selectors = [
@@ -538,15 +531,16 @@ def set_business_details(driver, timeout=15):
             "//span[contains(normalize-space(), 'Add')]/ancestor::button[1]"
         ]
         add_button = None
-        for sel in add_selectors:
-            try:
-                log(f"Trying Add button selector: {sel}")
-                add_button = WebDriverWait(driver, timeout).until(
-                    EC.element_to_be_clickable((By.XPATH, sel))
-                )
-                break
-            except TimeoutException:
-                continue
+        with WaitChain(driver, "add_mission.add_salary", timeout) as chain:
+            for sel in add_selectors:
+                try:
+                    log("Trying Add button selector: %s", "INFO", sel)
+                    add_button = chain.until(
+                        EC.element_to_be_clickable((By.XPATH, sel))
+                    )
+                    break
+                except TimeoutException:
+                    continue
         if not add_button or not safe_click(driver, add_button):
             log("Failed to click Add button", "ERROR")
             return False
@@ -557,14 +551,15 @@ def set_business_details(driver, timeout=15):
             "//span[contains(text(), 'Next Step')]/ancestor::button[1]"
         ]
         next_button = None
-        for sel in next_selectors:
-            try:
-                next_button = WebDriverWait(driver, timeout).until(
-                    EC.element_to_be_clickable((By.XPATH, sel))
-                )
-                break
-            except TimeoutException:
-                continue
+        with WaitChain(driver, "add_mission.business.next_step", timeout) as chain:
+            for sel in next_selectors:
+                try:
+                    next_button = chain.until(
+                        EC.element_to_be_clickable((By.XPATH, sel))
+                    )
+                    break
+                except TimeoutException:
+                    continue
         if not next_button or not safe_click(driver, next_button):
             log("Failed to click final Next Step", "ERROR")
             return False
@@ -579,14 +574,15 @@ def set_business_details(driver, timeout=15):
             "//button[.//svg and contains(., 'Publish')]"
         ]
         publish_button = None
-        for sel in publish_selectors:
-            try:
-                publish_button = WebDriverWait(driver, timeout).until(
-                    EC.element_to_be_clickable((By.XPATH, sel))
-                )
-                break
-            except TimeoutException:
-                continue
+        with WaitChain(driver, "add_mission.publish", timeout) as chain:
+            for sel in publish_selectors:
+                try:
+                    publish_button = chain.until(
+                        EC.element_to_be_clickable((By.XPATH, sel))
+                    )
+                    break
+                except TimeoutException:
+                    continue
         if publish_button and safe_click(driver, publish_button):
             log("Clicked 'Publish' button")
             return True
@@ -594,56 +590,75 @@ def set_business_details(driver, timeout=15):
             log("Failed to click 'Publish' button", "ERROR")
             return False
     except Exception as e:
-        log(f"Error in set_business_details: {e}", "ERROR")
+        log("Error in set_business_details: %s", "ERROR", e)
         return False
 
+def start_session(driver):
+    """Log a fresh browser in and remember the landing page for later missions."""
+    if not login(driver):
+        log("Login failed", "ERROR")
+        capture_failure(driver, "Login failed")
+        return False
+    log("Login successful, waiting for page to load")
+    time.sleep(3)  # Give page time to fully load
+    driver.home_url = driver.current_url
+    return True
+
+
+def mission_wizard(job_title="Analyst Engineer Test", work_model="On-Site", country="Morocco", city="Casablanca"):
+    """The Add New Mission wizard for the given mission; each helper keeps its own element lookups."""
+    return Wizard("add_mission", [
+        Step("add_new_mission", actions=[call(click_add_new_mission)], timeout=90),
+        Step("job_title_and_description", actions=[call(fill_job_title_and_generate_description, job_title)],
+             timeout=180),
+        Step("work_model_and_location", actions=[call(set_work_model_and_location, work_model, country, city)],
+             timeout=120),
+        Step("business_details", actions=[call(set_business_details)], timeout=120),
+    ])
+
+
+MISSION_WIZARD = mission_wizard()
+
+
+def create_mission(driver):
+    """Run the Add New Mission wizard on a logged-in driver; returns True on success."""
+    result = MISSION_WIZARD.run(driver)
+    log(result.summary(), "INFO" if result.ok else "ERROR")
+    return result.ok
+
+
 def main():
     """Main execution function"""
-    driver = None
+    setup_logging()
+    if not check_credentials():
+        exit(1)
+    # MISSION_COUNT missions run on one browser; RECYCLE_MAX_FLOWS / RECYCLE_MAX_AGE /
+    # RECYCLE_MAX_RSS_MB restart it (and log in again) between missions
+    count = int(os.getenv("MISSION_COUNT", "1"))
+    # Setup Chrome driver (profile from BROWSER_PROFILE_ADD_MISSION / BROWSER_PROFILE, default "full";
+    # remote node from SELENIUM_NODES if set)
+    recycler = DriverRecycler.from_env(
+        lambda: get_backend().create_driver("add_mission", headless=os.getenv("HEADLESS") == "1", capture_network=True),
+        on_start=start_session, name="add_mission")
+    created = 0
     try:
-        # Setup Chrome driver
-        options = webdriver.ChromeOptions()
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        # options.add_argument('--headless')  # Uncomment for headless mode
-        
-        driver = webdriver.Chrome(options=options)
-        driver.maximize_window()
-        
-        # Perform login
-        if login(driver):
-            log("Login successful, waiting for page to load")
-            time.sleep(3)  # Give page time to fully load
-            
-            # Click Add New Mission
-            if click_add_new_mission(driver):
-                log("Successfully navigated to Add New Mission")
-                # Fill job title and generate description
-                if fill_job_title_and_generate_description(driver):
-                    log("Job title filled and description generated")
-                    # After description step completed, set work model and location
-                    if set_work_model_and_location(driver):
-                        log("Work model and location set successfully")
-                        if set_business_details(driver):
-                            log("Business details filled successfully")
-                        else:
-                            log("Failed to fill business details", "ERROR")
-                    else:
-                        log("Failed to set work model or location", "ERROR")
-                else:
-                    log("Failed to fill job title or generate description", "ERROR")
+        for index in range(count):
+            with recycler.flow() as driver:
+                if not recycler.start_ok:
+                    break
+                if not recycler.fresh:
+                    driver.get(driver.home_url)
+                log("Creating mission %d/%d", "INFO", index + 1, count)
+                if create_mission(driver):
+                    created += 1
                 time.sleep(5)  # Keep browser open to see result
-            else:
-                log("Failed to click Add New Mission button", "ERROR")
-        else:
-            log("Login failed", "ERROR")
-            
     except Exception as e:
-        log(f"Main execution error: {e}", "ERROR")
+        log("Main execution error: %s", "ERROR", e)
     finally:
-        if driver:
+        log("Created %d/%d missions; driver recycles: %s", "INFO", created, count, dict(recycler.recycles) or "none")
+        if recycler.driver:
             input("Press Enter to close the browser...")  # Keep browser open for inspection
-            driver.quit()
+        recycler.close()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -2,60 +2,57 @@ import time
 import os
 import logging
 import random
-import google.generativeai as genai
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, ElementClickInterceptedException, NoSuchElementException
 from selenium.webdriver.common.action_chains import ActionChains
 from dotenv import load_dotenv
+from log_setup import make_log, setup_logging
+from budget import expired as budget_expired
+from failure_capture import capture_failure
+from form_fill import fill_selects
+from grid import get_backend
+from llm_client import get_llm_client, llm_configured
+from network_observer import CV_PARSE_PATTERN, CV_UPLOAD_PATTERN
+from run_log import DEFAULT_LOG_PATH, get_run_log, new_session_id, read_events, render_markdown
+from timeouts import AdvisedWait
+from wizard import Step, Wizard
 
 # --- CONFIGURATION ---
 load_dotenv()
 USERNAME_FR = os.getenv("USERNAME_FR")
 PASSWORD = os.getenv("PASSWORD")
 LOGIN_URL = "https://preprod.kwiks.io/auth/login"
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
-if not USERNAME_FR or not PASSWORD:
-    print("[ERROR] USERNAME_FR or PASSWORD environment variable is not set. Please check your .env file.")
-    exit(1)
-
-# Configure Gemini API
-if GEMINI_API_KEY:
-    genai.configure(api_key=GEMINI_API_KEY)
-else:
+if not llm_configured():
     print("[WARNING] GEMINI_API_KEY not set. Will use fallback name generation.")
 
 # --- LOGGING SETUP ---
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+# setup_logging() runs in main(): importing this module leaves the importer's logging alone
 logger = logging.getLogger(__name__)
+log = make_log(logger)
 
-def log(msg, level="INFO"):
-    timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-    if level == "ERROR":
-        logger.error(f"[{timestamp}] {msg}")
-    elif level == "WARNING":
-        logger.warning(f"[{timestamp}] {msg}")
-    else:
-        logger.info(f"[{timestamp}] {msg}")
+def check_credentials():
+    """True if the talent account is configured (checked by main(), so the module stays importable)."""
+    if not USERNAME_FR or not PASSWORD:
+        print("[ERROR] USERNAME_FR or PASSWORD environment variable is not set. Please check your .env file.")
+        return False
+    return True
 
 def generate_random_name():
     """Generate a random first name using Gemini API or fallback."""
-    if GEMINI_API_KEY:
+    if llm_configured():
         try:
-            model = genai.GenerativeModel('gemini-1.5-flash')
             prompt = "Generate a single realistic first name (only the name, no explanation). Make it sound like a real person's name."
-            response = model.generate_content(prompt)
-            name = response.text.strip()
+            name = get_llm_client().generate(prompt, timeout=20).strip()
             # Clean up the response to get just the name
             if name and len(name) < 50:  # Reasonable name length
-                log(f"Generated name using Gemini API: {name}")
+                log("Generated name using Gemini API: %s", "INFO", name)
                 return name
         except Exception as e:
-            log(f"Gemini API failed: {e}", "WARNING")
+            log("Gemini API failed: %s", "WARNING", e)
     
     # Fallback names if Gemini API fails or is not configured
     fallback_names = [
@@ -65,7 +62,7 @@ def generate_random_name():
         "Rowan", "Sage", "Tyler", "Unity", "Vale", "Winter", "Xander", "Yuki", "Zara"
     ]
     fallback_name = random.choice(fallback_names)
-    log(f"Using fallback name: {fallback_name}")
+    log("Using fallback name: %s", "INFO", fallback_name)
     return fallback_name
 
 def find_and_fill_first_name(driver, logger):
@@ -107,19 +104,22 @@ def find_and_fill_first_name(driver, logger):
 
 def safe_click(driver, element, max_retries=3):
     for attempt in range(max_retries):
+        if attempt and budget_expired():
+            log("Time budget exhausted, giving up on click", "ERROR")
+            break
         try:
             if not element.is_displayed():
-                log(f"Element not displayed on attempt {attempt + 1}", "WARNING")
+                log("Element not displayed on attempt %d", "WARNING", attempt + 1)
                 time.sleep(0.5)
                 continue
             driver.execute_script("arguments[0].scrollIntoView({block: 'center', inline: 'center', behavior: 'smooth'});", element)
             time.sleep(0.5)
-            WebDriverWait(driver, 5).until(EC.element_to_be_clickable(element))
-            log(f"Successfully clicked element on attempt {attempt + 1}")
+            AdvisedWait(driver, "safe_click", 5).until(EC.element_to_be_clickable(element))
+            log("Successfully clicked element on attempt %d", "INFO", attempt + 1)
             element.click()
             return True
         except ElementClickInterceptedException:
-            log(f"Click intercepted, trying ActionChains (attempt {attempt + 1})", "WARNING")
+            log("Click intercepted, trying ActionChains (attempt %d)", "WARNING", attempt + 1)
             try:
                 ActionChains(driver).move_to_element(element).click().perform()
                 log("Clicked element with ActionChains")
@@ -131,12 +131,13 @@ def safe_click(driver, element, max_retries=3):
                     log("Clicked element with JavaScript")
                     return True
                 except Exception as js_error:
-                    log(f"JavaScript click failed: {js_error}", "ERROR")
+                    log("JavaScript click failed: %s", "ERROR", js_error)
         except Exception as e:
-            log(f"Click attempt {attempt + 1} failed: {e}", "WARNING")
+            log("Click attempt %d failed: %s", "WARNING", attempt + 1, e)
             if attempt < max_retries - 1:
                 time.sleep(1)
     log("All click attempts failed", "ERROR")
+    capture_failure(driver, "safe_click exhausted retries")
     return False
 
 def safe_send_keys(driver, element, text, clear_first=True):
@@ -157,10 +158,10 @@ def safe_send_keys(driver, element, text, clear_first=True):
         for char in text:
             element.send_keys(char)
             time.sleep(0.02)
-        log(f"Successfully sent keys: {text}")
+        log("Successfully sent keys: %s", "INFO", text)
         return True
     except Exception as e:
-        log(f"Failed to send keys '{text}': {e}", "ERROR")
+        log("Failed to send keys '%s': %s", "ERROR", text, e)
         return False
 
 def find_salary_fields(driver):
@@ -175,7 +176,7 @@ def find_salary_fields(driver):
     for selector in current_selectors:
         try:
             current_salary_field = driver.find_element(By.XPATH, selector)
-            log(f"Found current salary field")
+            log("Found current salary field")
             break
         except NoSuchElementException:
             continue
@@ -188,33 +189,14 @@ def find_salary_fields(driver):
     for selector in desired_selectors:
         try:
             desired_salary_field = driver.find_element(By.XPATH, selector)
-            log(f"Found desired salary field")
+            log("Found desired salary field")
             break
         except NoSuchElementException:
             continue
     return current_salary_field, desired_salary_field
 
-def select_dropdown_option(driver, dropdown_label, option_text):
-    try:
-        label = driver.find_element(By.XPATH, f"//p[text()='{dropdown_label}'] | //label[text()='{dropdown_label}']")
-        driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", label)
-        time.sleep(0.5)
-        combobox_input = driver.find_element(By.XPATH, f"//p[text()='{dropdown_label}']/following-sibling::*//input[@role='combobox'] | //label[text()='{dropdown_label}']/following-sibling::*//input[@role='combobox']")
-        combobox_input.click()
-        log(f"Clicked {dropdown_label} dropdown")
-        time.sleep(1)
-        option = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.XPATH, f"//div[@role='option' and text()='{option_text}']"))
-        )
-        option.click()
-        log(f"Selected '{option_text}' for '{dropdown_label}'")
-        return True
-    except Exception as e:
-        log(f"Failed to select '{option_text}' for '{dropdown_label}': {e}", "ERROR")
-        return False
-
 def fill_form_step(driver, logger, wait, step_number):
-    log(f"Filling form for step {step_number}")
+    log("Filling form for step %s", "INFO", step_number)
     current_salary_field, desired_salary_field = find_salary_fields(driver)
     if current_salary_field:
         if safe_send_keys(driver, current_salary_field, "10000"):
@@ -230,187 +212,141 @@ def fill_form_step(driver, logger, wait, step_number):
             logger.log_problem(f"Step {step_number}: Failed to enter desired salary")
     else:
         logger.log_problem(f"Step {step_number}: Could not find desired salary field")
-    if select_dropdown_option(driver, "Business Line", "Information Technology & Software"):
-        logger.log_step(f"Step {step_number}: Selected Business Line")
-    else:
-        logger.log_problem(f"Step {step_number}: Failed to select Business Line")
-    if select_dropdown_option(driver, "Contract", "Fixed-Term Contract"):
-        logger.log_step(f"Step {step_number}: Selected Contract type")
-    else:
-        logger.log_problem(f"Step {step_number}: Failed to select Contract type")
-
-def wait_for_next_step(driver, timeout=15):
-    try:
-        WebDriverWait(driver, timeout).until_not(
-            EC.presence_of_element_located((By.CSS_SELECTOR, ".loading, .spinner, [class*='load']"))
-        )
-        WebDriverWait(driver, timeout).until(
-            lambda d: d.execute_script("return document.readyState") == "complete"
-        )
-        time.sleep(2)
-        return True
-    except TimeoutException:
-        log("Timeout waiting for next step", "WARNING")
-        return False
+    selections = {"Business Line": "Information Technology & Software", "Contract": "Fixed-Term Contract"}
+    for label, ok in fill_selects(driver, selections).items():
+        if ok:
+            logger.log_step(f"Step {step_number}: Selected {label}")
+        else:
+            logger.log_problem(f"Step {step_number}: Failed to select {label}")
 
 class AutomationLogger:
-    def __init__(self, log_path="automation_log.md"):
+    """Streams steps/problems to the shared JSONL run log and renders markdown from it."""
+    def __init__(self, log_path="automation_log.md", events_path=DEFAULT_LOG_PATH, session_id=None, echo=True, driver=None):
         self.log_path = log_path
-        self.steps = []
-        self.problems = []
+        self.driver = driver
+        self.session_id = session_id or new_session_id()
+        self.writer = get_run_log(events_path)
+        self.events_path = events_path
+        self.echo = echo
+        self.step_count = 0
+        self.problem_count = 0
+        self._last_event = time.monotonic()
+    def _elapsed(self):
+        now = time.monotonic()
+        elapsed, self._last_event = now - self._last_event, now
+        return elapsed
     def log_step(self, description):
-        self.steps.append(description)
-        # Print step information immediately with a running count for real-time visibility
-        print(f"[STEP {len(self.steps)}] {description}")
+        self.step_count += 1
+        self.writer.emit("step", description, self.session_id, self._elapsed())
+        if self.echo:
+            # Print step information immediately with a running count for real-time visibility
+            print(f"[STEP {self.step_count}] {description}")
     def log_problem(self, description):
-        self.problems.append(description)
-        # Print problems immediately so they are visible while the automation runs
-        print(f"[PROBLEM] {description}")
+        self.problem_count += 1
+        self.writer.emit("problem", description, self.session_id, self._elapsed())
+        if self.echo:
+            # Print problems immediately so they are visible while the automation runs
+            print(f"[PROBLEM] {description}")
+        if self.driver is not None:
+            capture_failure(self.driver, description, self.session_id)
     def save(self):
+        """Flush the event stream and render this session's markdown summary."""
+        self.writer.flush()
         with open(self.log_path, "w", encoding="utf-8") as f:
-            f.write("# Automation Log\n\n")
-            f.write("## Steps Taken\n")
-            for i, step in enumerate(self.steps, 1):
-                f.write(f"{i}. {step}\n")
-            f.write("\n## Problems Encountered\n")
-            if self.problems:
-                for p in self.problems:
-                    f.write(f"- {p}\n")
-            else:
-                f.write("- No problems encountered.\n")
+            f.write(render_markdown(read_events(self.events_path, self.session_id)))
 
-def main():
-    logger = AutomationLogger()
-    driver = webdriver.Chrome()
-    wait = WebDriverWait(driver, 20)
+# -------------------- Wizard --------------------
+ADD_TALENTS_BUTTON = (By.XPATH, "//*[contains(text(), 'Add qualified talents')]")
+BROWSE_FILES_BUTTON = (By.XPATH, "//button[contains(text(), 'Browse Files')]")
+NEXT_STEP_BUTTON = (By.XPATH, "//button[contains(text(), 'Next Step')]")
+SAVE_TALENT_BUTTON = (By.XPATH, "//button[contains(text(), 'Save Talent')]")
+UPLOAD_PROGRESS = (By.CSS_SELECTOR, ".MuiLinearProgress-root, .progress-bar, .uploading")
+HEAD_HUNTER_NOTE = "a business analyst and good AI knowledgeable in general, a perfect candidate"
+
+
+def click_ready(run):
+    return safe_click(run.driver, run.element)
+
+
+def sign_in(run):
+    password_input = run.driver.find_element(By.ID, "password")
+    if not (safe_send_keys(run.driver, run.element, USERNAME_FR) and safe_send_keys(run.driver, password_input, PASSWORD)):
+        return False
+    password_input.send_keys(Keys.RETURN)
+    return True
+
+
+def wait_for_upload_progress(run):
     try:
-        print("Launching Chrome and navigating to login page...")
-        logger.log_step("Launched Chrome and navigated to login page")
-        driver.get(LOGIN_URL)
+        AdvisedWait(run.driver, "add_qualified_talent.upload_progress", 20).until_not(
+            EC.presence_of_element_located(UPLOAD_PROGRESS))
+    except TimeoutException:
+        log("Upload progress bar still visible", "WARNING")
 
-        wait.until(EC.presence_of_element_located((By.ID, "email")))
-        email_input = driver.find_element(By.ID, "email")
-        password_input = driver.find_element(By.ID, "password")
 
-        safe_send_keys(driver, email_input, USERNAME_FR)
-        safe_send_keys(driver, password_input, PASSWORD)
-        password_input.send_keys(Keys.RETURN)
-        logger.log_step("Logged in successfully")
+def fill_note(run):
+    run.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", run.element)
+    return safe_send_keys(run.driver, run.element, HEAD_HUNTER_NOTE)
 
-        wait.until(EC.element_to_be_clickable((By.XPATH, "//*[contains(text(), 'Add qualified talents')]")))
-        add_talent_button = driver.find_element(By.XPATH, "//*[contains(text(), 'Add qualified talents')]")
-        if safe_click(driver, add_talent_button):
-            logger.log_step("Clicked 'Add qualified talents'")
-        else:
-            logger.log_problem("'Add qualified talents' button did not work or did not get to next step!")
 
-        wait.until(EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Browse Files')]")))
-        browse_button = driver.find_element(By.XPATH, "//button[contains(text(), 'Browse Files')]")
-        if safe_click(driver, browse_button):
-            logger.log_step("Clicked 'Browse Files' button.")
-            try:
-                wait.until_not(EC.presence_of_element_located((By.CSS_SELECTOR, ".MuiLinearProgress-root, .progress-bar, .uploading")))
-                logger.log_step("Waited for file upload to complete (progress bar disappeared).")
-            except Exception:
-                time.sleep(2)
-                logger.log_step("Waited 2 seconds after file upload (no progress bar detected).")
-        else:
-            logger.log_problem("Failed to click 'Browse Files' button.")
+def next_step(name):
+    """Click 'Next Step' and wait for the following wizard page."""
+    return Step(name, ready=NEXT_STEP_BUTTON, actions=[click_ready], advances=True, timeout=30)
 
-        logger.log_step("Waiting 30 seconds before clicking 'Next Step' after uploading CV.")
-        time.sleep(30)
 
-        wait.until(EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Next Step')]")))
-        next_button = driver.find_element(By.XPATH, "//button[contains(text(), 'Next Step')]")
-        if safe_click(driver, next_button):
-            logger.log_step("Clicked first Next Step after upload")
-        else:
-            logger.log_problem("First 'Next Step' button did not work or did not get to next step!")
+LOGIN_STEP = Step("login", ready=EC.presence_of_element_located((By.ID, "email")), actions=[sign_in], timeout=20)
 
-        # Wait for the page to load after first Next Step
-        time.sleep(15)
-        wait_for_next_step(driver)
-        
-        # Look for and fill first name field
-        logger.log_step("Looking for first name field after first Next Step")
-        find_and_fill_first_name(driver, logger)
 
-        try:
-            wait.until(EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Next Step')]")))
-            next_button = driver.find_element(By.XPATH, "//button[contains(text(), 'Next Step')]")
-            if safe_click(driver, next_button):
-                logger.log_step("Clicked second Next Step before filling form fields")
-            else:
-                logger.log_problem("Second 'Next Step' button did not work or did not get to next step!")
-        except Exception as e:
-            logger.log_problem(f"Failed to click second Next Step before filling form fields: {e}")
+def start_session(driver):
+    """Log a fresh browser in and remember the landing page (for talent_wizard(login=False))."""
+    driver.get(LOGIN_URL)
+    result = Wizard("add_qualified_talent_login", [LOGIN_STEP]).run(driver)
+    if not result.ok:
+        log(result.summary(), "ERROR")
+        return False
+    AdvisedWait(driver, "add_qualified_talent.login.redirect", 15).until(lambda d: d.current_url != LOGIN_URL)
+    driver.home_url = driver.current_url
+    return True
 
-        time.sleep(4)
-        wait_for_next_step(driver)
-        fill_form_step(driver, logger, wait, 1)
 
-        for step in range(1, 8):
-            try:
-                # Fill note field only on step 6 (where it appears)
-                if step == 6:
-                    logger.log_step(f"Step {step}: Looking for Head Hunter's Note field")
-                    note_field = None
-                    possible_selectors = [
-                        "//textarea",
-                    ]
-                    
-                    for i, selector in enumerate(possible_selectors):
-                        try:
-                            logger.log_step(f"Step {step}: Trying selector {i+1}: {selector}")
-                            note_field = WebDriverWait(driver, 5).until(
-                                EC.visibility_of_element_located((By.XPATH, selector))
-                            )
-                            if note_field and note_field.is_displayed():
-                                logger.log_step(f"Step {step}: Found textarea with selector {i+1}")
-                                driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", note_field)
-                                time.sleep(1)
-                                break
-                        except Exception as e:
-                            logger.log_problem(f"Step {step}: Selector {i+1} failed: {e}")
-                            continue
-                    
-                    if note_field:
-                        note_text = "a business analyst and good AI knowledgeable in general, a perfect candidate"
-                        logger.log_step(f"Step {step}: Attempting to fill note field with: {note_text}")
-                        if safe_send_keys(driver, note_field, note_text):
-                            logger.log_step(f"Step {step}: Successfully filled 'Head Hunter's Note' field with candidate description.")
-                        else:
-                            logger.log_problem(f"Step {step}: Failed to fill 'Head Hunter's Note' field!")
-                    else:
-                        logger.log_problem(f"Step {step}: Could not find any textarea field for Head Hunter's Note!")
-                if step == 7:
-                    wait.until(EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Save Talent')]")))
-                    save_button = driver.find_element(By.XPATH, "//button[contains(text(), 'Save Talent')]")
-                    if safe_click(driver, save_button):
-                        logger.log_step("Clicked Save Talent (final step)")
-                    else:
-                        logger.log_problem("'Save Talent' button did not work or did not get to next step!")
-                else:
-                    wait.until(EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Next Step')]")))
-                    next_button = driver.find_element(By.XPATH, "//button[contains(text(), 'Next Step')]")
-                    if safe_click(driver, next_button):
-                        logger.log_step(f"Clicked Next Step {step}")
-                    else:
-                        logger.log_problem(f"Next Step {step} button did not work or did not get to next step!")
-                if step < 7:
-                    if step == 1 or step == 2:  # First and Second Next Steps
-                        time.sleep(15)
-                    elif step == 3:  # Third Next Step
-                        time.sleep(15)
-                    else:  # Steps 4, 5, 6
-                        time.sleep(4)
-            except Exception as e:
-                logger.log_problem(f"Step {step}: Exception - {e}")
-                break
-
-        logger.log_step("Automation completed successfully")
+def talent_wizard(logger, login=True):
+    """The Add qualified talents wizard, reporting to logger; login=False starts from a logged-in page."""
+    return Wizard("add_qualified_talent", [
+        *([LOGIN_STEP] if login else []),
+        Step("open_add_talents", ready=ADD_TALENTS_BUTTON, actions=[click_ready], timeout=20),
+        Step("cv_upload", ready=BROWSE_FILES_BUTTON, actions=[click_ready, wait_for_upload_progress],
+             backend=CV_UPLOAD_PATTERN, backend_start=30, timeout=150),
+        Step("cv_parse", ready=NEXT_STEP_BUTTON, actions=[click_ready], backend=CV_PARSE_PATTERN,
+             backend_start=15, advances=True, timeout=150),
+        Step("first_name", actions=[lambda run: find_and_fill_first_name(run.driver, logger)], timeout=30, optional=True),
+        next_step("profile"),
+        Step("salary_and_contract", actions=[lambda run: fill_form_step(run.driver, logger, None, 1)],
+             timeout=60, optional=True),
+        *[next_step(f"next_step_{number}") for number in range(1, 6)],
+        Step("head_hunter_note", ready=EC.visibility_of_element_located((By.TAG_NAME, "textarea")),
+             actions=[fill_note], timeout=10, optional=True),
+        next_step("next_step_6"),
+        Step("save_talent", ready=SAVE_TALENT_BUTTON, actions=[click_ready], timeout=20),
+    ], reporter=logger)
+
+
+def main():
+    setup_logging()
+    if not check_credentials():
+        exit(1)
+    driver = get_backend().create_driver("add_qualified_talent", headless=os.getenv("HEADLESS") == "1",
+                                         capture_network=True)
+    logger = AutomationLogger(driver=driver)
+    try:
+        print("Launching Chrome and navigating to login page...")
+        logger.log_step("Launched Chrome and navigated to login page")
+        driver.get(LOGIN_URL)
+        result = talent_wizard(logger).run(driver)
+        print(result.summary())
+        if result.ok:
+            logger.log_step("Automation completed successfully")
     except Exception as e:
-        log(f"Automation failed: {e}", "ERROR")
+        log("Automation failed: %s", "ERROR", e)
         logger.log_problem(f"Automation failed: {e}")
     finally:
         logger.save()
@@ -418,4 +354,4 @@ def main():
         driver.quit()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,255 @@
+import os
+import time
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+# -------------------- Admission Control --------------------
+# Starting every Chrome at once on a host without the memory or CPU for it
+# makes every session slow down and time out together. The controller admits
+# a new browser session only while the host is below its thresholds and
+# queues the rest first-come first-served, recording how long each waited.
+#
+# Measurements use psutil when it is installed and /proc otherwise.
+
+logger = logging.getLogger(__name__)
+
+CHROME_PROCESS_NAMES = ("chrome", "chromium", "chromedriver", "google-chrome", "headless_shell")
+
+
+def _is_chrome(name):
+    name = (name or "").lower()
+    return any(name.startswith(prefix) for prefix in CHROME_PROCESS_NAMES)
+
+
+def chrome_rss_mb():
+    """Total resident memory of all Chrome/chromedriver processes, in MiB."""
+    try:
+        import psutil
+    except ImportError:
+        return _proc_chrome_rss_mb()
+    total = 0
+    for proc in psutil.process_iter(["name", "memory_info"]):
+        try:
+            if _is_chrome(proc.info["name"]) and proc.info["memory_info"]:
+                total += proc.info["memory_info"].rss
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    return total / (1024 * 1024)
+
+
+def _proc_chrome_rss_mb():
+    total_kb = 0
+    if not os.path.isdir("/proc"):
+        return 0.0
+    for pid in os.listdir("/proc"):
+        if not pid.isdigit():
+            continue
+        try:
+            with open(f"/proc/{pid}/status", encoding="utf-8") as f:
+                fields = dict(line.split(":", 1) for line in f if ":" in line)
+        except OSError:
+            continue
+        if _is_chrome(fields.get("Name", "").strip()) and "VmRSS" in fields:
+            total_kb += int(fields["VmRSS"].split()[0])
+    return total_kb / 1024
+
+
+def process_tree_rss_mb(pid):
+    """Resident memory of pid and all its descendants, in MiB (0 if it is gone)."""
+    try:
+        import psutil
+    except ImportError:
+        return _proc_tree_rss_mb(pid)
+    try:
+        root = psutil.Process(pid)
+        processes = [root] + root.children(recursive=True)
+    except psutil.NoSuchProcess:
+        return 0.0
+    total = 0
+    for proc in processes:
+        try:
+            total += proc.memory_info().rss
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    return total / (1024 * 1024)
+
+
+def _proc_tree_rss_mb(pid):
+    if not os.path.isdir("/proc"):
+        return 0.0
+    children, rss_kb = {}, {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/status", encoding="utf-8") as f:
+                fields = dict(line.split(":", 1) for line in f if ":" in line)
+        except OSError:
+            continue
+        ppid = int(fields.get("PPid", "0").strip() or 0)
+        children.setdefault(ppid, []).append(int(entry))
+        rss_kb[int(entry)] = int(fields["VmRSS"].split()[0]) if "VmRSS" in fields else 0
+    total_kb, stack = 0, [pid]
+    while stack:
+        current = stack.pop()
+        total_kb += rss_kb.get(current, 0)
+        stack.extend(children.get(current, []))
+    return total_kb / 1024
+
+
+def available_memory_mb():
+    """Memory available to new processes, in MiB (None if unknown)."""
+    try:
+        import psutil
+        return psutil.virtual_memory().available / (1024 * 1024)
+    except ImportError:
+        pass
+    try:
+        with open("/proc/meminfo", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def cpu_load():
+    """Recent CPU load as a fraction of all cores (1.0 = every core busy)."""
+    try:
+        import psutil
+        return psutil.cpu_percent(interval=None) / 100
+    except ImportError:
+        pass
+    try:
+        return os.getloadavg()[0] / (os.cpu_count() or 1)
+    except (AttributeError, OSError):
+        return 0.0
+
+
+class AdmissionController:
+    """Admit browser sessions only below memory/CPU thresholds, FIFO-queueing the rest."""
+
+    def __init__(self, max_chrome_rss_mb=None, min_available_mb=1024, max_cpu_load=0.85,
+                 max_sessions=None, session_estimate_mb=400, warmup=10.0, poll_interval=1.0):
+        self.max_chrome_rss_mb = max_chrome_rss_mb
+        self.min_available_mb = min_available_mb
+        self.max_cpu_load = max_cpu_load
+        self.max_sessions = max_sessions
+        # A just-started Chrome has not grown yet; count it at this size during warmup
+        self.session_estimate_mb = session_estimate_mb
+        self.warmup = warmup
+        self.poll_interval = poll_interval
+        self.active = 0
+        self.queue_waits: list = []
+        self._recent_starts = deque()
+        self._tickets = deque()
+        self._cond = threading.Condition()
+
+    @classmethod
+    def from_env(cls):
+        def number(name, default):
+            value = os.getenv(name)
+            return float(value) if value else default
+        max_sessions = os.getenv("ADMISSION_MAX_SESSIONS")
+        return cls(
+            max_chrome_rss_mb=number("ADMISSION_MAX_CHROME_RSS_MB", None),
+            min_available_mb=number("ADMISSION_MIN_AVAILABLE_MB", 1024),
+            max_cpu_load=number("ADMISSION_MAX_CPU_LOAD", 0.85),
+            max_sessions=int(max_sessions) if max_sessions else None,
+        )
+
+    def _warming_mb(self):
+        now = time.monotonic()
+        while self._recent_starts and now - self._recent_starts[0] > self.warmup:
+            self._recent_starts.popleft()
+        return len(self._recent_starts) * self.session_estimate_mb
+
+    def blocked_reason(self):
+        """Why a new session cannot start right now, or None if it can."""
+        if self.max_sessions is not None and self.active >= self.max_sessions:
+            return f"{self.active} sessions active (max {self.max_sessions})"
+        if self.active == 0:
+            # Always let one session through so a busy host still makes progress
+            return None
+        warming = self._warming_mb()
+        if self.max_chrome_rss_mb is not None:
+            rss = chrome_rss_mb() + warming
+            if rss + self.session_estimate_mb > self.max_chrome_rss_mb:
+                return f"Chrome RSS {rss:.0f} MiB near limit {self.max_chrome_rss_mb:.0f} MiB"
+        available = available_memory_mb()
+        if available is not None and available - warming - self.session_estimate_mb < self.min_available_mb:
+            return f"only {available - warming:.0f} MiB available"
+        load = cpu_load()
+        if load > self.max_cpu_load:
+            return f"CPU load {load:.2f} above {self.max_cpu_load:.2f}"
+        return None
+
+    def acquire(self, name="session", timeout=None):
+        """Block until admitted; returns seconds spent queued. Raises TimeoutError."""
+        ticket = object()
+        queued_at = time.monotonic()
+        logged = False
+        with self._cond:
+            self._tickets.append(ticket)
+            try:
+                while True:
+                    if self._tickets[0] is ticket:
+                        reason = self.blocked_reason()
+                        if reason is None:
+                            break
+                        if not logged:
+                            logger.info("%s: queued for admission (%s)", name, reason)
+                            logged = True
+                    waited = time.monotonic() - queued_at
+                    if timeout is not None and waited >= timeout:
+                        raise TimeoutError(f"{name}: not admitted within {timeout}s")
+                    self._cond.wait(self.poll_interval)
+            finally:
+                self._tickets.remove(ticket)
+                self._cond.notify_all()
+            self.active += 1
+            self._recent_starts.append(time.monotonic())
+            waited = time.monotonic() - queued_at
+            self.queue_waits.append(waited)
+        if logged:
+            logger.info("%s: admitted after %.1fs in queue", name, waited)
+        return waited
+
+    def release(self):
+        with self._cond:
+            self.active = max(self.active - 1, 0)
+            self._cond.notify_all()
+
+    @contextmanager
+    def admit(self, name="session", timeout=None):
+        """`with controller.admit(name):` around a browser session."""
+        self.acquire(name, timeout)
+        try:
+            yield self
+        finally:
+            self.release()
+
+    def stats(self):
+        """Queue-wait metrics: count, mean, p95 and max seconds."""
+        with self._cond:
+            waits = sorted(self.queue_waits)
+        if not waits:
+            return {"count": 0, "mean": 0.0, "p95": 0.0, "max": 0.0}
+        p95 = waits[min(int(round(0.95 * (len(waits) - 1))), len(waits) - 1)]
+        return {"count": len(waits), "mean": sum(waits) / len(waits), "p95": p95, "max": waits[-1]}
+
+
+_controller = None
+_controller_lock = threading.Lock()
+
+
+def get_admission_controller():
+    """Process-wide controller configured from ADMISSION_* environment variables."""
+    global _controller
+    with _controller_lock:
+        if _controller is None:
+            _controller = AdmissionController.from_env()
+        return _controller
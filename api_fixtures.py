@@ -0,0 +1,205 @@
+import os
+import json
+import uuid
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import urllib3
+from dotenv import load_dotenv
+
+# -------------------- API Fixtures --------------------
+# Preconditions (missions, talents, applications) are created straight through
+# the app's HTTP API over one pooled keep-alive connection, so the UI is only
+# driven for the behaviour actually under test. Everything a seeder creates is
+# removed in bulk when it is closed.
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+API_URL = os.getenv("KWIKS_API_URL", "https://preprod.kwiks.io/api")
+
+# Resource paths relative to API_URL; override with KWIKS_API_<NAME>_PATH.
+ENDPOINTS = {
+    "login": os.getenv("KWIKS_API_LOGIN_PATH", "/auth/login"),
+    "missions": os.getenv("KWIKS_API_MISSIONS_PATH", "/missions"),
+    "talents": os.getenv("KWIKS_API_TALENTS_PATH", "/talents"),
+    "applications": os.getenv("KWIKS_API_APPLICATIONS_PATH", "/applications"),
+}
+
+
+class ApiError(Exception):
+    """Raised when the API answers with an unexpected status."""
+
+    def __init__(self, method, path, status, body):
+        super().__init__(f"{method} {path} -> {status}: {body[:200]}")
+        self.status = status
+
+
+class ApiClient:
+    """Thin JSON client over a keep-alive urllib3 connection pool."""
+
+    def __init__(self, base_url=API_URL, pool_size=8, timeout=10.0, retries=2):
+        self.base_url = base_url.rstrip("/")
+        self.token = None
+        retry = urllib3.Retry(total=retries, backoff_factor=0.2, status_forcelist=(502, 503, 504))
+        self._http = urllib3.PoolManager(
+            num_pools=2,
+            maxsize=pool_size,
+            block=False,
+            timeout=urllib3.Timeout(connect=min(timeout, 5.0), read=timeout),
+            retries=retry,
+            headers={"Accept": "application/json", "Connection": "keep-alive"},
+        )
+        # Only idempotent methods are retried; a POST is retried only with an
+        # Idempotency-Key, so a 502 after the backend committed cannot seed twice
+        self._keyed_retries = retry.new(allowed_methods=retry.allowed_methods | {"POST"})
+
+    @classmethod
+    def from_env(cls, email_var="USERNAME_Clt", password_var="PASSWORD", **kwargs):
+        """Create a client logged in with credentials from the environment."""
+        client = cls(**kwargs)
+        client.login(os.getenv(email_var), os.getenv(password_var))
+        return client
+
+    def request(self, method, path, payload=None, expected=(200, 201, 202, 204), idempotency_key=None):
+        headers = {"Content-Type": "application/json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        kwargs = {}
+        if idempotency_key:
+            headers["Idempotency-Key"] = idempotency_key
+            kwargs["retries"] = self._keyed_retries
+        body = json.dumps(payload).encode("utf-8") if payload is not None else None
+        response = self._http.request(method, self.base_url + path, body=body, headers=headers, **kwargs)
+        text = response.data.decode("utf-8", "replace")
+        if response.status not in expected:
+            raise ApiError(method, path, response.status, text)
+        if not text:
+            return None
+        try:
+            return json.loads(text)
+        except ValueError:
+            return text
+
+    def login(self, email, password):
+        if not email or not password:
+            raise ValueError("API login needs an email and a password")
+        data = self.request("POST", ENDPOINTS["login"], {"email": email, "password": password})
+        data = data if isinstance(data, dict) else {}
+        self.token = data.get("token") or data.get("accessToken") or data.get("access_token")
+        return self.token
+
+    def create(self, kind, payload):
+        data = self.request("POST", ENDPOINTS[kind], payload, idempotency_key=uuid.uuid4().hex)
+        # Accept either the created object or {"data": {...}}
+        if isinstance(data, dict) and isinstance(data.get("data"), dict):
+            data = data["data"]
+        return data
+
+    def delete_many(self, kind, ids, workers=4):
+        """Delete ids with the bulk endpoint, falling back to parallel single deletes."""
+        if not ids:
+            return 0
+        try:
+            self.request("POST", f"{ENDPOINTS[kind]}/bulk-delete", {"ids": list(ids)},
+                         idempotency_key=uuid.uuid4().hex)
+            return len(ids)
+        except ApiError as e:
+            if e.status not in (404, 405, 501):
+                raise
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(lambda entity_id: self._delete_one(kind, entity_id), ids))
+        return sum(results)
+
+    def _delete_one(self, kind, entity_id):
+        try:
+            self.request("DELETE", f"{ENDPOINTS[kind]}/{entity_id}", expected=(200, 202, 204, 404))
+            return 1
+        except Exception as e:
+            logger.warning("Could not delete %s %s: %s", kind, entity_id, e)
+            return 0
+
+    def close(self):
+        self._http.clear()
+
+
+def _entity_id(entity):
+    if isinstance(entity, dict):
+        return entity.get("id") or entity.get("_id")
+    return entity
+
+
+class FixtureSeeder:
+    """Create test preconditions via the API and clean them up in bulk.
+
+    Usable as a context manager:
+
+        with FixtureSeeder(ApiClient.from_env()) as seed:
+            mission = seed.mission(title="QA Mission")
+    """
+
+    # Delete dependants before the entities they point to
+    CLEANUP_ORDER = ("applications", "talents", "missions")
+
+    def __init__(self, client, prefix="autotest"):
+        self.client = client
+        self.prefix = prefix
+        self.created = {kind: [] for kind in self.CLEANUP_ORDER}
+
+    def _unique(self, label):
+        return f"{self.prefix}-{label}-{uuid.uuid4().hex[:8]}"
+
+    def _create(self, kind, payload):
+        entity = self.client.create(kind, payload)
+        self.created[kind].append(_entity_id(entity))
+        logger.info("Seeded %s %s", kind[:-1], _entity_id(entity))
+        return entity
+
+    def mission(self, **fields):
+        payload = {
+            "title": self._unique("mission"),
+            "description": "Seeded by api_fixtures for UI tests.",
+            "workModel": "On-Site",
+            "country": "Morocco",
+            "city": "Casablanca",
+            "businessLine": "Information Technology & Software",
+            "contract": "Fixed-Term Contract",
+            "status": "published",
+        }
+        payload.update(fields)
+        return self._create("missions", payload)
+
+    def talent(self, **fields):
+        payload = {
+            "firstName": self._unique("talent"),
+            "lastName": "Seeded",
+            "email": f"{self._unique('talent')}@example.test",
+            "currentSalary": 10000,
+            "desiredSalary": 12000,
+        }
+        payload.update(fields)
+        return self._create("talents", payload)
+
+    def application(self, mission, talent, **fields):
+        payload = {"missionId": _entity_id(mission), "talentId": _entity_id(talent)}
+        payload.update(fields)
+        return self._create("applications", payload)
+
+    def cleanup(self):
+        """Delete everything this seeder created; returns the number removed."""
+        removed = 0
+        for kind in self.CLEANUP_ORDER:
+            ids = [entity_id for entity_id in self.created[kind] if entity_id is not None]
+            if ids:
+                removed += self.client.delete_many(kind, ids)
+            self.created[kind] = []
+        logger.info("Cleaned up %d seeded entities", removed)
+        return removed
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.cleanup()
+        return False
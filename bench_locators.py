@@ -0,0 +1,76 @@
+import os
+import sys
+import time
+import tempfile
+import statistics
+
+from selenium.webdriver.common.by import By
+
+from browser_profiles import create_driver
+from locators import Locator, find_all
+
+# -------------------- Locator Micro-Benchmark --------------------
+# Builds a dashboard-sized synthetic page and times the flows' translate()
+# XPaths against the compiled Locator equivalents.
+#
+#   python bench_locators.py [cards] [iterations]
+
+LOWER = "translate(normalize-space(text()), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')"
+
+CASES = [
+    ("mission link",
+     f"//*[self::a or self::button or self::div][contains({LOWER},'mission')]",
+     Locator("mission", role="clickable")),
+    ("apply button",
+     f"//*[self::a or self::button or self::div][contains({LOWER},'apply')]",
+     Locator("apply", role="clickable")),
+    ("add new mission",
+     "//*[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'add new mission')]",
+     Locator("add new mission", role="*")),
+]
+
+
+def build_page(cards):
+    rows = []
+    for i in range(cards):
+        rows.append(
+            f"<div class='chakra-card'><div class='header'><h3>Candidate profile {i}</h3>"
+            f"<span>Casablanca, Morocco</span></div><div class='body'><p>Business analyst with {i % 15} years"
+            f"</p><ul><li>Python</li><li>SQL</li><li>Reporting</li></ul></div>"
+            f"<div class='footer'><a href='#'>Details</a><button>Contact</button></div></div>")
+    rows.append("<div class='chakra-card'><h3>QA Mission</h3><button>Apply</button></div>")
+    return ("<html><body><nav><a href='#'>Dashboard</a><a href='#'>Missions</a></nav>"
+            "<button><p>Add New Mission</p></button>" + "".join(rows) + "</body></html>")
+
+
+def timed(fn, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+        assert result, "query found nothing"
+    return statistics.median(samples)
+
+
+def main():
+    cards = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    with tempfile.NamedTemporaryFile("w", suffix=".html", delete=False) as f:
+        f.write(build_page(cards))
+    driver = create_driver("lean", headless=True, capture_network=False)
+    try:
+        driver.get("file://" + f.name)
+        print(f"{cards} cards, median of {iterations} lookups")
+        for name, xpath, locator in CASES:
+            xpath_ms = timed(lambda: driver.find_elements(By.XPATH, xpath), iterations)
+            locator_ms = timed(lambda: find_all(driver, locator, page="bench"), iterations)
+            print(f"{name:<16} xpath={xpath_ms:8.2f} ms  locator={locator_ms:8.2f} ms  "
+                  f"speedup={xpath_ms / locator_ms:5.1f}x")
+    finally:
+        driver.quit()
+        os.unlink(f.name)
+
+
+if __name__ == "__main__":
+    main()
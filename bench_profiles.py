@@ -0,0 +1,71 @@
+import os
+import sys
+import time
+import statistics
+
+from dotenv import load_dotenv
+
+from browser_profiles import PROFILES, create_driver
+
+# -------------------- Profile Load-Time Benchmark --------------------
+# Loads the same pages with each browser profile and compares wall time,
+# navigation timing and transferred bytes.
+#
+#   python bench_profiles.py [runs] [profile ...]
+
+load_dotenv()
+
+BENCH_URLS = [
+    "https://preprod.kwiks.io/login",
+    "https://preprod.kwiks.io/auth/login",
+]
+
+NAV_TIMING_JS = """
+const nav = performance.getEntriesByType('navigation')[0];
+const resources = performance.getEntriesByType('resource');
+return {
+    dcl: nav ? nav.domContentLoadedEventEnd : null,
+    load: nav ? nav.loadEventEnd : null,
+    requests: resources.length,
+    bytes: resources.reduce((sum, r) => sum + (r.transferSize || 0), (nav && nav.transferSize) || 0),
+};
+"""
+
+
+def bench_profile(profile_name, urls, runs, headless=True):
+    """Return per-page samples for one profile; cache is disabled so every run is cold."""
+    driver = create_driver(profile_name, headless=headless)
+    samples = []
+    try:
+        driver.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": True})
+        for _ in range(runs):
+            for url in urls:
+                start = time.perf_counter()
+                driver.get(url)
+                wall = time.perf_counter() - start
+                timing = driver.execute_script(NAV_TIMING_JS) or {}
+                samples.append({"url": url, "wall": wall, **timing})
+    finally:
+        driver.quit()
+    return samples
+
+
+def summarize(profile_name, samples):
+    def median(key):
+        values = [s[key] for s in samples if s.get(key) is not None]
+        return statistics.median(values) if values else float("nan")
+    return (f"{profile_name:<14} wall={median('wall') * 1000:8.0f} ms  dcl={median('dcl'):8.0f} ms  "
+            f"load={median('load'):8.0f} ms  requests={median('requests'):6.0f}  bytes={median('bytes') / 1024:8.0f} KiB")
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    profiles = sys.argv[2:] or list(PROFILES)
+    headless = os.getenv("HEADLESS", "1") == "1"
+    print(f"Benchmarking {len(BENCH_URLS)} pages x {runs} runs per profile (median values)")
+    for name in profiles:
+        print(summarize(name, bench_profile(name, BENCH_URLS, runs, headless=headless)))
+
+
+if __name__ == "__main__":
+    main()
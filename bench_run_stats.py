@@ -0,0 +1,60 @@
+import os
+import sys
+import json
+import time
+import random
+import tempfile
+
+import numpy as np
+
+from run_stats import aggregate, failure_heatmap, load, slowest_steps
+
+# -------------------- Aggregation Benchmark --------------------
+# Writes a synthetic run log of wizard "timing" events, then times loading it
+# into arrays and aggregating it, and checks the percentiles against
+# numpy.percentile.
+#
+#   python bench_run_stats.py [records]
+
+STEPS = {
+    "add_mission": ["add_new_mission", "job_title_and_description", "work_model_and_location", "business_details"],
+    "add_qualified_talent": ["login", "open_add_talents", "cv_upload", "cv_parse", "first_name", "profile",
+                             "salary_and_contract", "next_step_1", "next_step_2", "save_talent"],
+}
+
+
+def write_log(path, records):
+    groups = [(flow, step) for flow, steps in STEPS.items() for step in steps]
+    start = time.time() - 60 * 86400
+    rng = random.Random(7)
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(records):
+            flow, step = groups[i % len(groups)]
+            event = {"ts": start + i * (60 * 86400 / records), "kind": "timing", "session": f"s{i // len(groups)}",
+                     "message": step, "duration": round(rng.lognormvariate(0, 0.8), 4), "flow": flow,
+                     "ok": rng.random() > 0.03, "reason": None, "backend": None, "perf": None}
+            f.write(json.dumps(event) + "\n")
+
+
+def main():
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "runs.jsonl")
+        write_log(path, records)
+        start = time.perf_counter()
+        table = load([path])
+        loaded = time.perf_counter()
+        stats = aggregate(table)
+        heatmap = failure_heatmap(table)
+        ranking = slowest_steps(table, stats)
+        done = time.perf_counter()
+    print(f"{len(table):,} records: load {loaded - start:.2f}s, aggregate {done - loaded:.3f}s")
+    for group in range(len(table.groups)):
+        durations = table.duration[(table.group == group) & table.ok]
+        for q in (50, 95, 99):
+            assert np.isclose(stats[f"p{q}"][group], np.percentile(durations, q)), (table.groups[group], q)
+    print(f"Percentiles match numpy.percentile; heatmap {heatmap[1].shape}, slowest: {ranking[0]}")
+
+
+if __name__ == "__main__":
+    main()
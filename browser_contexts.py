@@ -0,0 +1,145 @@
+import time
+import logging
+import threading
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.switch_to import SwitchTo
+
+from browser_profiles import apply_profile
+
+# -------------------- Browser Contexts --------------------
+# Actors that only need their own cookies and storage do not need their own
+# Chrome. A SharedBrowser opens one isolated browser context per actor
+# (CDP Target.createBrowserContext, like an incognito profile) in a window of
+# a single Chrome and hands out a driver for it:
+#
+#   browser = SharedBrowser(start_driver(), profile="lean")
+#   driver = browser.new_context("Account-1")     # same API as the Chrome driver
+#   login_to_kwiks(driver, ...)
+#   driver.quit()                                  # disposes the context only
+#   browser.close()                                # quits Chrome
+#
+# WebDriver talks to one window at a time, so every command of a context
+# driver (its elements included) takes the browser's lock and switches to the
+# context's window first. Waits poll without holding the lock, so actors still
+# progress concurrently. A frame selected with switch_to.frame() is lost when
+# another actor runs a command in between.
+
+logger = logging.getLogger(__name__)
+
+
+class ContextsUnsupported(WebDriverException):
+    """The browser cannot create isolated contexts (not Chromium, or no CDP access)."""
+
+
+class ContextDriver:
+    """Mixin for a driver bound to one browser context of a SharedBrowser (see context_driver_class)."""
+
+    def execute(self, driver_command, params=None):
+        with self.shared.lock:
+            self.shared.activate(self.handle)
+            response = super().execute(driver_command, params)
+            if driver_command == Command.SWITCH_TO_WINDOW:
+                # A popup of this context; later commands go there
+                self.handle = self.shared.current = params["handle"]
+            return response
+
+    def quit(self):
+        """Close this context's windows and dispose of its cookies and storage; Chrome keeps running."""
+        self.shared.dispose(self)
+
+    def __repr__(self):
+        return f"<ContextDriver {self.context_name!r} in session {self.session_id}>"
+
+
+_classes = {}
+
+
+def context_driver_class(base):
+    """ContextDriver subclass of the real driver's class, so isinstance checks still hold."""
+    cls = _classes.get(base)
+    if cls is None:
+        cls = _classes[base] = type(f"Context{base.__name__}", (ContextDriver, base), {})
+    return cls
+
+
+class SharedBrowser:
+    """One Chrome session hosting an isolated browser context per actor."""
+
+    def __init__(self, driver, profile=None, window_timeout=10.0):
+        self.driver = driver
+        self.profile = profile
+        self.window_timeout = window_timeout
+        self.lock = threading.RLock()
+        self.home = driver.current_window_handle
+        self.current = self.home
+        self.contexts = []
+        try:
+            driver.execute_cdp_cmd("Target.getBrowserContexts", {})
+        except Exception as e:
+            raise ContextsUnsupported(f"Browser contexts need a Chromium session with CDP access: {e}") from e
+
+    def activate(self, handle):
+        """Point the session at handle (caller holds the lock)."""
+        if self.current != handle:
+            self.driver.switch_to.window(handle)
+            self.current = handle
+
+    def new_context(self, name="context"):
+        """A driver for a new, empty browser context with its own window."""
+        with self.lock:
+            context_id = self.driver.execute_cdp_cmd(
+                "Target.createBrowserContext", {"disposeOnDetach": False})["browserContextId"]
+            try:
+                # The target id doubles as chromedriver's window handle
+                handle = self.driver.execute_cdp_cmd("Target.createTarget", {
+                    "url": "about:blank", "browserContextId": context_id, "newWindow": True})["targetId"]
+                self._wait_for_window(handle)
+            except Exception:
+                self.driver.execute_cdp_cmd("Target.disposeBrowserContext", {"browserContextId": context_id})
+                raise
+            driver = object.__new__(context_driver_class(type(self.driver)))
+            driver.__dict__.update(self.driver.__dict__)
+            driver._switch_to = SwitchTo(driver)
+            driver.shared = self
+            driver.handle = handle
+            driver.context_id = context_id
+            driver.context_name = name
+            self.contexts.append(driver)
+        if self.profile is not None:
+            apply_profile(driver, self.profile)
+        logger.info("%s: opened browser context %s (%d in this browser)", name, context_id, len(self.contexts))
+        return driver
+
+    def _wait_for_window(self, handle):
+        deadline = time.monotonic() + self.window_timeout
+        while handle not in self.driver.window_handles:
+            if time.monotonic() >= deadline:
+                raise ContextsUnsupported(f"Window {handle} of the new context never showed up")
+            time.sleep(0.1)
+
+    def dispose(self, context):
+        with self.lock:
+            if context not in self.contexts:
+                return
+            self.contexts.remove(context)
+            try:
+                # Closes every window of the context, popups included
+                self.driver.execute_cdp_cmd("Target.disposeBrowserContext", {"browserContextId": context.context_id})
+            except Exception as e:
+                logger.warning("%s: could not dispose browser context: %s", context.context_name, e)
+            if self.current == context.handle:
+                try:
+                    self.activate(self.home)
+                except Exception as e:
+                    logger.warning("Could not switch back to the browser's first window: %s", e)
+        logger.info("%s: closed browser context", context.context_name)
+
+    def close(self):
+        for context in list(self.contexts):
+            context.quit()
+        try:
+            self.driver.quit()
+        except Exception as e:
+            logger.warning("Error quitting shared browser: %s", e)
@@ -0,0 +1,135 @@
+import os
+import logging
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+# -------------------- Browser Profiles --------------------
+# A profile bundles Chrome switches, prefs, a fixed viewport and the URL
+# patterns to block through CDP `Network.setBlockedURLs`. Flows pick a
+# profile by name; `BROWSER_PROFILE_<FLOW>` / `BROWSER_PROFILE` override it.
+
+logger = logging.getLogger(__name__)
+
+IMAGE_PATTERNS = ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.ico", "*.bmp"]
+FONT_PATTERNS = ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot", "*fonts.googleapis.com*", "*fonts.gstatic.com*"]
+MEDIA_PATTERNS = ["*.mp4", "*.webm", "*.ogg", "*.mp3", "*.wav", "*.m4a"]
+ANALYTICS_PATTERNS = [
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*googlesyndication.com*",
+    "*connect.facebook.net*", "*hotjar.com*", "*clarity.ms*", "*segment.io*", "*segment.com*",
+    "*mixpanel.com*", "*intercom.io*", "*intercomcdn.com*", "*crisp.chat*", "*tawk.to*",
+]
+
+BASE_ARGS = ["--no-sandbox", "--disable-dev-shm-usage"]
+LEAN_ARGS = [
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-notifications",
+    "--no-first-run",
+    "--mute-audio",
+    "--disable-features=Translate,OptimizationHints,MediaRouter,AutofillServerCommunication",
+]
+
+
+class BrowserProfile:
+    """Chrome configuration applied at launch (args/prefs) and after launch (CDP/viewport)."""
+
+    def __init__(self, name, args=(), prefs=None, blocked_urls=(), viewport=(1366, 900), maximize=False):
+        self.name = name
+        self.args = list(args)
+        self.prefs = dict(prefs or {})
+        self.blocked_urls = list(blocked_urls)
+        self.viewport = viewport
+        self.maximize = maximize
+
+    def __repr__(self):
+        return f"BrowserProfile({self.name!r}, blocked={len(self.blocked_urls)} patterns)"
+
+
+PROFILES = {
+    # Previous behaviour: everything loads, maximized window
+    "full": BrowserProfile("full", BASE_ARGS, maximize=True),
+    # Skip images, fonts, media and third-party analytics
+    "lean": BrowserProfile(
+        "lean",
+        BASE_ARGS + LEAN_ARGS,
+        prefs={"profile.managed_default_content_settings.images": 2},
+        blocked_urls=IMAGE_PATTERNS + FONT_PATTERNS + MEDIA_PATTERNS + ANALYTICS_PATTERNS,
+    ),
+    # Keep page assets, only drop analytics and background Chrome traffic
+    "no-analytics": BrowserProfile("no-analytics", BASE_ARGS + LEAN_ARGS, blocked_urls=ANALYTICS_PATTERNS),
+}
+
+# Flows keep the previous behaviour unless they (or BROWSER_PROFILE*) opt into another profile
+DEFAULT_PROFILE = "full"
+
+
+def profile_for(flow=None, default=DEFAULT_PROFILE):
+    """Resolve the profile name for a flow from the environment."""
+    name = None
+    if flow:
+        name = os.getenv(f"BROWSER_PROFILE_{flow.upper()}")
+    name = name or os.getenv("BROWSER_PROFILE") or default
+    if name not in PROFILES:
+        logger.warning("Unknown browser profile '%s', using '%s'", name, default)
+        name = default
+    return PROFILES[name]
+
+
+def _resolve(profile):
+    if isinstance(profile, BrowserProfile):
+        return profile
+    return PROFILES[profile] if profile in PROFILES else profile_for(profile)
+
+
+def build_options(profile=DEFAULT_PROFILE, headless=False, options=None, capture_network=False):
+    """Return ChromeOptions for profile; capture_network turns on the performance log network_observer reads.
+
+    Only sessions that wait on backend calls should capture: chromedriver buffers
+    every Network event until the log is read, and sessions that never read it
+    just accumulate them.
+    """
+    profile = _resolve(profile)
+    options = options or Options()
+    if headless:
+        options.add_argument("--headless=new")
+    for arg in profile.args:
+        options.add_argument(arg)
+    if profile.viewport and not profile.maximize:
+        options.add_argument(f"--window-size={profile.viewport[0]},{profile.viewport[1]}")
+    if profile.prefs:
+        options.add_experimental_option("prefs", profile.prefs)
+    if capture_network:
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+    return options
+
+
+def apply_profile(driver, profile=DEFAULT_PROFILE, block_urls=True):
+    """Apply the post-launch parts of a profile: request blocking (CDP, unless block_urls=False) and viewport."""
+    profile = _resolve(profile)
+    if profile.blocked_urls and not block_urls:
+        logger.info("Profile '%s': request blocking skipped for this session", profile.name)
+    elif profile.blocked_urls:
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": profile.blocked_urls})
+        except Exception as e:
+            logger.warning("Could not enable request blocking for profile '%s': %s", profile.name, e)
+    if profile.maximize:
+        driver.maximize_window()
+    elif profile.viewport:
+        driver.set_window_size(*profile.viewport)
+    return driver
+
+
+def create_driver(profile=DEFAULT_PROFILE, headless=False, service=None, capture_network=False):
+    """Start Chrome configured with profile (a name, flow name or BrowserProfile)."""
+    profile = _resolve(profile)
+    options = build_options(profile, headless=headless, capture_network=capture_network)
+    driver = webdriver.Chrome(service=service, options=options) if service else webdriver.Chrome(options=options)
+    logger.info("Started Chrome with '%s' profile", profile.name)
+    return apply_profile(driver, profile)
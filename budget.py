@@ -0,0 +1,145 @@
+import os
+import time
+import threading
+from contextlib import contextmanager
+
+from selenium.common.exceptions import TimeoutException
+
+# -------------------- Timeout Budgets --------------------
+# Without a shared deadline every helper brings its own timeout: five
+# fallback selectors at 15s each, three click retries with 5s waits. A broken
+# page then hangs a flow for minutes. A Budget is a deadline for a flow; steps
+# take child budgets that can never outlive their parent, and every wait asks
+# the innermost active budget how long it may block:
+#
+#   with Budget("add_mission", 300).enter() as flow:
+#       with flow.child("business_details", 60).enter():
+#           WebDriverWait(driver, bounded(15)).until(...)
+#
+# Once a budget runs out, bounded() raises BudgetExceeded (a TimeoutException,
+# so existing `except TimeoutException` fallbacks give up immediately) and
+# report() tells which step used the time.
+
+DEFAULT_FLOW_BUDGET = float(os.getenv("FLOW_BUDGET", "600"))
+
+_local = threading.local()
+
+
+class BudgetExceeded(TimeoutException):
+    """A flow or step ran out of its time budget."""
+
+    def __init__(self, budget):
+        self.budget = budget
+        super().__init__(f"budget '{budget.path}' ({budget.seconds:g}s) exhausted")
+
+
+class Budget:
+    """A deadline, optionally nested inside a parent budget."""
+
+    def __init__(self, name, seconds, parent=None):
+        self.name = name
+        self.seconds = seconds
+        self.parent = parent
+        self.started = time.monotonic()
+        self.ended = None
+        self.own_deadline = self.started + seconds
+        self.deadline = min(self.own_deadline, parent.deadline) if parent else self.own_deadline
+        self.children = []
+
+    def __repr__(self):
+        return f"Budget({self.path!r}, {self.remaining():.1f}s of {self.seconds:.0f}s left)"
+
+    @property
+    def path(self):
+        return f"{self.parent.path}/{self.name}" if self.parent else self.name
+
+    @property
+    def used(self):
+        return (self.ended or time.monotonic()) - self.started
+
+    def remaining(self):
+        return max(self.deadline - time.monotonic(), 0.0)
+
+    @property
+    def expired(self):
+        return time.monotonic() >= self.deadline
+
+    @property
+    def exhausted(self):
+        """True if the budget ran out before it was left (or is out now)."""
+        return (self.ended or time.monotonic()) >= self.deadline
+
+    def limiting(self):
+        """The budget whose own deadline is the one in force (self or an ancestor)."""
+        budget = self
+        while budget.parent is not None and budget.own_deadline > budget.parent.deadline:
+            budget = budget.parent
+        return budget
+
+    def child(self, name, seconds=None):
+        """A step budget of `seconds` (default: all that is left), capped by this budget."""
+        budget = Budget(name, self.remaining() if seconds is None else seconds, parent=self)
+        self.children.append(budget)
+        return budget
+
+    def timeout(self, requested=None):
+        """How long a wait asking for `requested` seconds may block; raises BudgetExceeded when none is left."""
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise BudgetExceeded(self.limiting())
+        return remaining if requested is None else min(requested, remaining)
+
+    def sleep(self, seconds):
+        time.sleep(min(seconds, self.remaining()))
+
+    @contextmanager
+    def enter(self):
+        """Make this the budget that bounded()/pause() consume on this thread."""
+        stack = _stack()
+        stack.append(self)
+        try:
+            yield self
+        finally:
+            stack.pop()
+            self.ended = time.monotonic()
+
+    def report(self, indent=0):
+        """One line per budget: allotted, used, and which ones ran out."""
+        state = "EXHAUSTED" if self.exhausted else "ok"
+        lines = [f"{'  ' * indent}{self.name:<{32 - 2 * indent}} {self.used:7.1f}s of {self.seconds:5.0f}s  {state}"]
+        for child in self.children:
+            lines.extend(child.report(indent + 1).splitlines())
+        return "\n".join(lines)
+
+
+def _stack():
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def current():
+    """The innermost budget entered on this thread, or None."""
+    stack = _stack()
+    return stack[-1] if stack else None
+
+
+def bounded(timeout):
+    """`timeout` capped by the current budget (unchanged outside any budget)."""
+    budget = current()
+    return timeout if budget is None else budget.timeout(timeout)
+
+
+def expired():
+    budget = current()
+    return budget is not None and budget.expired
+
+
+def pause(seconds):
+    """time.sleep that never outlasts the current budget."""
+    budget = current()
+    if budget is None:
+        time.sleep(seconds)
+    else:
+        budget.sleep(seconds)
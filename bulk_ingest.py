@@ -0,0 +1,219 @@
+import os
+import sys
+import time
+import queue
+import logging
+import argparse
+import threading
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.file_detector import LocalFileDetector
+from selenium.webdriver.support import expected_conditions as EC
+
+import add_qualified_talent
+from add_qualified_talent import AutomationLogger, talent_wizard, wait_for_upload_progress
+from admission import get_admission_controller
+from grid import get_backend
+from log_setup import setup_logging
+from network_observer import CV_UPLOAD_PATTERN
+from recycling import DriverRecycler
+from run_log import get_run_log
+from wizard import Step, Wizard
+
+# -------------------- Bulk CV Ingestion --------------------
+# Adds one qualified talent per CV in a directory. Each file is handed to the
+# hidden <input type="file"> behind "Browse Files" (no native dialog, so it
+# works headless and on grid nodes), and the talents are spread over a pool of
+# logged-in browsers: every worker takes the next CV from a shared queue as
+# soon as it has saved the previous talent, and each stage waits for the
+# upload/parse request to finish instead of sleeping.
+#
+#   python bulk_ingest.py cvs/ --workers 4 --headless
+#
+# Prints CVs per minute and per-stage latency (open, upload, parse, form,
+# save); every step is also in the run log as a "timing" event of the
+# "bulk_ingest" flow.
+
+logger = logging.getLogger(__name__)
+
+CV_EXTENSIONS = (".pdf", ".doc", ".docx", ".odt", ".rtf")
+FILE_INPUT = (By.CSS_SELECTOR, "input[type='file']")
+DEFAULT_WORKERS = int(os.getenv("BULK_WORKERS", "2"))
+
+# Wizard step -> reported stage; every other step counts as form completion
+STAGES = {"open_add_talents": "open", "cv_upload": "upload", "cv_parse": "parse", "save_talent": "save"}
+STAGE_ORDER = ("open", "upload", "parse", "form", "save")
+
+
+def find_cvs(directory):
+    """CV files in directory, sorted by name."""
+    return sorted(os.path.join(directory, name) for name in os.listdir(directory)
+                  if name.lower().endswith(CV_EXTENSIONS) and os.path.isfile(os.path.join(directory, name)))
+
+
+def upload_file(path):
+    """Action that sends path to the step's file input."""
+    def action(run):
+        # Remote sessions need the file shipped to the node first
+        run.driver.file_detector = LocalFileDetector()
+        run.element.send_keys(os.path.abspath(path))
+        return True
+    action.__name__ = "upload_file"
+    return action
+
+
+def ingest_wizard(logger, path):
+    """talent_wizard for one CV: uploads path directly and keeps the name parsed from the CV."""
+    steps = []
+    for step in talent_wizard(logger, login=False).steps:
+        if step.name == "cv_upload":
+            step = Step("cv_upload", ready=EC.presence_of_element_located(FILE_INPUT),
+                        actions=[upload_file(path), wait_for_upload_progress],
+                        backend=CV_UPLOAD_PATTERN, backend_start=30, timeout=step.timeout)
+        elif step.name == "first_name":
+            continue
+        steps.append(step)
+    return Wizard("bulk_ingest", steps, reporter=logger)
+
+
+# -------------------- Results --------------------
+class IngestStats:
+    """Thread-safe per-CV outcomes and per-stage durations."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.monotonic()
+        self.ended = None
+        self.stages = {stage: [] for stage in STAGE_ORDER}
+        self.done = []
+        self.failed = []
+
+    def record(self, path, result):
+        durations = dict.fromkeys(STAGE_ORDER, 0.0)
+        for step in result.steps:
+            durations[STAGES.get(step.name, "form")] += step.duration
+        with self._lock:
+            if result.ok:
+                self.done.append(path)
+                for stage, seconds in durations.items():
+                    self.stages[stage].append(seconds)
+            else:
+                failed = next((step for step in result.steps if not step.ok and not step.optional), None)
+                self.failed.append((path, f"{failed.name}: {failed.reason}" if failed else "failed"))
+
+    def fail(self, path, reason):
+        with self._lock:
+            self.failed.append((path, reason))
+
+    @property
+    def per_minute(self):
+        elapsed = (self.ended or time.monotonic()) - self.started
+        return len(self.done) * 60 / elapsed if elapsed > 0 else 0.0
+
+    def stage_stats(self, stage):
+        """count, mean, p50, p95 and max seconds of one stage over the saved talents."""
+        values = sorted(self.stages[stage])
+        if not values:
+            return {"count": 0, "mean": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+        def pick(q):
+            return values[min(int(round(q * (len(values) - 1))), len(values) - 1)]
+        return {"count": len(values), "mean": sum(values) / len(values), "p50": pick(0.5),
+                "p95": pick(0.95), "max": values[-1]}
+
+    def summary(self):
+        elapsed = (self.ended or time.monotonic()) - self.started
+        lines = [f"Ingested {len(self.done)} CVs ({len(self.failed)} failed) in {elapsed:.0f}s: "
+                 f"{self.per_minute:.2f} CVs/min",
+                 f"{'stage':<8}{'mean':>8}{'p50':>8}{'p95':>8}{'max':>8}"]
+        for stage in STAGE_ORDER:
+            s = self.stage_stats(stage)
+            lines.append(f"{stage:<8}{s['mean']:>7.1f}s{s['p50']:>7.1f}s{s['p95']:>7.1f}s{s['max']:>7.1f}s")
+        lines.extend(f"FAILED {os.path.basename(path)}: {reason}" for path, reason in self.failed)
+        return "\n".join(lines)
+
+
+# -------------------- Workers --------------------
+def ingest_one(recycler, path, stats):
+    """Add the talent for one CV with the recycler's browser; returns the WizardResult or None."""
+    with recycler.flow() as driver:
+        if not recycler.start_ok:
+            stats.fail(path, "login failed")
+            return None
+        if not recycler.fresh:
+            driver.get(driver.home_url)
+        reporter = AutomationLogger(driver=driver, echo=False)
+        reporter.log_step(f"Ingesting {os.path.basename(path)}")
+        result = ingest_wizard(reporter, path).run(driver)
+    stats.record(path, result)
+    if not result.ok:
+        # Unknown page state; start the next CV in a fresh browser
+        recycler.recycle("failed flow")
+    return result
+
+
+def worker(name, cvs, stats, factory):
+    admission = get_admission_controller()
+    admission.acquire(name)
+    recycler = DriverRecycler.from_env(factory, on_start=add_qualified_talent.start_session, name=name)
+    try:
+        while True:
+            try:
+                path = cvs.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                result = ingest_one(recycler, path, stats)
+                if result is not None:
+                    logger.info("%s: %s %s in %.1fs", name, os.path.basename(path),
+                                "saved" if result.ok else "failed", result.duration)
+            except Exception as e:
+                logger.error("%s: %s failed: %s", name, os.path.basename(path), e)
+                stats.fail(path, str(e).splitlines()[0] if str(e) else type(e).__name__)
+                recycler.recycle("error")
+    finally:
+        recycler.close()
+        admission.release()
+
+
+def ingest(paths, workers=DEFAULT_WORKERS, headless=True):
+    """Add a talent per CV path across `workers` browsers; returns IngestStats."""
+    cvs = queue.Queue()
+    for path in paths:
+        cvs.put(path)
+    stats = IngestStats()
+
+    def factory():
+        return get_backend().create_driver("add_qualified_talent", headless=headless, capture_network=True)
+
+    threads = [threading.Thread(target=worker, args=(f"ingest-{index + 1}", cvs, stats, factory), daemon=True)
+               for index in range(max(1, min(workers, len(paths))))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats.ended = time.monotonic()
+    get_run_log().flush()
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Add a qualified talent for every CV in a directory")
+    parser.add_argument("directory")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="parallel browsers")
+    parser.add_argument("--headless", action="store_true", default=os.getenv("HEADLESS") == "1")
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    if not add_qualified_talent.check_credentials():
+        return 1
+    paths = find_cvs(args.directory)
+    if not paths:
+        logger.error("No CVs (%s) found in %s", ", ".join(CV_EXTENSIONS), args.directory)
+        return 1
+    stats = ingest(paths, workers=args.workers, headless=args.headless)
+    print(stats.summary())
+    return 0 if not stats.failed else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,308 @@
+import os
+import sys
+import json
+import socket
+import logging
+import threading
+import socketserver
+
+# -------------------- Coordination Service --------------------
+# Named barriers, events and a key/value channel for multi-actor scenarios.
+# `InProcessCoordinator` backs everything with threading primitives; the
+# socket server exposes the same backend over a JSON-lines TCP protocol so
+# actors can live in separate processes or on other hosts:
+#
+#   python coordination.py serve 8766
+#   COORDINATOR_URL=tcp://host:8766 python test_multi_login.py --actor Account-2
+#
+# Every blocking call takes a timeout. Barriers raise
+# threading.BrokenBarrierError on timeout (like threading.Barrier), event
+# waits return False and key lookups return the default.
+#
+# A server outlives scenario runs, so a run works in its own namespace
+# (`coordinator.scoped(run_id)`): a set event or a stored value of the previous
+# run is never seen by the next one, and `reset()` drops the run's state.
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8766
+
+
+class NamedBarrier:
+    """threading.Barrier-like handle: `wait(timeout)`."""
+
+    def __init__(self, coordinator, name, parties):
+        self.coordinator = coordinator
+        self.name = name
+        self.parties = parties
+
+    def wait(self, timeout=None):
+        return self.coordinator.barrier_wait(self.name, self.parties, timeout)
+
+
+class NamedEvent:
+    """threading.Event-like handle: `set()`, `is_set()`, `wait(timeout)`."""
+
+    def __init__(self, coordinator, name):
+        self.coordinator = coordinator
+        self.name = name
+
+    def set(self):
+        self.coordinator.event_set(self.name)
+
+    def is_set(self):
+        return self.coordinator.event_is_set(self.name)
+
+    def wait(self, timeout=None):
+        return self.coordinator.event_wait(self.name, timeout)
+
+
+class _Handles:
+    def barrier(self, name, parties):
+        return NamedBarrier(self, name, parties)
+
+    def event(self, name):
+        return NamedEvent(self, name)
+
+    def scoped(self, namespace):
+        """View of this coordinator whose names all live under `namespace/`."""
+        return ScopedCoordinator(self, namespace)
+
+
+class ScopedCoordinator(_Handles):
+    """Prefixes every barrier, event and key with a namespace (one per scenario run)."""
+
+    def __init__(self, coordinator, namespace):
+        self.coordinator = coordinator
+        self.prefix = f"{namespace}/"
+
+    def barrier_wait(self, name, parties, timeout=None):
+        return self.coordinator.barrier_wait(self.prefix + name, parties, timeout)
+
+    def event_set(self, name):
+        self.coordinator.event_set(self.prefix + name)
+
+    def event_is_set(self, name):
+        return self.coordinator.event_is_set(self.prefix + name)
+
+    def event_wait(self, name, timeout=None):
+        return self.coordinator.event_wait(self.prefix + name, timeout)
+
+    def put(self, key, value):
+        self.coordinator.put(self.prefix + key, value)
+
+    def get(self, key, timeout=None, default=None):
+        return self.coordinator.get(self.prefix + key, timeout, default)
+
+    def reset(self, prefix=""):
+        return self.coordinator.reset(self.prefix + prefix)
+
+
+class InProcessCoordinator(_Handles):
+    """Coordinator for actors that are threads of one process (and the server backend)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._barriers: dict = {}
+        self._events: dict = {}
+        self._values: dict = {}
+        self._values_changed = threading.Condition(self._lock)
+
+    def barrier_wait(self, name, parties, timeout=None):
+        with self._lock:
+            barrier = self._barriers.get(name)
+            if barrier is None or barrier.broken:
+                barrier = self._barriers[name] = threading.Barrier(parties)
+        if barrier.parties != parties:
+            raise ValueError(f"Barrier '{name}' has {barrier.parties} parties, not {parties}")
+        return barrier.wait(timeout)
+
+    def _event(self, name):
+        with self._lock:
+            return self._events.setdefault(name, threading.Event())
+
+    def event_set(self, name):
+        self._event(name).set()
+
+    def event_is_set(self, name):
+        return self._event(name).is_set()
+
+    def event_wait(self, name, timeout=None):
+        return self._event(name).wait(timeout)
+
+    def put(self, key, value):
+        with self._values_changed:
+            self._values[key] = value
+            self._values_changed.notify_all()
+
+    def get(self, key, timeout=None, default=None):
+        """Return the value for key, waiting up to timeout for it to be put."""
+        with self._values_changed:
+            if self._values_changed.wait_for(lambda: key in self._values, timeout):
+                return self._values[key]
+            return default
+
+    def reset(self, prefix=""):
+        """Forget the barriers, events and values whose names start with prefix; returns how many."""
+        with self._lock:
+            dropped = 0
+            for table in (self._barriers, self._events, self._values):
+                for name in [name for name in table if name.startswith(prefix)]:
+                    dropped += 1
+                    item = table.pop(name)
+                    if isinstance(item, threading.Barrier):
+                        # Release anyone still waiting instead of leaving them to their timeout
+                        item.abort()
+            return dropped
+
+
+# -------------------- Socket Server --------------------
+class _CoordinationHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        backend = self.server.backend
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                response = {"ok": True, "result": self._dispatch(backend, request)}
+            except threading.BrokenBarrierError:
+                response = {"ok": False, "error": "broken_barrier"}
+            except Exception as e:
+                response = {"ok": False, "error": str(e)}
+            self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+            self.wfile.flush()
+
+    @staticmethod
+    def _dispatch(backend, request):
+        op = request["op"]
+        if op == "barrier_wait":
+            return backend.barrier_wait(request["name"], request["parties"], request.get("timeout"))
+        if op == "event_set":
+            return backend.event_set(request["name"])
+        if op == "event_is_set":
+            return backend.event_is_set(request["name"])
+        if op == "event_wait":
+            return backend.event_wait(request["name"], request.get("timeout"))
+        if op == "put":
+            return backend.put(request["key"], request["value"])
+        if op == "get":
+            missing = object()
+            value = backend.get(request["key"], request.get("timeout"), missing)
+            return {"found": value is not missing, "value": None if value is missing else value}
+        if op == "reset":
+            return backend.reset(request.get("prefix", ""))
+        raise ValueError(f"Unknown operation: {op}")
+
+
+class CoordinationServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT, backend=None):
+        super().__init__((host, port), _CoordinationHandler)
+        self.backend = backend or InProcessCoordinator()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"tcp://{host}:{port}"
+
+
+def start_server(host="127.0.0.1", port=DEFAULT_PORT):
+    """Run a CoordinationServer in a daemon thread; port=0 picks a free port."""
+    server = CoordinationServer(host, port)
+    threading.Thread(target=server.serve_forever, name="coordination-server", daemon=True).start()
+    return server
+
+
+class CoordinationClient(_Handles):
+    """Same API as InProcessCoordinator, backed by a CoordinationServer.
+
+    Each thread keeps its own connection because calls block server-side.
+    """
+
+    def __init__(self, url, connect_timeout=5.0):
+        host, _, port = url.replace("tcp://", "").rpartition(":")
+        self.address = (host or "127.0.0.1", int(port))
+        self.connect_timeout = connect_timeout
+        self._local = threading.local()
+
+    def _stream(self):
+        stream = getattr(self._local, "stream", None)
+        if stream is None:
+            sock = socket.create_connection(self.address, timeout=self.connect_timeout)
+            stream = self._local.stream = (sock, sock.makefile("rwb"))
+        return stream
+
+    def _call(self, request, wait=0.0):
+        sock, stream = self._stream()
+        # Leave the server time to answer a timed-out wait before giving up on the socket
+        sock.settimeout(None if wait is None else wait + self.connect_timeout)
+        try:
+            stream.write((json.dumps(request) + "\n").encode("utf-8"))
+            stream.flush()
+            line = stream.readline()
+        except OSError:
+            self.close()
+            raise
+        if not line:
+            self.close()
+            raise ConnectionError("Coordination server closed the connection")
+        response = json.loads(line)
+        if response["ok"]:
+            return response["result"]
+        if response["error"] == "broken_barrier":
+            raise threading.BrokenBarrierError
+        raise RuntimeError(f"Coordination error: {response['error']}")
+
+    def barrier_wait(self, name, parties, timeout=None):
+        return self._call({"op": "barrier_wait", "name": name, "parties": parties, "timeout": timeout}, timeout)
+
+    def event_set(self, name):
+        self._call({"op": "event_set", "name": name})
+
+    def event_is_set(self, name):
+        return self._call({"op": "event_is_set", "name": name})
+
+    def event_wait(self, name, timeout=None):
+        return self._call({"op": "event_wait", "name": name, "timeout": timeout}, timeout)
+
+    def put(self, key, value):
+        self._call({"op": "put", "key": key, "value": value})
+
+    def get(self, key, timeout=None, default=None):
+        result = self._call({"op": "get", "key": key, "timeout": timeout}, timeout)
+        return result["value"] if result["found"] else default
+
+    def reset(self, prefix=""):
+        return self._call({"op": "reset", "prefix": prefix})
+
+    def close(self):
+        stream = getattr(self._local, "stream", None)
+        if stream is not None:
+            sock, file = stream
+            file.close()
+            sock.close()
+            self._local.stream = None
+
+
+def connect(url=None):
+    """Return a client for url / $COORDINATOR_URL, or an in-process coordinator when unset."""
+    url = url or os.getenv("COORDINATOR_URL")
+    if url:
+        return CoordinationClient(url)
+    return InProcessCoordinator()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != "serve":
+        print("Usage: python coordination.py serve [port] [host]")
+        sys.exit(1)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_PORT
+    host = sys.argv[3] if len(sys.argv) > 3 else "0.0.0.0"
+    with CoordinationServer(host, port) as server:
+        logger.info("Coordination server listening on %s", server.url)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,107 @@
+import base64
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# -------------------- Failure Evidence Capture --------------------
+# The browser thread only pulls the raw screenshot (base64, as sent by the
+# driver) and the page source. Decoding, hashing, compression and disk writes
+# run in a small thread pool. Artifacts are stored by content hash, so the
+# same stuck page captured on every retry (or on every run) is kept once.
+
+DEFAULT_ARTIFACT_DIR = "failure_artifacts"
+
+logger = logging.getLogger(__name__)
+
+
+class FailureCapture:
+    """Capture screenshot + DOM on failure without blocking the browser thread."""
+
+    def __init__(self, root=DEFAULT_ARTIFACT_DIR, max_workers=2):
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        self.manifest_path = os.path.join(root, "manifest.jsonl")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="failure-capture")
+        self._seen: set = set()
+        self._lock = threading.Lock()
+
+    def capture(self, driver, reason, session_id=None):
+        """Grab evidence from driver and hand it to the pool; returns a Future or None."""
+        try:
+            screenshot_b64 = driver.get_screenshot_as_base64()
+        except Exception as e:
+            logger.warning("Could not take failure screenshot: %s", e)
+            screenshot_b64 = None
+        try:
+            page_source = driver.page_source
+        except Exception as e:
+            logger.warning("Could not read page source for failure capture: %s", e)
+            page_source = None
+        try:
+            url = driver.current_url
+        except Exception:
+            url = None
+        if screenshot_b64 is None and page_source is None:
+            return None
+        return self._pool.submit(self._store, reason, session_id, url, time.time(), screenshot_b64, page_source)
+
+    def _store(self, reason, session_id, url, captured_at, screenshot_b64, page_source):
+        entry = {"ts": captured_at, "reason": reason, "session": session_id, "url": url}
+        if screenshot_b64 is not None:
+            entry["screenshot"] = self._put(base64.b64decode(screenshot_b64), ".png")
+        if page_source is not None:
+            entry["dom"] = self._put(page_source.encode("utf-8"), ".html.gz", compress=True)
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            with open(self.manifest_path, "a", encoding="utf-8") as f:
+                f.write(line)
+        logger.info("Captured failure evidence for '%s' (screenshot=%s, dom=%s)",
+                    reason, entry.get("screenshot"), entry.get("dom"))
+        return entry
+
+    def _put(self, data, suffix, compress=False):
+        digest = hashlib.sha256(data).hexdigest()
+        name = digest + suffix
+        with self._lock:
+            if name in self._seen:
+                return name
+            self._seen.add(name)
+        path = os.path.join(self.objects_dir, name)
+        if not os.path.exists(path):
+            payload = gzip.compress(data, compresslevel=6) if compress else data
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        return name
+
+    def shutdown(self, wait=True):
+        self._pool.shutdown(wait=wait)
+
+
+_default_capture = None
+_default_lock = threading.Lock()
+
+
+def get_failure_capture(root=DEFAULT_ARTIFACT_DIR):
+    """Return the process-wide FailureCapture instance."""
+    global _default_capture
+    with _default_lock:
+        if _default_capture is None:
+            _default_capture = FailureCapture(root)
+        return _default_capture
+
+
+def capture_failure(driver, reason, session_id=None):
+    """Capture evidence with the shared instance; never raises."""
+    try:
+        return get_failure_capture().capture(driver, reason, session_id)
+    except Exception as e:
+        logger.warning("Failure capture error: %s", e)
+        return None
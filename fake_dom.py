@@ -0,0 +1,739 @@
+import re
+from html import escape
+from html.parser import HTMLParser
+
+# -------------------- In-Memory DOM --------------------
+# A small HTML tree with the XPath 1.0 and CSS subsets the flows' selectors
+# use, for fake_driver.py. Whitespace-only text between tags is dropped, so
+# `<button>\n  <span>Add</span>\n</button>` has no text() of its own.
+#
+#   document = parse_html("<form><input id='email'></form>")
+#   select_xpath(document, "//input[@id='email']")
+#   select_css(document, "form > input#email")
+
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+HIDDEN_TAGS = {"head", "script", "style", "template", "title", "meta", "link"}
+
+
+class InvalidSelector(ValueError):
+    """Selector outside the supported XPath/CSS subset, or malformed."""
+
+
+class Node:
+    """Element ('tag'), text ('#text') or document ('#document') node."""
+
+    def __init__(self, tag, attrs=None, text=None):
+        self.tag = tag
+        self.attrs = dict(attrs or {})
+        self.text = text
+        self.parent = None
+        self.children = []
+        # Live form state, separate from the `value`/`checked` attributes like in a browser
+        self.value = self.attrs.get("value", "")
+        self.checked = "checked" in self.attrs
+
+    def __repr__(self):
+        if self.tag == "#text":
+            return f"Text({self.text!r})"
+        return f"<{self.tag}{''.join(f' {k}={v!r}' for k, v in self.attrs.items())}>"
+
+    @property
+    def is_element(self):
+        return not self.tag.startswith("#")
+
+    def append(self, child):
+        child.parent = self
+        self.children.append(child)
+        return child
+
+    def remove(self):
+        if self.parent is not None:
+            self.parent.children.remove(self)
+            self.parent = None
+
+    @property
+    def root(self):
+        node = self
+        while node.parent is not None:
+            node = node.parent
+        return node
+
+    def ancestors(self):
+        node = self.parent
+        while node is not None:
+            yield node
+            node = node.parent
+
+    def iter(self):
+        """This node and its descendants, in document order."""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
+
+    def elements(self):
+        return (node for node in self.iter() if node.is_element and node is not self)
+
+    @property
+    def element_children(self):
+        return [child for child in self.children if child.is_element]
+
+    def text_content(self):
+        if self.tag == "#text":
+            return self.text
+        return "".join(node.text for node in self.iter() if node.tag == "#text")
+
+    def own_text(self):
+        return " ".join(child.text for child in self.children if child.tag == "#text")
+
+    @property
+    def classes(self):
+        return self.attrs.get("class", "").split()
+
+    @property
+    def hidden(self):
+        """Hidden by itself (not counting ancestors)."""
+        if self.tag in HIDDEN_TAGS or "hidden" in self.attrs:
+            return True
+        if self.tag == "input" and self.attrs.get("type", "").lower() == "hidden":
+            return True
+        style = self.attrs.get("style", "").replace(" ", "").lower()
+        return "display:none" in style or "visibility:hidden" in style
+
+    @property
+    def displayed(self):
+        return self.is_element and not self.hidden and not any(node.hidden for node in self.ancestors())
+
+    def visible_text(self):
+        """Approximation of innerText: text of displayed descendants, whitespace collapsed."""
+        if not self.displayed:
+            return ""
+        parts = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node.tag == "#text":
+                parts.append(node.text)
+            elif node is self or not node.hidden:
+                stack.extend(reversed(node.children))
+        return " ".join(" ".join(parts).split())
+
+    def outer_html(self):
+        if self.tag == "#text":
+            return escape(self.text, quote=False)
+        inner = "".join(child.outer_html() for child in self.children)
+        if self.tag == "#document":
+            return inner
+        attrs = "".join(f' {k}="{escape(v)}"' if v is not None else f" {k}" for k, v in self.attrs.items())
+        if self.tag in VOID_TAGS:
+            return f"<{self.tag}{attrs}>"
+        return f"<{self.tag}{attrs}>{inner}</{self.tag}>"
+
+
+class Attr:
+    """Attribute node, produced by the XPath attribute axis."""
+
+    tag = "#attr"
+
+    def __init__(self, parent, name, value):
+        self.parent = parent
+        self.name = name
+        self.value = value
+
+    def text_content(self):
+        return self.value
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.document = Node("#document")
+        self.current = self.document
+
+    def handle_starttag(self, tag, attrs):
+        node = self.current.append(Node(tag, [(name, value if value is not None else "") for name, value in attrs]))
+        if tag not in VOID_TAGS:
+            self.current = node
+
+    def handle_startendtag(self, tag, attrs):
+        self.current.append(Node(tag, [(name, value if value is not None else "") for name, value in attrs]))
+
+    def handle_endtag(self, tag):
+        # Close up to the matching open element; stray end tags are ignored
+        for node in [self.current, *self.current.ancestors()]:
+            if node.tag == tag:
+                self.current = node.parent or self.document
+                return
+
+    def handle_data(self, data):
+        if data.strip():
+            self.current.append(Node("#text", text=data))
+
+
+def parse_html(markup):
+    """Parse markup into a '#document' Node."""
+    builder = _TreeBuilder()
+    builder.feed(markup)
+    builder.close()
+    return builder.document
+
+
+def parse_fragment(markup):
+    """Top-level nodes of markup, detached."""
+    nodes = list(parse_html(markup).children)
+    for node in nodes:
+        node.parent = None
+    return nodes
+
+
+def document_order(root):
+    return {id(node): index for index, node in enumerate(root.iter())}
+
+
+# -------------------- XPath --------------------
+_XPATH_TOKEN = re.compile(r"""
+    \s*(?:
+      (?P<string>"[^"]*"|'[^']*')
+    | (?P<number>\d+(?:\.\d*)?|\.\d+)
+    | (?P<op>//|::|\.\.|!=|<=|>=|[/()\[\]@,|=<>*.])
+    | (?P<name>[A-Za-z_][\w.-]*)
+    )""", re.VERBOSE)
+
+AXES = {"ancestor", "ancestor-or-self", "attribute", "child", "descendant", "descendant-or-self",
+        "following", "following-sibling", "parent", "preceding", "preceding-sibling", "self"}
+REVERSE_AXES = {"ancestor", "ancestor-or-self", "preceding", "preceding-sibling"}
+
+
+def _tokenize_xpath(expression):
+    tokens, position = [], 0
+    expression = expression.rstrip()
+    while position < len(expression):
+        match = _XPATH_TOKEN.match(expression, position)
+        if not match or match.end() == position:
+            raise InvalidSelector(f"Cannot parse XPath at {expression[position:]!r}: {expression}")
+        kind = match.lastgroup
+        value = match.group(kind)
+        tokens.append((kind, value[1:-1] if kind == "string" else value))
+        position = match.end()
+    return tokens
+
+
+class _XPathParser:
+    """Recursive descent over XPath 1.0 without arithmetic; produces nested tuples."""
+
+    def __init__(self, expression):
+        self.expression = expression
+        self.tokens = _tokenize_xpath(expression)
+        self.index = 0
+
+    def peek(self, offset=0):
+        index = self.index + offset
+        return self.tokens[index] if index < len(self.tokens) else (None, None)
+
+    def take(self, value=None):
+        token = self.peek()
+        if token[0] is None or value is not None and token[1] != value:
+            raise InvalidSelector(f"Expected {value!r} in XPath: {self.expression}")
+        self.index += 1
+        return token
+
+    def accept(self, value):
+        if self.peek()[1] == value and self.peek()[0] in ("op", "name"):
+            self.index += 1
+            return True
+        return False
+
+    def parse(self):
+        expression = self.expr()
+        if self.index != len(self.tokens):
+            raise InvalidSelector(f"Unexpected {self.peek()[1]!r} in XPath: {self.expression}")
+        return expression
+
+    def expr(self):
+        left = self.and_expr()
+        while self.peek() == ("name", "or"):
+            self.index += 1
+            left = ("or", left, self.and_expr())
+        return left
+
+    def and_expr(self):
+        left = self.equality()
+        while self.peek() == ("name", "and"):
+            self.index += 1
+            left = ("and", left, self.equality())
+        return left
+
+    def equality(self):
+        left = self.relational()
+        while self.peek()[1] in ("=", "!=") and self.peek()[0] == "op":
+            op = self.take()[1]
+            left = ("compare", op, left, self.relational())
+        return left
+
+    def relational(self):
+        left = self.union()
+        while self.peek()[1] in ("<", ">", "<=", ">=") and self.peek()[0] == "op":
+            op = self.take()[1]
+            left = ("compare", op, left, self.union())
+        return left
+
+    def union(self):
+        left = self.path()
+        while self.peek() == ("op", "|"):
+            self.index += 1
+            left = ("union", left, self.path())
+        return left
+
+    def path(self):
+        kind, value = self.peek()
+        if kind == "op" and value in ("/", "//"):
+            self.index += 1
+            steps = [] if value == "/" else [("descendant-or-self", "node()", [])]
+            if value == "//" or self._starts_step():
+                steps += self.relative_steps()
+            return ("path", True, None, steps)
+        if kind in ("string", "number") or (kind == "op" and value == "(") or (
+                kind == "name" and self.peek(1)[1] == "(" and value not in ("node", "text", "comment")):
+            primary = self.primary()
+            predicates = self.predicates()
+            if predicates:
+                primary = ("filter", primary, predicates)
+            if self.peek()[1] in ("/", "//") and self.peek()[0] == "op":
+                separator = self.take()[1]
+                steps = [("descendant-or-self", "node()", [])] if separator == "//" else []
+                return ("path", False, primary, steps + self.relative_steps())
+            return primary
+        return ("path", False, None, self.relative_steps())
+
+    def _starts_step(self):
+        kind, value = self.peek()
+        return kind == "name" or value in (".", "..", "@", "*")
+
+    def relative_steps(self):
+        steps = [self.step()]
+        while self.peek()[1] in ("/", "//") and self.peek()[0] == "op":
+            if self.take()[1] == "//":
+                steps.append(("descendant-or-self", "node()", []))
+            steps.append(self.step())
+        return steps
+
+    def step(self):
+        if self.accept(".."):
+            return ("parent", "node()", [])
+        if self.accept("."):
+            return ("self", "node()", [])
+        axis = "child"
+        if self.accept("@"):
+            axis = "attribute"
+        elif self.peek()[0] == "name" and self.peek(1) == ("op", "::"):
+            axis = self.take()[1]
+            self.take("::")
+            if axis not in AXES:
+                raise InvalidSelector(f"Unsupported XPath axis {axis!r}: {self.expression}")
+        kind, value = self.take()
+        if value == "*" or kind == "name":
+            test = value
+            if kind == "name" and self.peek() == ("op", "("):
+                self.take("(")
+                self.take(")")
+                test = f"{value}()"
+        else:
+            raise InvalidSelector(f"Expected a node test in XPath: {self.expression}")
+        return (axis, test, self.predicates())
+
+    def predicates(self):
+        predicates = []
+        while self.accept("["):
+            predicates.append(self.expr())
+            self.take("]")
+        return predicates
+
+    def primary(self):
+        kind, value = self.take()
+        if kind == "string":
+            return ("literal", value)
+        if kind == "number":
+            return ("literal", float(value))
+        if value == "(":
+            expression = self.expr()
+            self.take(")")
+            return expression
+        self.take("(")
+        args = []
+        if not self.accept(")"):
+            args.append(self.expr())
+            while self.accept(","):
+                args.append(self.expr())
+            self.take(")")
+        return ("call", value, args)
+
+
+def _string(value):
+    if isinstance(value, list):
+        return value[0].text_content() if value else ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float):
+        return str(int(value)) if value.is_integer() else str(value)
+    return value
+
+
+def _number(value):
+    try:
+        return float(_string(value).strip()) if not isinstance(value, (float, bool)) else float(value)
+    except ValueError:
+        return float("nan")
+
+
+def _boolean(value):
+    if isinstance(value, float):
+        return value != 0 and value == value
+    return bool(value)
+
+
+def _compare(op, left, right):
+    if isinstance(left, list) or isinstance(right, list):
+        lefts = [node.text_content() for node in left] if isinstance(left, list) else [left]
+        rights = [node.text_content() for node in right] if isinstance(right, list) else [right]
+        return any(_compare(op, a, b) for a in lefts for b in rights)
+    if op in ("=", "!="):
+        if isinstance(left, bool) or isinstance(right, bool):
+            equal = _boolean(left) == _boolean(right)
+        elif isinstance(left, float) or isinstance(right, float):
+            equal = _number(left) == _number(right)
+        else:
+            equal = left == right
+        return equal if op == "=" else not equal
+    a, b = _number(left), _number(right)
+    return {"<": a < b, ">": a > b, "<=": a <= b, ">=": a >= b}[op]
+
+
+class _XPathEvaluator:
+    def __init__(self, root):
+        self.root = root
+        self._order = None
+
+    def order(self):
+        if self._order is None:
+            self._order = document_order(self.root)
+        return self._order
+
+    def sort(self, nodes):
+        order = self.order()
+        seen, unique = set(), []
+        for node in nodes:
+            if id(node) not in seen:
+                seen.add(id(node))
+                unique.append(node)
+        # Attribute nodes sort right after their element
+        return sorted(unique, key=lambda n: (order.get(id(n.parent if isinstance(n, Attr) else n), -1),
+                                             isinstance(n, Attr)))
+
+    def evaluate(self, ast, node, position=1, size=1):
+        kind = ast[0]
+        if kind == "literal":
+            return ast[1]
+        if kind == "or":
+            return _boolean(self.evaluate(ast[1], node, position, size)) or \
+                _boolean(self.evaluate(ast[2], node, position, size))
+        if kind == "and":
+            return _boolean(self.evaluate(ast[1], node, position, size)) and \
+                _boolean(self.evaluate(ast[2], node, position, size))
+        if kind == "compare":
+            return _compare(ast[1], self.evaluate(ast[2], node, position, size),
+                            self.evaluate(ast[3], node, position, size))
+        if kind == "union":
+            return self.sort(self.evaluate(ast[1], node, position, size) + self.evaluate(ast[2], node, position, size))
+        if kind == "call":
+            return self.call(ast[1], ast[2], node, position, size)
+        if kind == "filter":
+            nodes = self.evaluate(ast[1], node, position, size)
+            return self.filter(nodes, ast[2])
+        if kind == "path":
+            _, absolute, start, steps = ast
+            if absolute:
+                nodes = [self.root]
+            elif start is not None:
+                nodes = self.evaluate(start, node, position, size)
+                if not isinstance(nodes, list):
+                    raise InvalidSelector("Path step applied to a non-node-set")
+            else:
+                nodes = [node]
+            for step in steps:
+                nodes = self.sort([match for context in nodes for match in self.step(step, context)])
+            return nodes
+        raise InvalidSelector(f"Unsupported XPath construct {kind!r}")
+
+    def filter(self, nodes, predicates):
+        for predicate in predicates:
+            size = len(nodes)
+            kept = []
+            for position, candidate in enumerate(nodes, 1):
+                value = self.evaluate(predicate, candidate, position, size)
+                if (value == position) if isinstance(value, float) else _boolean(value):
+                    kept.append(candidate)
+            nodes = kept
+        return nodes
+
+    def step(self, step, context):
+        axis, test, predicates = step
+        return self.filter([node for node in self.axis(axis, context) if self.test(test, node, axis)], predicates)
+
+    def axis(self, axis, node):
+        if isinstance(node, Attr):
+            if axis in ("parent", "ancestor", "ancestor-or-self"):
+                chain = [node.parent, *node.parent.ancestors()]
+                return ([node] if axis == "ancestor-or-self" else []) + chain if axis != "parent" else [node.parent]
+            return [node] if axis == "self" else []
+        if axis == "child":
+            return node.children
+        if axis == "descendant":
+            return list(node.iter())[1:]
+        if axis == "descendant-or-self":
+            return list(node.iter())
+        if axis == "self":
+            return [node]
+        if axis == "parent":
+            return [node.parent] if node.parent is not None else []
+        if axis == "ancestor":
+            return list(node.ancestors())
+        if axis == "ancestor-or-self":
+            return [node, *node.ancestors()]
+        if axis == "attribute":
+            return [Attr(node, name, value) for name, value in node.attrs.items()] if node.is_element else []
+        siblings = node.parent.children if node.parent is not None else [node]
+        index = next(i for i, sibling in enumerate(siblings) if sibling is node)
+        if axis == "following-sibling":
+            return siblings[index + 1:]
+        if axis == "preceding-sibling":
+            return siblings[:index][::-1]
+        everything = list(self.root.iter())
+        order = self.order()
+        mine = order[id(node)]
+        if axis == "following":
+            inside = {id(n) for n in node.iter()}
+            return [n for n in everything[mine + 1:] if id(n) not in inside]
+        if axis == "preceding":
+            ancestors = {id(n) for n in node.ancestors()}
+            return [n for n in everything[:mine] if id(n) not in ancestors][::-1]
+        raise InvalidSelector(f"Unsupported XPath axis {axis!r}")
+
+    @staticmethod
+    def test(test, node, axis):
+        if test == "node()":
+            return True
+        if test == "text()":
+            return node.tag == "#text"
+        if axis == "attribute":
+            return isinstance(node, Attr) and (test == "*" or node.name == test.lower())
+        if not getattr(node, "is_element", False):
+            return False
+        return test == "*" or node.tag == test.lower()
+
+    def call(self, name, args, node, position, size):
+        values = [self.evaluate(arg, node, position, size) for arg in args]
+        if name == "position":
+            return float(position)
+        if name == "last":
+            return float(size)
+        if name == "count":
+            return float(len(values[0]))
+        if name == "not":
+            return not _boolean(values[0])
+        if name == "true":
+            return True
+        if name == "false":
+            return False
+        if name == "boolean":
+            return _boolean(values[0])
+        if name == "number":
+            return _number(values[0] if values else [node])
+        if name in ("name", "local-name"):
+            target = values[0][0] if values and values[0] else (node if not values else None)
+            return "" if target is None else (target.name if isinstance(target, Attr) else target.tag)
+        strings = [_string(value) for value in values] or [node.text_content()]
+        if name == "string":
+            return strings[0]
+        if name == "normalize-space":
+            return " ".join(strings[0].split())
+        if name == "string-length":
+            return float(len(strings[0]))
+        if name == "contains":
+            return strings[1] in strings[0]
+        if name == "starts-with":
+            return strings[0].startswith(strings[1])
+        if name == "ends-with":
+            return strings[0].endswith(strings[1])
+        if name == "concat":
+            return "".join(strings)
+        if name == "translate":
+            source, frm, to = strings
+            table = {ord(c): (to[i] if i < len(to) else None) for i, c in reversed(list(enumerate(frm)))}
+            return source.translate(table)
+        if name in ("lower-case", "upper-case"):
+            return strings[0].lower() if name == "lower-case" else strings[0].upper()
+        raise InvalidSelector(f"Unsupported XPath function {name}()")
+
+
+_xpath_cache: dict = {}
+
+
+def compile_xpath(expression):
+    ast = _xpath_cache.get(expression)
+    if ast is None:
+        ast = _xpath_cache[expression] = _XPathParser(expression).parse()
+    return ast
+
+
+def select_xpath(context, expression):
+    """Elements matched by expression, evaluated against context, in document order."""
+    result = _XPathEvaluator(context.root).evaluate(compile_xpath(expression), context)
+    if not isinstance(result, list):
+        raise InvalidSelector(f"XPath does not select nodes: {expression}")
+    return [node for node in result if getattr(node, "is_element", False)]
+
+
+# -------------------- CSS --------------------
+_CSS_TOKEN = re.compile(r"""
+    (?P<comb>\s*[>+~]\s*|\s+)
+  | (?P<tag>\*|[A-Za-z][\w-]*)
+  | \#(?P<id>[\w-]+)
+  | \.(?P<cls>[\w-]+)
+  | \[\s*(?P<attr>[\w:-]+)\s*(?:(?P<op>[*^$~|]?=)\s*(?P<val>"[^"]*"|'[^']*'|[\w-]+)\s*(?P<flag>[iI])?\s*)?\]
+  | :(?P<pseudo>[\w-]+)(?:\((?P<arg>(?:[^()]|\([^()]*\))*)\))?
+    """, re.VERBOSE)
+
+
+def _split_top_level(selector, separator=","):
+    parts, depth, start, quote = [], 0, 0, None
+    for index, char in enumerate(selector):
+        if quote:
+            quote = None if char == quote else quote
+        elif char in "'\"":
+            quote = char
+        elif char in "([":
+            depth += 1
+        elif char in ")]":
+            depth -= 1
+        elif char == separator and depth == 0:
+            parts.append(selector[start:index])
+            start = index + 1
+    parts.append(selector[start:])
+    return [part.strip() for part in parts]
+
+
+def _attribute_test(name, op, value, flag):
+    if value is not None and value[:1] in "'\"":
+        value = value[1:-1]
+    fold = (lambda s: s.lower()) if flag else (lambda s: s)
+
+    def test(node):
+        if name not in node.attrs:
+            return False
+        if op is None:
+            return True
+        actual, wanted = fold(node.attrs[name] or ""), fold(value)
+        if op == "=":
+            return actual == wanted
+        if op == "*=":
+            return bool(wanted) and wanted in actual
+        if op == "^=":
+            return bool(wanted) and actual.startswith(wanted)
+        if op == "$=":
+            return bool(wanted) and actual.endswith(wanted)
+        if op == "~=":
+            return wanted in actual.split()
+        return actual == wanted or actual.startswith(wanted + "-")
+    return test
+
+
+def _pseudo_test(name, arg, selector):
+    if name == "not":
+        inner = compile_css(arg)
+        return lambda node: not any(_matches(node, chain) for chain in inner)
+    if name == "first-child":
+        return lambda node: node.parent is not None and node.parent.element_children[:1] == [node]
+    if name == "last-child":
+        return lambda node: node.parent is not None and node.parent.element_children[-1:] == [node]
+    if name in ("checked", "disabled", "enabled"):
+        return {"checked": lambda node: node.checked,
+                "disabled": lambda node: "disabled" in node.attrs,
+                "enabled": lambda node: "disabled" not in node.attrs}[name]
+    raise InvalidSelector(f"Unsupported CSS pseudo-class :{name} in {selector!r}")
+
+
+def _compile_complex(selector):
+    """[(combinator, [tests])] from left to right; the first combinator is None."""
+    chain, tests, combinator, position = [], [], None, 0
+    while position < len(selector):
+        match = _CSS_TOKEN.match(selector, position)
+        if not match:
+            raise InvalidSelector(f"Cannot parse CSS selector at {selector[position:]!r}: {selector}")
+        position = match.end()
+        if match.group("comb") is not None:
+            if tests:
+                chain.append((combinator, tests))
+                tests = []
+            combinator = match.group("comb").strip() or " "
+        elif match.group("tag"):
+            tag = match.group("tag").lower()
+            if tag == "*":
+                # Universal selector: a compound of its own, so "*", "div > *" and "* p" keep their step
+                tests.append(lambda node: True)
+            else:
+                tests.append(lambda node, tag=tag: node.tag == tag)
+        elif match.group("id"):
+            tests.append(lambda node, value=match.group("id"): node.attrs.get("id") == value)
+        elif match.group("cls"):
+            tests.append(lambda node, value=match.group("cls"): value in node.classes)
+        elif match.group("attr"):
+            tests.append(_attribute_test(match.group("attr").lower(), match.group("op"), match.group("val"),
+                                         match.group("flag")))
+        else:
+            tests.append(_pseudo_test(match.group("pseudo"), match.group("arg"), selector))
+    if not tests:
+        raise InvalidSelector(f"Empty CSS selector: {selector!r}")
+    chain.append((combinator, tests))
+    return chain
+
+
+_css_cache: dict = {}
+
+
+def compile_css(selector):
+    chains = _css_cache.get(selector)
+    if chains is None:
+        parts = _split_top_level(selector)
+        if not all(parts):
+            raise InvalidSelector(f"Empty CSS selector in {selector!r}")
+        chains = _css_cache[selector] = [_compile_complex(part) for part in parts]
+    return chains
+
+
+def _matches(node, chain, index=None):
+    index = len(chain) - 1 if index is None else index
+    combinator, tests = chain[index]
+    if not node.is_element or not all(test(node) for test in tests):
+        return False
+    if index == 0:
+        return True
+    if combinator == ">":
+        return node.parent is not None and _matches(node.parent, chain, index - 1)
+    if combinator == " ":
+        return any(_matches(ancestor, chain, index - 1) for ancestor in node.ancestors())
+    siblings = node.parent.element_children if node.parent is not None else [node]
+    before = siblings[:siblings.index(node)]
+    if combinator == "+":
+        return bool(before) and _matches(before[-1], chain, index - 1)
+    return any(_matches(sibling, chain, index - 1) for sibling in before)
+
+
+def matches_css(node, selector):
+    return any(_matches(node, chain) for chain in compile_css(selector))
+
+
+def select_css(context, selector):
+    """Descendant elements of context matching selector, in document order."""
+    chains = compile_css(selector)
+    return [node for node in context.elements() if any(_matches(node, chain) for chain in chains)]
@@ -0,0 +1,723 @@
+import time
+import uuid
+import heapq
+import hashlib
+import logging
+import itertools
+from contextlib import contextmanager
+from urllib.parse import urljoin
+
+from selenium.common.exceptions import (
+    ElementClickInterceptedException, ElementNotInteractableException, InvalidSelectorException,
+    JavascriptException, NoSuchElementException, StaleElementReferenceException, WebDriverException,
+)
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webelement import WebElement
+
+import form_fill
+import locators
+import page_metrics
+import text_index
+import wizard
+from fake_dom import InvalidSelector, Node, matches_css, parse_fragment, parse_html, select_css, select_xpath
+
+# -------------------- Fake WebDriver --------------------
+# An in-memory stand-in for a Chrome session, for exercising flow helpers in
+# milliseconds without a browser or the preprod site:
+#
+#   driver = FakeDriver({"https://preprod.kwiks.io/login": LOGIN_HTML,
+#                        "https://preprod.kwiks.io/dashboard": DASHBOARD_HTML})
+#   with VirtualClock():
+#       assert login(driver)
+#
+# Pages are HTML (or callables returning HTML) keyed by URL and parsed into
+# fake_dom's tree. It supports find_element(s) with XPath/CSS/id/name/tag/
+# class/link text, clicks, send_keys, WebDriverWait conditions and
+# ActionChains clicks. Built-in page behaviour:
+#
+#   * links and `data-href` navigate on click; submit buttons and Enter in a
+#     form field navigate to the form's `action`,
+#   * `data-intercept` makes native clicks raise ElementClickInterceptedException
+#     (JS and ActionChains clicks go through), like an overlay would,
+#   * `input[role=combobox][data-options="A|B"]` behaves like react-select:
+#     typing opens a [role=option] menu and clicking an option shows the value,
+#   * on_click(css, handler) / on_submit(css, handler) run Python handlers and
+#     later(seconds, fn) schedules DOM changes, to model pages that react.
+#
+# execute_script understands scrollIntoView/click one-liners and the repo's
+# own page scripts (form_fill, text_index, locators, wizard, page_metrics),
+# re-implemented in Python; register_script() adds more. Any other script
+# raises JavascriptException, so a test notices what the fake cannot do. The
+# ported scripts are pinned by checksum in PORTED_SCRIPTS: editing one fails
+# tests/test_page_scripts.py until its port and pin are updated. That test
+# also runs the real scripts in headless Chrome when CHROME_TESTS=1.
+#
+# VirtualClock makes time.sleep/time.monotonic virtual, so fixed sleeps and
+# WebDriverWait timeouts in the flows cost no real time.
+
+logger = logging.getLogger(__name__)
+
+_ids = itertools.count(1)
+
+
+# -------------------- Virtual Time --------------------
+class VirtualClock:
+    """Patch time.sleep to advance time.monotonic instead of blocking (process-wide while active)."""
+
+    def __init__(self):
+        self.offset = 0.0
+        self._real_sleep = time.sleep
+        self._real_monotonic = time.monotonic
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            self.offset += seconds
+
+    def monotonic(self):
+        return self._real_monotonic() + self.offset
+
+    def __enter__(self):
+        time.sleep, time.monotonic = self.sleep, self.monotonic
+        return self
+
+    def __exit__(self, *exc):
+        time.sleep, time.monotonic = self._real_sleep, self._real_monotonic
+
+
+# -------------------- Elements --------------------
+class FakeElement(WebElement):
+    """WebElement over a fake_dom Node (isinstance checks in expected_conditions still pass)."""
+
+    def __init__(self, driver, node):
+        super().__init__(driver, driver._node_id(node))
+        self.node = node
+
+    def __repr__(self):
+        return f"FakeElement({self.node!r})"
+
+    def _live(self):
+        self._parent._tick()
+        if self.node.root is not self._parent.document:
+            raise StaleElementReferenceException(f"{self.node!r} is no longer attached to the page")
+        return self.node
+
+    @property
+    def tag_name(self):
+        return self._live().tag
+
+    @property
+    def text(self):
+        return self._live().visible_text()
+
+    def get_attribute(self, name):
+        node = self._live()
+        if name == "value" and node.tag in ("input", "textarea", "select"):
+            return node.value
+        if name in ("checked", "selected"):
+            return "true" if node.checked else None
+        if name in ("textContent", "innerText"):
+            return node.text_content() if name == "textContent" else node.visible_text()
+        if name in ("outerHTML", "innerHTML"):
+            html = node.outer_html()
+            return html if name == "outerHTML" else "".join(child.outer_html() for child in node.children)
+        return node.attrs.get(name)
+
+    def get_dom_attribute(self, name):
+        return self._live().attrs.get(name)
+
+    def get_property(self, name):
+        return self.get_attribute(name)
+
+    def value_of_css_property(self, property_name):
+        return ""
+
+    def is_displayed(self):
+        return self._live().displayed
+
+    def is_enabled(self):
+        node = self._live()
+        return "disabled" not in node.attrs and not any(
+            "disabled" in ancestor.attrs and ancestor.tag == "fieldset" for ancestor in node.ancestors())
+
+    def is_selected(self):
+        return self._live().checked
+
+    @property
+    def location(self):
+        return {"x": 0, "y": 0}
+
+    @property
+    def size(self):
+        return {"width": 100, "height": 20} if self.is_displayed() else {"width": 0, "height": 0}
+
+    @property
+    def rect(self):
+        return {**self.location, **self.size}
+
+    def click(self):
+        node = self._live()
+        if not node.displayed:
+            raise ElementNotInteractableException(f"{node!r} is not displayed")
+        if "data-intercept" in node.attrs:
+            raise ElementClickInterceptedException(f"Click on {node!r} intercepted by another element")
+        self._parent._click(node)
+
+    def send_keys(self, *value):
+        node = self._live()
+        if not node.displayed and not (node.tag == "input" and node.attrs.get("type") == "file"):
+            raise ElementNotInteractableException(f"{node!r} is not reachable by keyboard")
+        self._parent._type(node, "".join(str(part) for part in value))
+
+    def clear(self):
+        node = self._live()
+        self._parent._set_value(node, "")
+
+    def submit(self):
+        self._parent._submit(self._live())
+
+    def find_element(self, by=By.ID, value=None):
+        return self._parent._find(by, value, self._live(), single=True)
+
+    def find_elements(self, by=By.ID, value=None):
+        return self._parent._find(by, value, self._live())
+
+    @property
+    def screenshot_as_base64(self):
+        return ""
+
+
+class _Timeouts:
+    def __init__(self):
+        self.implicit_wait = 0
+        self.page_load = 300
+        self.script = 30
+
+
+class _SwitchTo:
+    def __init__(self, driver):
+        self._driver = driver
+
+    @property
+    def active_element(self):
+        return self._driver._wrap(self._driver.focused or self._driver.document)
+
+    def default_content(self):
+        pass
+
+    def window(self, handle):
+        if handle not in self._driver.window_handles:
+            raise WebDriverException(f"No such window: {handle}")
+
+
+# -------------------- Driver --------------------
+class FakeDriver:
+    """WebDriver look-alike over an in-memory DOM; `pages` maps URLs to HTML or callable(driver, url)."""
+
+    name = "fake"
+
+    def __init__(self, pages=None, url=None):
+        self.pages = dict(pages or {})
+        self.session_id = uuid.uuid4().hex
+        self.capabilities = {"browserName": "fake", "browserVersion": "0"}
+        self.timeouts = _Timeouts()
+        self.switch_to = _SwitchTo(self)
+        self.window_handles = [uuid.uuid4().hex]
+        self.current_window_handle = self.window_handles[0]
+        self.history = []
+        self.clicks = []
+        self.scripts = {}
+        self.focused = None
+        self.quit_called = False
+        self._current_url = "about:blank"
+        self.document = parse_html("")
+        self._click_handlers = []
+        self._submit_handlers = []
+        self._timers = []
+        self._timer_seq = itertools.count()
+        self._select_all = False
+        self._text_indexes = {}
+        self._menus = {}
+        self._register_builtin_scripts()
+        if url:
+            self.get(url)
+
+    # -------- navigation --------
+    @property
+    def current_url(self):
+        self._tick()
+        return self._current_url
+
+    @property
+    def title(self):
+        titles = select_css(self.document, "title")
+        return titles[0].text_content().strip() if titles else ""
+
+    @property
+    def page_source(self):
+        return "<!DOCTYPE html>" + self.document.outer_html()
+
+    def get(self, url):
+        url = urljoin(self._current_url, url) if self._current_url != "about:blank" else url
+        page = self.pages.get(url)
+        if page is None:
+            page = self.pages.get(url.split("?")[0].split("#")[0], "<html><body><h1>404 Not Found</h1></body></html>")
+        html = page(self, url) if callable(page) else page
+        self.load(html, url)
+
+    def load(self, html, url=None):
+        """Replace the document (a navigation when url is given)."""
+        if url is not None:
+            self._current_url = url
+            self.history.append(url)
+        self.document = parse_html(html)
+        self.focused = None
+        self._menus.clear()
+
+    def refresh(self):
+        self.get(self._current_url)
+
+    def back(self):
+        if len(self.history) > 1:
+            self.history.pop()
+            url = self.history.pop()
+            self.get(url)
+
+    # -------- page behaviour hooks --------
+    def on_click(self, css, handler):
+        """Call handler(driver, element) after an element matching css is clicked."""
+        self._click_handlers.append((css, handler))
+
+    def on_submit(self, css, handler):
+        """Call handler(driver, form_element) instead of navigating when a matching form is submitted."""
+        self._submit_handlers.append((css, handler))
+
+    def later(self, seconds, function):
+        """Run function(driver) once `seconds` of (virtual) time have passed."""
+        heapq.heappush(self._timers, (time.monotonic() + seconds, next(self._timer_seq), function))
+
+    def _tick(self):
+        while self._timers and self._timers[0][0] <= time.monotonic():
+            _, _, function = heapq.heappop(self._timers)
+            function(self)
+
+    def append_html(self, css, html):
+        """Append markup to the first element matching css."""
+        parent = self._find(By.CSS_SELECTOR, css, self.document, single=True).node
+        for node in parse_fragment(html):
+            parent.append(node)
+
+    def remove(self, css):
+        for node in select_css(self.document, css):
+            node.remove()
+
+    # -------- finding --------
+    def _node_id(self, node):
+        # Stable per node, so two lookups of one element compare equal
+        if getattr(node, "fake_id", None) is None:
+            node.fake_id = f"fake-{next(_ids)}"
+        return node.fake_id
+
+    def _wrap(self, node):
+        return FakeElement(self, node)
+
+    def _find(self, by, value, context, single=False):
+        self._tick()
+        try:
+            if by == By.XPATH:
+                nodes = select_xpath(context, value)
+            elif by == By.CSS_SELECTOR:
+                nodes = select_css(context, value)
+            elif by == By.ID:
+                nodes = [n for n in context.elements() if n.attrs.get("id") == value]
+            elif by == By.NAME:
+                nodes = [n for n in context.elements() if n.attrs.get("name") == value]
+            elif by == By.TAG_NAME:
+                nodes = [n for n in context.elements() if n.tag == value.lower()]
+            elif by == By.CLASS_NAME:
+                nodes = [n for n in context.elements() if value in n.classes]
+            elif by in (By.LINK_TEXT, By.PARTIAL_LINK_TEXT):
+                links = [n for n in context.elements() if n.tag == "a"]
+                nodes = [n for n in links if (n.visible_text() == value if by == By.LINK_TEXT
+                                               else value in n.visible_text())]
+            else:
+                raise InvalidSelectorException(f"Unsupported locator strategy {by!r}")
+        except InvalidSelector as e:
+            raise InvalidSelectorException(str(e)) from None
+        if single:
+            if not nodes:
+                raise NoSuchElementException(f"Unable to locate element: {{'method': {by!r}, 'selector': {value!r}}}")
+            return self._wrap(nodes[0])
+        return [self._wrap(node) for node in nodes]
+
+    def find_element(self, by=By.ID, value=None):
+        return self._find(by, value, self.document, single=True)
+
+    def find_elements(self, by=By.ID, value=None):
+        return self._find(by, value, self.document)
+
+    # -------- interaction --------
+    def _click(self, node):
+        self.clicks.append(node)
+        self.focused = node
+        if node in self._menus:
+            self._pick_option(node)
+        if node.tag == "input" and node.attrs.get("type") in ("checkbox", "radio"):
+            if node.attrs["type"] == "radio":
+                for other in select_css(self.document, f"input[type='radio'][name='{node.attrs.get('name', '')}']"):
+                    other.checked = False
+            node.checked = not node.checked or node.attrs["type"] == "radio"
+        for css, handler in list(self._click_handlers):
+            if matches_css(node, css) or any(matches_css(a, css) for a in node.ancestors() if a.is_element):
+                handler(self, self._wrap(node))
+                return
+        target = next((n for n in [node, *node.ancestors()] if n.is_element and
+                       (n.tag == "a" and n.attrs.get("href") or "data-href" in n.attrs)), None)
+        if target is not None:
+            self.get(target.attrs.get("data-href") or target.attrs["href"])
+            return
+        button = next((n for n in [node, *node.ancestors()] if n.tag == "button" or
+                       n.tag == "input" and n.attrs.get("type") == "submit"), None)
+        if button is not None and button.attrs.get("type", "submit") == "submit":
+            form = next((n for n in button.ancestors() if n.tag == "form"), None)
+            if form is not None:
+                self._submit(form)
+
+    def _submit(self, node):
+        form = node if node.tag == "form" else next((n for n in node.ancestors() if n.tag == "form"), None)
+        if form is None:
+            return
+        for css, handler in self._submit_handlers:
+            if matches_css(form, css):
+                handler(self, self._wrap(form))
+                return
+        if form.attrs.get("action"):
+            self.get(form.attrs["action"])
+
+    def _set_value(self, node, value):
+        node.value = value
+        if node.attrs.get("role") == "combobox" and "data-options" in node.attrs:
+            self._open_menu(node)
+
+    def _type(self, node, keys):
+        self.focused = node
+        value = node.value
+        index = 0
+        while index < len(keys):
+            key = keys[index]
+            if key == Keys.CONTROL and keys[index + 1:index + 2].lower() == "a":
+                self._select_all = True
+                index += 2
+                continue
+            if key in (Keys.DELETE, Keys.BACKSPACE):
+                value = "" if self._select_all else (value[:-1] if key == Keys.BACKSPACE else value)
+            elif key in (Keys.RETURN, Keys.ENTER):
+                if node.tag != "textarea":
+                    self._set_value(node, value)
+                    self._select_all = False
+                    self._submit(node)
+                    return
+                value += "\n"
+            elif "\ue000" <= key <= "\uf8ff":
+                pass  # other special keys have no effect on the value
+            else:
+                value = key if self._select_all else value + key
+            self._select_all = False
+            index += 1
+        if node.tag == "input" and node.attrs.get("type") == "file":
+            node.attrs["data-files"] = value
+        self._set_value(node, value)
+
+    # -------- react-select style comboboxes --------
+    def _open_menu(self, input_node):
+        for option, owner in list(self._menus.items()):
+            if owner is input_node:
+                option.remove()
+                del self._menus[option]
+        typed = input_node.value.strip().lower()
+        if not typed:
+            return
+        menu = input_node.parent.append(Node("div", {"role": "listbox", "class": "menu"}))
+        for label in input_node.attrs["data-options"].split("|"):
+            if typed in label.lower():
+                option = menu.append(Node("div", {"role": "option"}))
+                option.append(Node("#text", text=label))
+                self._menus[option] = input_node
+        self._menus[menu] = input_node
+
+    def _pick_option(self, option):
+        input_node = self._menus[option]
+        label = option.text_content()
+        for node, owner in list(self._menus.items()):
+            if owner is input_node:
+                node.remove()
+                del self._menus[node]
+        input_node.value = ""
+        for shown in [n for n in input_node.parent.children if "single-value" in n.classes]:
+            shown.remove()
+        shown = input_node.parent.append(Node("div", {"class": "single-value"}))
+        shown.append(Node("#text", text=label))
+
+    # -------- scripts --------
+    def register_script(self, source, handler):
+        """Answer execute_script(source, *args) with handler(driver, *args)."""
+        self.scripts[source.strip()] = handler
+
+    def execute_script(self, script, *args):
+        self._tick()
+        handler = self.scripts.get(script.strip())
+        if handler is not None:
+            return handler(self, *args)
+        body = script.strip().removeprefix("return ").strip()
+        if ".scrollIntoView(" in body and body.startswith("arguments[0]"):
+            args[0]._live()
+            return None
+        if body.rstrip(";") == "arguments[0].click()":
+            node = args[0]._live()
+            self._click(node)
+            return None
+        if body.rstrip(";") == "document.readyState":
+            return "complete"
+        if "localStorage.clear()" in body or "sessionStorage.clear()" in body:
+            return None
+        raise JavascriptException(f"FakeDriver cannot run script: {script.strip()[:80]!r}")
+
+    def execute_async_script(self, script, *args):
+        return self.execute_script(script, *args)
+
+    def execute(self, command, params=None):
+        """ActionChains support: pointer actions click the element the pointer last moved to."""
+        if command != Command.W3C_ACTIONS:
+            raise WebDriverException(f"FakeDriver does not support command {command!r}")
+        target = None
+        for source in (params or {}).get("actions", []):
+            for action in source.get("actions", []):
+                if action.get("type") == "pointerMove" and action.get("origin") not in (None, "viewport", "pointer"):
+                    target = self._origin_element(action["origin"])
+                elif action.get("type") == "pointerUp" and target is not None:
+                    self._click(target._live())
+        return {"value": None}
+
+    def _origin_element(self, origin):
+        """The element a pointer action moves to: a FakeElement or its W3C reference ({"element-6066-…": id})."""
+        if isinstance(origin, FakeElement):
+            return origin
+        element_id = next(iter(origin.values()), None) if isinstance(origin, dict) else None
+        node = next((n for n in self.document.iter() if getattr(n, "fake_id", None) == element_id), None)
+        if node is None:
+            raise StaleElementReferenceException(f"No element {element_id!r} on the page")
+        return self._wrap(node)
+
+    def _register_builtin_scripts(self):
+        self.register_script(form_fill.RESOLVE_JS, _resolve_comboboxes)
+        self.register_script(form_fill.SELECT_JS, _select_option)
+        self.register_script(form_fill.VERIFY_JS, _verify_selections)
+        self.register_script(text_index.COLLECT_JS, _collect_text)
+        self.register_script(text_index.RESOLVE_JS, _resolve_text)
+        self.register_script(locators.TEXT_QUERY_JS, _text_query)
+        self.register_script(wizard.FINGERPRINT_JS, _fingerprint)
+        self.register_script(wizard.SETTLED_JS, lambda driver, css: not select_css(driver.document, css))
+        self.register_script(page_metrics.OBSERVER_JS, lambda driver, *args: None)
+        self.register_script(page_metrics.DRAIN_JS, lambda driver, *args: [])
+
+    # -------- session --------
+    def get_log(self, log_type):
+        # Like a non-Chromium browser: network waits fall back to their timeouts
+        raise WebDriverException(f"Log type {log_type!r} is not available in the fake driver")
+
+    def get_screenshot_as_base64(self):
+        return ""
+
+    def get_screenshot_as_png(self):
+        return b""
+
+    def save_screenshot(self, filename):
+        return False
+
+    def get_cookies(self):
+        return []
+
+    def add_cookie(self, cookie):
+        pass
+
+    def delete_all_cookies(self):
+        pass
+
+    def set_script_timeout(self, seconds):
+        self.timeouts.script = seconds
+
+    def implicitly_wait(self, seconds):
+        self.timeouts.implicit_wait = seconds
+
+    def set_page_load_timeout(self, seconds):
+        self.timeouts.page_load = seconds
+
+    def maximize_window(self):
+        pass
+
+    def set_window_size(self, width, height, windowHandle="current"):
+        pass
+
+    def close(self):
+        pass
+
+    def quit(self):
+        self.quit_called = True
+
+
+# -------------------- Page Scripts in Python --------------------
+# "<module>.<name>" -> sha256 prefix of the script the port below was written against
+PORTED_SCRIPTS = {
+    "form_fill.RESOLVE_JS": "b0235750b920d690",
+    "form_fill.SELECT_JS": "652aa1fc232b8055",
+    "form_fill.VERIFY_JS": "e01870ac367a17be",
+    "text_index.COLLECT_JS": "34033843fe37894e",
+    "text_index.RESOLVE_JS": "09534106bb31da59",
+    "locators.TEXT_QUERY_JS": "a910a5d8e046d7c2",
+    "wizard.FINGERPRINT_JS": "f7ccbe4872576abe",
+    "wizard.SETTLED_JS": "9ca1df0520f23e36",
+}
+
+_PORTED_MODULES = {"form_fill": form_fill, "text_index": text_index, "locators": locators, "wizard": wizard}
+
+
+def script_checksum(source):
+    return hashlib.sha256(source.strip().encode()).hexdigest()[:16]
+
+
+def stale_ports():
+    """Names in PORTED_SCRIPTS whose script changed since its Python port was written."""
+    stale = []
+    for name, pinned in PORTED_SCRIPTS.items():
+        module, attr = name.split(".")
+        if script_checksum(getattr(_PORTED_MODULES[module], attr)) != pinned:
+            stale.append(name)
+    return stale
+
+
+def _norm(text):
+    return " ".join((text or "").split())
+
+
+def _root(driver, scope):
+    return scope._live() if scope is not None else driver.document
+
+
+def _order(driver):
+    return {id(node): index for index, node in enumerate(driver.document.iter())}
+
+
+def _resolve_comboboxes(driver, names, scope):
+    root = _root(driver, scope)
+    order = _order(driver)
+    labels = select_css(root, "p, label")
+    found = []
+    for name in names:
+        wanted = _norm(name)
+        label = next((el for el in labels if _norm(el.own_text()) == wanted or _norm(el.text_content()) == wanted), None)
+        target = None
+        for box in (label.ancestors() if label is not None else []):
+            if not box.is_element or box is not root and root not in box.ancestors():
+                break
+            target = next((el for el in select_css(box, 'input[role="combobox"]')
+                           if order[id(el)] > order[id(label)]), None)
+            if target is None:
+                continue
+            if any(el is not label and _norm(el.own_text()) and not select_css(el, 'input[role="combobox"]')
+                   and label not in el.ancestors() and el not in label.ancestors()
+                   and order[id(label)] < order[id(el)] < order[id(target)] for el in labels):
+                target = None
+            break
+        found.append(driver._wrap(target) if target is not None else None)
+    return found
+
+
+def _select_option(driver, input_element, value, type_value, timeout_ms):
+    node = input_element._live()
+    driver.focused = node
+    if type_value:
+        driver._set_value(node, value)
+    wanted = _norm(value)
+    options = [el for el in select_css(driver.document, '[role="option"]')]
+    match = next((el for el in options if _norm(el.text_content()) == wanted), None)
+    if match is None:
+        # Options may be rendered by a scheduled change within the timeout
+        deadline = time.monotonic() + timeout_ms / 1000
+        while match is None and driver._timers and driver._timers[0][0] <= deadline:
+            time.sleep(max(driver._timers[0][0] - time.monotonic(), 0))
+            driver._tick()
+            options = select_css(driver.document, '[role="option"]')
+            match = next((el for el in options if _norm(el.text_content()) == wanted), None)
+    if match is None:
+        return "no_match" if options else "no_menu"
+    driver._click(match)
+    return "selected"
+
+
+def _verify_selections(driver, inputs, values):
+    results = []
+    for element, value in zip(inputs, values):
+        if element is None or element.node.root is not driver.document:
+            results.append(False)
+            continue
+        control, depth = element.node.parent, 0
+        while control is not None and not _norm(control.text_content()) and depth < 6:
+            control, depth = control.parent, depth + 1
+        wanted = _norm(value)
+        results.append(control is not None and any(_norm(el.text_content()) == wanted for el in control.elements()))
+    return results
+
+
+def _collect_text(driver, css, scope, token):
+    elements, texts = [], []
+    for node in select_css(_root(driver, scope), css):
+        text = node.visible_text()
+        if node.displayed and text:
+            elements.append(node)
+            texts.append([node.tag, text])
+    driver._text_indexes = {token: elements}
+    return texts
+
+
+def _resolve_text(driver, token, positions):
+    elements = driver._text_indexes.get(token)
+    if elements is None:
+        return None
+    return [driver._wrap(elements[i]) for i in positions]
+
+
+def _text_query(driver, scope, css, needle, case_sensitive, deep, exact, closest, limit):
+    out = []
+    for node in select_css(_root(driver, scope), css):
+        text = _norm(node.text_content() if deep else node.own_text())
+        if not case_sensitive:
+            text = text.lower()
+        if needle is not None and (text != needle if exact else needle not in text):
+            continue
+        target = node
+        if closest:
+            target = next((a for a in node.ancestors() if a.is_element and matches_css(a, closest)), None)
+        if target is None or not target.displayed or target in out:
+            continue
+        out.append(target)
+        if len(out) >= limit:
+            break
+    return [driver._wrap(node) for node in out]
+
+
+def _fingerprint(driver):
+    parts = []
+    for node in select_css(driver.document, 'h1, h2, h3, h4, h5, label, input, textarea, select, [role="combobox"]'):
+        if not node.displayed:
+            continue
+        key = node.attrs.get("placeholder") or node.attrs.get("name") or node.text_content() or ""
+        parts.append(f"{node.tag.upper()}:{key.strip()[:40]}")
+    return "|".join(parts)
+
+
+@contextmanager
+def fake_session(pages=None, url=None):
+    """A FakeDriver with the virtual clock running, for `with fake_session(PAGES) as driver:`."""
+    with VirtualClock():
+        yield FakeDriver(pages, url)
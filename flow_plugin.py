@@ -0,0 +1,205 @@
+import os
+import json
+import logging
+import statistics
+import threading
+
+import pytest
+
+# -------------------- pytest Plugin for the Flows --------------------
+# Opt-in: a plain `pytest` run never loads it.
+#
+#   pytest -p flow_plugin flow_suite.py                   # one process
+#   pytest -p flow_plugin flow_suite.py -n 4              # pytest-xdist, 4 workers
+#
+# runs the flows as ordinary (parametrized) tests and writes JUnit XML to
+# reports/flows-junit.xml unless --junitxml says otherwise. (flow_suite.py
+# also lists the plugin in pytest_plugins, but loaded that late it cannot set
+# the JUnit default or register its marker in time; pass -p.)
+#
+# Fixtures:
+#   client_session / talent_session  session-scoped DriverRecycler (recycling.py)
+#       holding one logged-in browser per account. Under xdist every worker is
+#       its own session, so these are per-worker browsers.
+#   client_driver / talent_driver    that browser for one test, back on its
+#       landing page (recycled and logged in again by the RECYCLE_* limits).
+#   fresh_driver                     a new browser for one test, quit afterwards.
+#   flow_timings                     records a WizardResult's step durations as
+#       JUnit properties.
+#
+# With xdist's default `--dist load`, tests are handed out longest first using
+# the durations of previous runs (.flow_durations.json, or --flow-durations),
+# so one slow flow does not end up last on an otherwise idle worker.
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DURATIONS_PATH = ".flow_durations.json"
+DEFAULT_JUNIT_PATH = "reports/flows-junit.xml"
+UNKNOWN_DURATION = 60.0
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("flows", "Kwiks flow tests")
+    group.addoption("--flow-durations", default=os.getenv("FLOW_DURATIONS", DEFAULT_DURATIONS_PATH),
+                    help="JSON file of historical test durations used for xdist scheduling")
+    group.addoption("--flow-headless", action="store_true", default=os.getenv("HEADLESS") == "1",
+                    help="start browsers headless")
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    config.addinivalue_line("markers", "flow(name): an end-to-end flow against the Kwiks preprod site")
+    # Before the junitxml plugin reads the option
+    if not config.option.xmlpath:
+        config.option.xmlpath = os.getenv("FLOW_JUNIT_XML", DEFAULT_JUNIT_PATH)
+        os.makedirs(os.path.dirname(config.option.xmlpath) or ".", exist_ok=True)
+    if not hasattr(config, "workerinput"):
+        # The controller sees every worker's reports
+        config.flow_durations = FlowDurations(config.getoption("flow_durations"))
+        config.pluginmanager.register(config.flow_durations, "flow-durations")
+
+
+# -------------------- Historical Durations --------------------
+class FlowDurations:
+    """Per-test durations (exponentially averaged across runs) in a JSON file; also the plugin that records them."""
+
+    def __init__(self, path, alpha=0.5):
+        self.path = path
+        self.alpha = alpha
+        self._lock = threading.Lock()
+        try:
+            with open(path, encoding="utf-8") as f:
+                self.durations = json.load(f)
+        except (OSError, ValueError):
+            self.durations = {}
+        self._default = statistics.median(self.durations.values()) if self.durations else UNKNOWN_DURATION
+        self._setup: dict = {}
+
+    def get(self, nodeid):
+        return self.durations.get(nodeid, self._default)
+
+    def record(self, nodeid, seconds):
+        with self._lock:
+            previous = self.durations.get(nodeid)
+            self.durations[nodeid] = seconds if previous is None else (
+                self.alpha * seconds + (1 - self.alpha) * previous)
+
+    def save(self):
+        with self._lock:
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.durations, f, indent=1, sort_keys=True)
+            os.replace(tmp, self.path)
+
+    def pytest_runtest_logreport(self, report):
+        # Setup counts too: it includes the login when a test gets a fresh browser
+        if report.when == "setup":
+            self._setup[report.nodeid] = report.duration
+        elif report.when == "call" and not report.skipped:
+            self.record(report.nodeid, self._setup.pop(report.nodeid, 0.0) + report.duration)
+
+    def pytest_sessionfinish(self, session):
+        if self.durations:
+            try:
+                self.save()
+            except OSError as e:
+                logger.warning("Could not save flow durations to %s: %s", self.path, e)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    """Longest-first load balancing for `--dist load` (xdist's default with -n)."""
+    if config.getoption("dist") != "load":
+        return None
+    from xdist.scheduler import LoadScheduling
+
+    class DurationScheduling(LoadScheduling):
+        """LoadScheduling that sends the slowest tests (by history) first."""
+
+        ordered = False
+
+        def _send_tests(self, node, num):
+            if not self.ordered:
+                # First send after the collection was fixed: reorder the whole queue once
+                self.pending.sort(key=lambda index: -config.flow_durations.get(self.collection[index]))
+                self.ordered = True
+            super()._send_tests(node, num)
+
+    return DurationScheduling(config, log)
+
+
+# -------------------- Drivers --------------------
+def _worker(config):
+    return getattr(config, "workerinput", {}).get("workerid", "main")
+
+
+def _session(request, flow, module):
+    """DriverRecycler whose browsers log in with module.start_session; skips without credentials."""
+    from grid import get_backend
+    from recycling import DriverRecycler
+
+    if not module.check_credentials():
+        pytest.skip(f"{flow}: credentials not set")
+    headless = request.config.getoption("flow_headless")
+    # Both flows wait on backend calls (description generation, CV upload/parse)
+    recycler = DriverRecycler.from_env(lambda: get_backend().create_driver(flow, headless=headless,
+                                                                           capture_network=True),
+                                       on_start=module.start_session,
+                                       name=f"{flow}-{_worker(request.config)}")
+    request.addfinalizer(recycler.close)
+    return recycler
+
+
+def _driver(recycler):
+    with recycler.flow() as driver:
+        if not recycler.start_ok:
+            pytest.fail(f"{recycler.name}: login failed")
+        if not recycler.fresh:
+            driver.get(driver.home_url)
+        yield driver
+
+
+@pytest.fixture(scope="session")
+def client_session(request):
+    """Logged-in client-account browser(s) for this session (xdist worker)."""
+    import add_mission
+    return _session(request, "add_mission", add_mission)
+
+
+@pytest.fixture(scope="session")
+def talent_session(request):
+    """Logged-in talent-account browser(s) for this session (xdist worker)."""
+    import add_qualified_talent
+    return _session(request, "add_qualified_talent", add_qualified_talent)
+
+
+@pytest.fixture
+def client_driver(client_session):
+    yield from _driver(client_session)
+
+
+@pytest.fixture
+def talent_driver(talent_session):
+    yield from _driver(talent_session)
+
+
+@pytest.fixture
+def fresh_driver(request):
+    """A new browser for one test (profile from the test's `flow` marker, default profile otherwise)."""
+    from browser_profiles import DEFAULT_PROFILE
+    from grid import get_backend
+    marker = request.node.get_closest_marker("flow")
+    driver = get_backend().create_driver(marker.args[0] if marker else DEFAULT_PROFILE,
+                                         headless=request.config.getoption("flow_headless"))
+    yield driver
+    driver.quit()
+
+
+@pytest.fixture
+def flow_timings(request):
+    """record(result): attach a WizardResult's per-step durations to the JUnit test case."""
+    def record(result):
+        for step in result.steps:
+            request.node.user_properties.append((f"step.{step.name}", f"{step.duration:.2f}"))
+        return result
+    return record
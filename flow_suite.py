@@ -0,0 +1,33 @@
+import pytest
+
+from add_mission import mission_wizard
+from add_qualified_talent import AutomationLogger, talent_wizard
+
+# -------------------- Flow Suite --------------------
+# The end-to-end flows as pytest tests (fixtures in flow_plugin.py). Not picked
+# up by a bare `pytest`; run it explicitly:
+#
+#   pytest -p flow_plugin flow_suite.py -n 4 --flow-headless
+
+pytest_plugins = ["flow_plugin"]
+
+MISSIONS = [
+    pytest.param({"job_title": "Analyst Engineer Test"}, id="analyst-onsite"),
+    pytest.param({"job_title": "QA Engineer Test", "work_model": "Remote"}, id="qa-remote"),
+]
+
+
+@pytest.mark.flow("add_mission")
+@pytest.mark.parametrize("mission", MISSIONS)
+def test_add_mission(client_driver, flow_timings, mission):
+    result = flow_timings(mission_wizard(**mission).run(client_driver))
+    print(result.summary())
+    assert result.ok, result.summary()
+
+
+@pytest.mark.flow("add_qualified_talent")
+def test_add_qualified_talent(talent_driver, flow_timings):
+    logger = AutomationLogger(driver=talent_driver, echo=False)
+    result = flow_timings(talent_wizard(logger, login=False).run(talent_driver))
+    print(result.summary())
+    assert result.ok, result.summary()
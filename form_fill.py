@@ -0,0 +1,151 @@
+import logging
+
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException, WebDriverException
+
+from budget import bounded
+from timeouts import AdvisedWait
+
+# -------------------- Bulk Select Filling --------------------
+# react-select comboboxes used to be filled one at a time: find the label,
+# scroll, sleep, click, type, sleep, then wait up to 15s for the option. Here
+# every combobox of a step is resolved with one query, each option is picked
+# by an in-page script that types the value and waits for the menu with a
+# MutationObserver (no polling, no sleeps), and all selections are verified
+# with one final read. Each label still waits (up to `wait`, within the step
+# budget) for its combobox to render and become enabled, so a slow step or a
+# City that only unlocks once Country is set is waited for, not skipped.
+#
+#   results = fill_selects(driver, {"Country": "Morocco", "City": "Casablanca"})
+#   if not all(results.values()): ...
+
+logger = logging.getLogger(__name__)
+
+# Label (p/label whose own text equals the name) -> first combobox after it in the label's field container
+# (its nearest ancestor holding a combobox), unless another label comes first: that combobox is another field's
+RESOLVE_JS = """
+const [names, scope] = arguments;
+const root = scope || document;
+const norm = s => (s || '').replace(/\\s+/g, ' ').trim();
+const ownText = el => norm(Array.from(el.childNodes).filter(n => n.nodeType === 3).map(n => n.nodeValue).join(' '));
+const labels = Array.from(root.querySelectorAll('p, label'));
+const after = (a, b) => a.compareDocumentPosition(b) & Node.DOCUMENT_POSITION_FOLLOWING;
+const isLabel = el => ownText(el) && !el.querySelector('input[role="combobox"]');
+return names.map(name => {
+    const wanted = norm(name);
+    const label = labels.find(el => ownText(el) === wanted || norm(el.textContent) === wanted);
+    if (!label) return null;
+    for (let box = label.parentElement; box && (box === root || root.contains(box)); box = box.parentElement) {
+        const input = Array.from(box.querySelectorAll('input[role="combobox"]')).find(el => after(label, el));
+        if (!input) continue;
+        const other = labels.some(el => el !== label && isLabel(el) && !label.contains(el) && !el.contains(label)
+                                        && after(label, el) && after(el, input));
+        return other ? null : input;
+    }
+    return null;
+});
+"""
+
+# Type the value (unless already typed) and click the option once it renders
+SELECT_JS = """
+const [input, value, type, timeoutMs, done] = arguments;
+const norm = s => (s || '').replace(/\\s+/g, ' ').trim();
+const wanted = norm(value);
+const findOption = () => Array.from(document.querySelectorAll('[role="option"]')).find(el => norm(el.textContent) === wanted);
+const pick = el => { el.scrollIntoView({block: 'nearest'}); el.click(); done('selected'); };
+input.scrollIntoView({block: 'center'});
+input.focus();
+if (type) {
+    const setter = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set;
+    setter.call(input, value);
+    input.dispatchEvent(new Event('input', {bubbles: true}));
+}
+const found = findOption();
+if (found) return pick(found);
+let finished = false;
+const observer = new MutationObserver(() => {
+    const el = findOption();
+    if (el && !finished) { finished = true; observer.disconnect(); clearTimeout(timer); pick(el); }
+});
+observer.observe(document.body, {childList: true, subtree: true, characterData: true});
+const timer = setTimeout(() => {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    done(document.querySelector('[role="option"]') ? 'no_match' : 'no_menu');
+}, timeoutMs);
+"""
+
+# For each input: does its control now show exactly the wanted value?
+VERIFY_JS = """
+const [inputs, values] = arguments;
+const norm = s => (s || '').replace(/\\s+/g, ' ').trim();
+return inputs.map((input, i) => {
+    if (!input || !input.isConnected) return false;
+    let control = input.parentElement;
+    for (let depth = 0; control && !norm(control.textContent) && depth < 6; depth++) control = control.parentElement;
+    if (!control) return false;
+    const wanted = norm(values[i]);
+    return Array.from(control.querySelectorAll('*')).some(el => norm(el.textContent) === wanted);
+});
+"""
+
+
+def _select(driver, input_element, value, timeout):
+    """Pick value in one combobox; falls back to real keystrokes if scripted typing opened no menu."""
+    timeout = bounded(timeout)
+    driver.set_script_timeout(timeout + 5)
+    status = driver.execute_async_script(SELECT_JS, input_element, value, True, int(timeout * 1000))
+    if status == "no_menu":
+        input_element.click()
+        input_element.send_keys(value)
+        timeout = bounded(timeout)
+        driver.set_script_timeout(timeout + 5)
+        status = driver.execute_async_script(SELECT_JS, input_element, value, False, int(timeout * 1000))
+    return status
+
+
+def _enabled_combobox(label, scope):
+    """Wait condition: the label's combobox once it is rendered and enabled."""
+    def condition(driver):
+        input_element = driver.execute_script(RESOLVE_JS, [label], scope)[0]
+        return input_element if input_element is not None and input_element.is_enabled() else False
+    return condition
+
+
+def fill_selects(driver, values, timeout=5, scope=None, wait=15):
+    """Select {label: option} in react-select comboboxes, in order; returns {label: verified}.
+
+    Every combobox is resolved in one query up front; one that is missing or
+    disabled at its turn (not rendered yet, or unlocked by an earlier field,
+    e.g. City after Country) is waited for up to `wait` seconds.
+    """
+    labels = list(values)
+    original_timeout = driver.timeouts.script if hasattr(driver, "timeouts") else None
+    try:
+        inputs = driver.execute_script(RESOLVE_JS, labels, scope) or [None] * len(labels)
+        for index, label in enumerate(labels):
+            try:
+                if inputs[index] is None or not inputs[index].is_enabled():
+                    inputs[index] = None
+                    try:
+                        inputs[index] = AdvisedWait(driver, f"form_fill.{label}", wait, ignored_exceptions=(
+                            StaleElementReferenceException,)).until(_enabled_combobox(label, scope))
+                    except TimeoutException:
+                        logger.error("No combobox found for '%s'", label)
+                        continue
+                status = _select(driver, inputs[index], values[label], timeout)
+                if status != "selected":
+                    logger.error("Could not select '%s' for '%s' (%s)", values[label], label, status)
+            except WebDriverException as e:
+                logger.error("Failed to select '%s' for '%s': %s", values[label], label, e.msg or e)
+        verified = driver.execute_script(VERIFY_JS, inputs, [values[label] for label in labels]) or []
+    finally:
+        if original_timeout is not None:
+            driver.set_script_timeout(original_timeout)
+    results = dict(zip(labels, verified)) if verified else dict.fromkeys(labels, False)
+    for label, ok in results.items():
+        if ok:
+            logger.info("Selected '%s' for '%s'", values[label], label)
+        else:
+            logger.error("Selection for '%s' not shown after filling", label)
+    return results
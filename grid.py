@@ -0,0 +1,297 @@
+import os
+import json
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import Future
+
+import urllib3
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+
+from browser_profiles import DEFAULT_PROFILE, apply_profile, build_options, create_driver
+
+# -------------------- Execution Backends --------------------
+# Flows get their browser from a backend: `LocalBackend` starts Chrome on this
+# host, `RemoteBackend` opens a session on one of a list of remote WebDriver
+# endpoints (Selenium Grid hubs or standalone nodes). Nodes are picked by
+# advertised free slots, then by measured /status latency.
+#
+#   SELENIUM_NODES=http://node-a:4444,http://node-b:4444 python test_multi_login.py
+#
+# `GridScheduler` runs whole flows (callables taking a driver) on the node
+# pool and requeues a flow on another node when its node dies mid-run.
+
+logger = logging.getLogger(__name__)
+
+_http = urllib3.PoolManager(maxsize=8, retries=False)
+
+
+class NodeFailure(Exception):
+    """A remote node could not be reached or lost the session."""
+
+
+class RemoteNode:
+    """One remote WebDriver endpoint and what we last learned about it."""
+
+    def __init__(self, url, max_slots=None):
+        self.url = url.rstrip("/")
+        self.max_slots = max_slots
+        self.advertised_free = None
+        self.latency = None
+        self.alive = True
+        self.in_flight = 0
+
+    def __repr__(self):
+        return (f"RemoteNode({self.url!r}, alive={self.alive}, free={self.free_slots}, "
+                f"latency={self.latency and round(self.latency * 1000)}ms)")
+
+    @property
+    def free_slots(self):
+        if not self.alive:
+            return 0
+        if self.advertised_free is not None:
+            return max(self.advertised_free, 0)
+        return max((self.max_slots or 1) - self.in_flight, 0)
+
+    def probe(self, timeout=3.0):
+        """Refresh liveness, free slots and latency from GET /status."""
+        start = time.perf_counter()
+        try:
+            response = _http.request("GET", f"{self.url}/status", timeout=timeout)
+            status = json.loads(response.data.decode("utf-8")).get("value", {})
+        except Exception as e:
+            if self.alive:
+                logger.warning("Node %s unreachable: %s", self.url, e)
+            self.alive = False
+            return self
+        self.latency = time.perf_counter() - start
+        self.alive = bool(status.get("ready", True))
+        self.advertised_free = _advertised_free_slots(status)
+        return self
+
+
+def _advertised_free_slots(status):
+    """Free slots from a Grid 4 / standalone /status payload; None if not reported."""
+    nodes = status.get("nodes")
+    if nodes is None and "node" in status:
+        nodes = [status["node"]]
+    if not nodes:
+        return None
+    free = 0
+    for node in nodes:
+        if node.get("availability", "UP") != "UP":
+            continue
+        free += sum(1 for slot in node.get("slots", []) if not slot.get("session"))
+    return free
+
+
+class NodePool:
+    """Thread-safe slot accounting over a set of RemoteNodes."""
+
+    def __init__(self, nodes, probe_interval=5.0):
+        self.nodes = [node if isinstance(node, RemoteNode) else RemoteNode(node) for node in nodes]
+        self.probe_interval = probe_interval
+        self._last_probe = 0.0
+        self._changed = threading.Condition()
+
+    def refresh(self, force=False):
+        if not force and time.monotonic() - self._last_probe < self.probe_interval:
+            return
+        self._last_probe = time.monotonic()
+        for node in self.nodes:
+            node.probe()
+        with self._changed:
+            self._changed.notify_all()
+
+    def _best(self):
+        candidates = [node for node in self.nodes if node.free_slots > 0]
+        if not candidates:
+            return None
+        return max(candidates, key=lambda node: (node.free_slots, -(node.latency or 0.0)))
+
+    def acquire(self, timeout=300):
+        """Reserve a slot on the best node, waiting for capacity up to timeout."""
+        deadline = time.monotonic() + timeout
+        while True:
+            self.refresh()
+            with self._changed:
+                node = self._best()
+                if node is not None:
+                    # Local estimate until the next /status probe corrects it
+                    node.in_flight += 1
+                    if node.advertised_free is not None:
+                        node.advertised_free -= 1
+                    return node
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError("No remote WebDriver slot became free")
+                if not any(node.alive for node in self.nodes):
+                    self._last_probe = 0.0
+                self._changed.wait(min(remaining, self.probe_interval))
+
+    def release(self, node):
+        with self._changed:
+            node.in_flight = max(node.in_flight - 1, 0)
+            if node.advertised_free is not None:
+                node.advertised_free += 1
+            self._changed.notify_all()
+
+    def mark_dead(self, node):
+        with self._changed:
+            node.alive = False
+            self._changed.notify_all()
+        logger.warning("Marked node %s as dead", node.url)
+
+
+def _is_node_failure(error):
+    if isinstance(error, (NodeFailure, ConnectionError, urllib3.exceptions.HTTPError)):
+        return True
+    message = str(error).lower()
+    return isinstance(error, WebDriverException) and any(
+        text in message for text in ("connection refused", "max retries exceeded", "invalid session id",
+                                     "session deleted", "node down"))
+
+
+def remote_driver(node, profile, headless=True, capture_network=False):
+    """Open a session on node with the given browser profile."""
+    options = build_options(profile, headless=headless, capture_network=capture_network)
+    try:
+        driver = webdriver.Remote(command_executor=node.url, options=options)
+    except Exception as e:
+        raise NodeFailure(f"Could not start a session on {node.url}: {e}") from e
+    # webdriver.Remote has no execute_cdp_cmd: only the profile's switches, prefs and viewport apply on the node
+    return apply_profile(driver, profile, block_urls=False)
+
+
+# -------------------- Backends --------------------
+class LocalBackend:
+    """Start Chrome on this host."""
+
+    def create_driver(self, profile, headless=False, capture_network=False):
+        return create_driver(profile, headless=headless, capture_network=capture_network)
+
+
+class RemoteBackend:
+    """Start sessions on the least loaded, lowest-latency remote node."""
+
+    def __init__(self, nodes, driver_factory=remote_driver, acquire_timeout=300):
+        self.pool = nodes if isinstance(nodes, NodePool) else NodePool(nodes)
+        self.driver_factory = driver_factory
+        self.acquire_timeout = acquire_timeout
+
+    def create_driver(self, profile, headless=True, attempts=3, capture_network=False):
+        for attempt in range(attempts):
+            node = self.pool.acquire(self.acquire_timeout)
+            try:
+                driver = self.driver_factory(node, profile, headless, capture_network)
+            except Exception as e:
+                self.pool.release(node)
+                if not _is_node_failure(e):
+                    raise
+                self.pool.mark_dead(node)
+                logger.warning("Session start failed on %s (attempt %d): %s", node.url, attempt + 1, e)
+                continue
+            driver.grid_node = node
+            self._release_on_quit(driver, node)
+            logger.info("Started remote session on %s", node.url)
+            return driver
+        raise NodeFailure(f"Could not start a session after {attempts} attempts")
+
+    def _release_on_quit(self, driver, node):
+        original_quit = driver.quit
+        released = threading.Event()
+
+        def quit():
+            try:
+                original_quit()
+            finally:
+                if not released.is_set():
+                    released.set()
+                    self.pool.release(node)
+        driver.quit = quit
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    """Shared RemoteBackend for $SELENIUM_NODES (comma-separated URLs), else LocalBackend."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            nodes = [url.strip() for url in os.getenv("SELENIUM_NODES", "").split(",") if url.strip()]
+            _backend = RemoteBackend(nodes) if nodes else LocalBackend()
+        return _backend
+
+
+# -------------------- Scheduler --------------------
+class GridScheduler:
+    """Run flows (callables taking a driver) on a backend; with a RemoteBackend, requeue on node death."""
+
+    def __init__(self, backend, workers=None, max_attempts=3, profile=DEFAULT_PROFILE, headless=True,
+                 capture_network=False):
+        self.backend = backend
+        self.max_attempts = max_attempts
+        self.profile = profile
+        self.headless = headless
+        self.capture_network = capture_network
+        self._queue = queue.Queue()
+        # Only a RemoteBackend has a node pool; a LocalBackend runs one flow at a time unless told otherwise
+        self.pool = getattr(backend, "pool", None)
+        capacity = 1
+        if self.pool is not None:
+            self.pool.refresh(force=True)
+            capacity = sum(node.free_slots for node in self.pool.nodes) or 1
+        self._workers = [threading.Thread(target=self._work, name=f"grid-worker-{i}", daemon=True)
+                         for i in range(workers or capacity)]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, flow, *args, name=None, **kwargs):
+        """Queue flow(driver, *args, **kwargs); returns a Future with its result."""
+        future = Future()
+        self._queue.put((name or getattr(flow, "__name__", "flow"), flow, args, kwargs, future, 1))
+        return future
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            name, flow, args, kwargs, future, attempt = job
+            if attempt == 1 and not future.set_running_or_notify_cancel():
+                continue
+            driver = None
+            try:
+                driver = self.backend.create_driver(self.profile, headless=self.headless,
+                                                    capture_network=self.capture_network)
+                node = getattr(driver, "grid_node", None)
+                result = flow(driver, *args, **kwargs)
+            except Exception as e:
+                node = getattr(driver, "grid_node", None)
+                if _is_node_failure(e) and attempt < self.max_attempts:
+                    if node is not None and self.pool is not None:
+                        self.pool.mark_dead(node)
+                    logger.warning("Flow '%s' lost its node (attempt %d), requeueing: %s", name, attempt, e)
+                    self._queue.put((name, flow, args, kwargs, future, attempt + 1))
+                else:
+                    future.set_exception(e)
+                continue
+            finally:
+                if driver is not None:
+                    try:
+                        driver.quit()
+                    except Exception:
+                        pass
+            logger.info("Flow '%s' finished on %s", name, node.url if node else "local")
+            future.set_result(result)
+
+    def shutdown(self, wait=True):
+        for _ in self._workers:
+            self._queue.put(None)
+        if wait:
+            for worker in self._workers:
+                worker.join()
@@ -0,0 +1,246 @@
+import os
+import time
+import random
+import logging
+import threading
+from collections import Counter, deque
+
+# -------------------- Shared LLM Client --------------------
+# Report generation and talent-name generation both call Gemini. They go
+# through one long-lived LLMClient instead of each configuring genai and
+# building its own GenerativeModel, so parallel suites share:
+#
+#   * a token bucket (LLM_RATE requests/s, bursts of LLM_BURST) that keeps the
+#     process under the API quota,
+#   * a semaphore bounding in-flight calls (LLM_CONCURRENCY),
+#   * exponential backoff with jitter on 429/5xx and timeouts (LLM_MAX_RETRIES),
+#   * a per-request timeout (LLM_TIMEOUT seconds),
+#   * latency, token and cost counters (stats()/summary()).
+#
+#   text = get_llm_client().generate("Generate a single first name")
+#
+# LLM_BACKEND=stub swaps Gemini for a local StubModel, for running offline.
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = os.getenv("LLM_MODEL", "models/gemini-1.5-flash")
+# USD per million tokens (input, output); gemini-1.5-flash list price by default
+PRICE_PER_MTOK = (float(os.getenv("LLM_PRICE_IN", "0.075")), float(os.getenv("LLM_PRICE_OUT", "0.30")))
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+
+
+def estimate_tokens(text):
+    """Rough token count (about four characters per token) for budgeting without a tokenizer."""
+    return (len(text) + 3) // 4 if text else 0
+
+
+class LLMError(Exception):
+    """A model call failed; `status` is the HTTP-style code when one was reported."""
+
+    def __init__(self, message, status=None, retryable=False):
+        super().__init__(message)
+        self.status = status
+        self.retryable = retryable
+
+
+class LLMResponse:
+    def __init__(self, text, input_tokens, output_tokens):
+        self.text = text
+        self.input_tokens = input_tokens
+        self.output_tokens = output_tokens
+
+
+# -------------------- Models --------------------
+class GeminiModel:
+    """google-generativeai behind the generate(prompt, timeout) interface; configured once per process."""
+
+    def __init__(self, name=DEFAULT_MODEL, api_key=None):
+        api_key = api_key or os.getenv("GEMINI_API_KEY")
+        if not api_key:
+            raise ValueError("GEMINI_API_KEY environment variable is not set")
+        import google.generativeai as genai
+        genai.configure(api_key=api_key)
+        self.name = name
+        self.model = genai.GenerativeModel(name)
+
+    def generate(self, prompt, timeout):
+        try:
+            response = self.model.generate_content(prompt, request_options={"timeout": timeout})
+        except Exception as e:
+            status = getattr(e, "code", None)
+            status = status if isinstance(status, int) else None
+            retryable = status in RETRY_STATUSES or isinstance(e, (TimeoutError, ConnectionError))
+            raise LLMError(f"{type(e).__name__}: {e}", status, retryable) from e
+        usage = getattr(response, "usage_metadata", None)
+        text = response.text
+        return LLMResponse(text, getattr(usage, "prompt_token_count", None) or estimate_tokens(prompt),
+                           getattr(usage, "candidates_token_count", None) or estimate_tokens(text))
+
+
+class StubModel:
+    """Offline stand-in: answers with responder(prompt) (default: a canned name/report) after `latency` seconds.
+
+    failures is a list of statuses to raise on the first calls, e.g. [429, 503], to exercise retries.
+    """
+
+    name = "stub"
+
+    def __init__(self, responder=None, latency=0.0, failures=None):
+        self.responder = responder or self._default
+        self.latency = latency
+        self.failures = list(failures or [])
+        self.prompts = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _default(prompt):
+        if "first name" in prompt.lower():
+            return random.choice(["Alex", "Jordan", "Taylor", "Morgan", "Riley"])
+        return "# Test Report\n\n## Executive Summary\nGenerated by the stub model.\n"
+
+    def generate(self, prompt, timeout):
+        with self._lock:
+            self.prompts.append(prompt)
+            status = self.failures.pop(0) if self.failures else None
+        if self.latency:
+            time.sleep(min(self.latency, timeout))
+            if self.latency > timeout:
+                raise LLMError("stub model timed out", 504, retryable=True)
+        if status is not None:
+            raise LLMError(f"stub model returned {status}", status, status in RETRY_STATUSES)
+        text = self.responder(prompt)
+        return LLMResponse(text, estimate_tokens(prompt), estimate_tokens(text))
+
+
+# -------------------- Rate Limiting --------------------
+class TokenBucket:
+    """`rate` tokens per second, holding at most `capacity`."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout=None):
+        """Take one token, waiting for it; False if none arrives within `timeout`."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = (1 - self.tokens) / self.rate
+            if deadline is not None:
+                if now + wait > deadline:
+                    return False
+            time.sleep(wait)
+
+
+class LLMClient:
+    """Rate-limited, concurrency-bounded, retrying front for one model."""
+
+    def __init__(self, model, rate=0.25, burst=4, concurrency=4, timeout=60.0, max_retries=4,
+                 backoff=1.0, max_backoff=30.0, prices=PRICE_PER_MTOK):
+        self.model = model
+        self.bucket = TokenBucket(rate, burst)
+        self.slots = threading.BoundedSemaphore(concurrency)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.prices = prices
+        self._lock = threading.Lock()
+        self.counts = Counter()
+        self.latencies = deque(maxlen=1000)
+        self.tokens = Counter()
+
+    @classmethod
+    def from_env(cls, model=None):
+        if model is None:
+            backend = os.getenv("LLM_BACKEND", "gemini").lower()
+            model = StubModel() if backend == "stub" else GeminiModel()
+        prices = (0.0, 0.0) if isinstance(model, StubModel) else PRICE_PER_MTOK
+        return cls(model, prices=prices,
+                   rate=float(os.getenv("LLM_RATE", "0.25")),
+                   burst=int(os.getenv("LLM_BURST", "4")),
+                   concurrency=int(os.getenv("LLM_CONCURRENCY", "4")),
+                   timeout=float(os.getenv("LLM_TIMEOUT", "60")),
+                   max_retries=int(os.getenv("LLM_MAX_RETRIES", "4")))
+
+    def generate(self, prompt, timeout=None):
+        """Return the model's text for prompt; raises LLMError once retries are spent."""
+        timeout = timeout or self.timeout
+        for attempt in range(self.max_retries + 1):
+            # Rate limit before taking a slot, so waiting calls do not hold one
+            if not self.bucket.acquire(timeout):
+                self._count("rate_limited")
+                raise LLMError(f"rate limit: no request slot within {timeout:g}s", retryable=True)
+            with self.slots:
+                start = time.monotonic()
+                try:
+                    response = self.model.generate(prompt, timeout)
+                except LLMError as e:
+                    error = e
+                else:
+                    self._record(time.monotonic() - start, response)
+                    return response.text
+            if not error.retryable or attempt == self.max_retries:
+                self._count("failures")
+                raise error
+            delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+            self._count("retries")
+            logger.warning("LLM call failed (%s), retry %d/%d in %.1fs", error, attempt + 1, self.max_retries, delay)
+            time.sleep(delay)
+
+    def _count(self, key):
+        with self._lock:
+            self.counts[key] += 1
+
+    def _record(self, latency, response):
+        with self._lock:
+            self.counts["calls"] += 1
+            self.latencies.append(latency)
+            self.tokens["input"] += response.input_tokens
+            self.tokens["output"] += response.output_tokens
+
+    def stats(self):
+        with self._lock:
+            latencies = sorted(self.latencies)
+            tokens = dict(self.tokens)
+            counts = dict(self.counts)
+        cost = (tokens.get("input", 0) * self.prices[0] + tokens.get("output", 0) * self.prices[1]) / 1e6
+        percentile = lambda q: latencies[min(int(q * len(latencies)), len(latencies) - 1)] if latencies else None
+        return {"model": self.model.name, "calls": counts.get("calls", 0), "retries": counts.get("retries", 0),
+                "failures": counts.get("failures", 0), "rate_limited": counts.get("rate_limited", 0),
+                "latency_p50": percentile(0.5), "latency_p95": percentile(0.95),
+                "input_tokens": tokens.get("input", 0), "output_tokens": tokens.get("output", 0),
+                "cost_usd": round(cost, 6)}
+
+    def summary(self):
+        s = self.stats()
+        latency = f"p50 {s['latency_p50']:.2f}s, p95 {s['latency_p95']:.2f}s" if s["calls"] else "no calls"
+        return (f"{s['model']}: {s['calls']} calls ({latency}), {s['retries']} retries, {s['failures']} failures, "
+                f"{s['input_tokens']}+{s['output_tokens']} tokens, ${s['cost_usd']:.4f}")
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_llm_client():
+    """Shared LLMClient configured from LLM_* env vars; raises ValueError when Gemini has no API key."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = LLMClient.from_env()
+        return _client
+
+
+def llm_configured():
+    """Whether get_llm_client() can build a client (stub backend or an API key set)."""
+    return os.getenv("LLM_BACKEND", "gemini").lower() == "stub" or bool(os.getenv("GEMINI_API_KEY"))
@@ -0,0 +1,165 @@
+import threading
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+from budget import bounded
+
+# -------------------- Locator Compiler --------------------
+# Flows declare what they are looking for (role, text, case sensitivity) and
+# the locator is compiled into the cheapest query the browser can answer:
+#
+#   * a `data-testid` CSS lookup when the app exposes one,
+#   * a plain CSS selector when no text is involved,
+#   * otherwise CSS to select the candidates plus one in-page text filter.
+#
+# This replaces `contains(translate(normalize-space(text()), 'ABC…', 'abc…'), …)`
+# XPaths, which make the browser scan and re-case the whole document on every
+# WebDriverWait poll. Which compiled form found the element is remembered per
+# page, so the next lookup on that page tries it first.
+
+ROLE_SELECTORS = {
+    "button": "button, [role='button'], input[type='submit'], input[type='button']",
+    "link": "a[href], [role='link']",
+    # Same candidate set as the flows' `//*[self::a or self::button or self::div]`
+    "clickable": "a, button, [role='button'], div",
+    "textbox": "input:not([type]), input[type='text'], input[type='email'], input[type='password'], "
+               "input[type='search'], input[type='number'], textarea, [role='textbox']",
+    "combobox": "input[role='combobox'], [role='combobox']",
+    "option": "[role='option']",
+    "radio": "input[type='radio'], [role='radio']",
+    "label": "label, p",
+    "text": "p, span, label, h1, h2, h3, h4, h5, h6, li, td, a, button, div",
+}
+
+# One script for every text lookup: CSS narrows the candidates natively, the
+# text test runs in-page, and only matching elements cross the wire.
+TEXT_QUERY_JS = """
+const [scope, css, needle, caseSensitive, deep, exact, closest, limit] = arguments;
+const root = scope || document;
+const norm = s => (s || '').replace(/\\s+/g, ' ').trim();
+const out = [];
+for (const el of root.querySelectorAll(css)) {
+    let text = deep ? el.textContent
+        : Array.from(el.childNodes).filter(n => n.nodeType === 3).map(n => n.nodeValue).join(' ');
+    text = norm(text);
+    if (!caseSensitive) text = text.toLowerCase();
+    if (needle !== null && (exact ? text !== needle : !text.includes(needle))) continue;
+    const target = closest ? (el.parentElement && el.parentElement.closest(closest)) : el;
+    if (!target || !(target.offsetWidth || target.offsetHeight || target.getClientRects().length)) continue;
+    if (!out.includes(target)) out.push(target);
+    if (out.length >= limit) break;
+}
+return out;
+"""
+
+
+class Locator:
+    """Declarative element query; compiled once, cached per page."""
+
+    def __init__(self, text=None, role="text", css=None, testid=None, exact=False,
+                 case_sensitive=False, deep=False, closest=None, name=None):
+        self.text = text
+        self.role = role
+        self.css = css or ROLE_SELECTORS.get(role, role)
+        self.testid = testid
+        self.exact = exact
+        self.case_sensitive = case_sensitive
+        self.deep = deep
+        self.closest = closest
+        self.name = name or (f"{role}:{text}" if text else role)
+        self._key = (text, self.css, testid, exact, case_sensitive, deep, closest)
+        self._compiled = None
+
+    def __eq__(self, other):
+        return isinstance(other, Locator) and self._key == other._key
+
+    def __hash__(self):
+        return hash(self._key)
+
+    def __repr__(self):
+        return f"Locator({self.name!r})"
+
+    def compile(self):
+        """Return the candidate queries, cheapest first, as (kind, query, args) tuples."""
+        if self._compiled is None:
+            compiled = []
+            if self.testid:
+                compiled.append(("css", f"[data-testid=\"{self.testid}\"]", None))
+            if self.text is None:
+                if self.closest:
+                    compiled.append(("js", TEXT_QUERY_JS, (self.css, None, True, self.deep, False, self.closest)))
+                else:
+                    compiled.append(("css", self.css, None))
+            else:
+                needle = self.text if self.case_sensitive else self.text.lower()
+                needle = " ".join(needle.split())
+                compiled.append(("js", TEXT_QUERY_JS,
+                                 (self.css, needle, self.case_sensitive, self.deep, self.exact, self.closest)))
+            self._compiled = compiled
+        return self._compiled
+
+
+# (page, locator) -> index of the compiled form that last matched
+_page_cache: dict = {}
+_cache_lock = threading.Lock()
+
+
+def _run(driver, compiled, scope, limit):
+    kind, query, args = compiled
+    if kind == "css":
+        root = scope or driver
+        visible = []
+        # Stop at the first `limit` visible matches; hidden duplicates (mobile/desktop menus) do not count
+        for element in root.find_elements(By.CSS_SELECTOR, query):
+            if element.is_displayed():
+                visible.append(element)
+                if len(visible) >= limit:
+                    break
+        return visible
+    return driver.execute_script(query, scope, *args, limit) or []
+
+
+def find_all(driver, locator, scope=None, page=None, limit=50):
+    """Return visible elements for locator, trying the form cached for page first."""
+    compiled = locator.compile()
+    with _cache_lock:
+        first = _page_cache.get((page, locator), 0)
+    order = [first] + [i for i in range(len(compiled)) if i != first]
+    for index in order:
+        elements = _run(driver, compiled[index], scope, limit)
+        if elements:
+            if index != first:
+                with _cache_lock:
+                    _page_cache[(page, locator)] = index
+            return elements
+    return []
+
+
+def find(driver, locator, scope=None, page=None):
+    """Return the first visible match or None (no waiting)."""
+    elements = find_all(driver, locator, scope=scope, page=page, limit=1)
+    return elements[0] if elements else None
+
+
+def visible(locator, scope=None, page=None):
+    """WebDriverWait condition: first visible match, else False."""
+    def condition(driver):
+        return find(driver, locator, scope=scope, page=page) or False
+    return condition
+
+
+def clickable(locator, scope=None, page=None):
+    """WebDriverWait condition: first visible and enabled match, else False."""
+    def condition(driver):
+        for element in find_all(driver, locator, scope=scope, page=page, limit=5):
+            if element.is_enabled():
+                return element
+        return False
+    return condition
+
+
+def wait_for(driver, locator, timeout=15, scope=None, page=None, condition=clickable, poll_frequency=0.25):
+    """Wait for locator (capped by the current budget); raises TimeoutException like any WebDriverWait."""
+    return WebDriverWait(driver, bounded(timeout), poll_frequency=poll_frequency).until(
+        condition(locator, scope=scope, page=page), message=f"{locator!r} not found")
@@ -0,0 +1,134 @@
+import atexit
+import logging
+import logging.handlers
+import queue
+import threading
+import time
+
+# -------------------- Queued Logging --------------------
+# Driver threads only build a LogRecord and put it on a queue. Formatting,
+# timestamping and stream I/O happen on one listener thread, so concurrent
+# sessions never contend on the console handler.
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+LEVELS = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "CRITICAL": logging.CRITICAL,
+}
+
+_listener = None
+_queue_handler = None
+_setup_lock = threading.Lock()
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that defers message formatting to the listener thread."""
+
+    def prepare(self, record):
+        # The stock implementation formats the message in the calling thread;
+        # the queue is in-process, so the record can travel untouched.
+        return record
+
+
+class RateLimitFilter(logging.Filter):
+    """Let through at most `burst` WARNING records per (thread, message template) every `period` seconds.
+
+    Only retry chatter ("Click intercepted, trying ActionChains (attempt %d)")
+    is limited: INFO lines sharing a template ("Trying selector: %s") are the
+    diagnostics of a failed run, and errors always pass. The suppressed count is
+    reported on the next matching record, or by flush() when logging stops.
+    """
+
+    def __init__(self, burst=5, period=10.0, min_level=logging.WARNING, max_level=logging.ERROR):
+        super().__init__()
+        self.burst = burst
+        self.period = period
+        self.min_level = min_level
+        self.max_level = max_level
+        self._windows: dict = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if not self.min_level <= record.levelno < self.max_level:
+            return True
+        key = (record.threadName, record.msg)
+        now = time.monotonic()
+        with self._lock:
+            start, count, suppressed, last = self._windows.get(key, (now, 0, 0, None))
+            if now - start >= self.period:
+                if suppressed:
+                    record.msg = f"{record.msg} (suppressed {suppressed} similar messages)"
+                start, count, suppressed, last = now, 0, 0, None
+            if count < self.burst:
+                self._windows[key] = (start, count + 1, suppressed, last)
+                return True
+            self._windows[key] = (start, count, suppressed + 1, record)
+            return False
+
+    def flush(self):
+        """Forget every window; return one record per window that still had suppressed messages."""
+        with self._lock:
+            windows, self._windows = self._windows, {}
+        records = []
+        for _, _, suppressed, last in windows.values():
+            if suppressed:
+                record = logging.makeLogRecord(last.__dict__)
+                record.msg = f"{last.msg} (last of {suppressed} suppressed similar messages)"
+                records.append(record)
+        return records
+
+
+def setup_logging(level=logging.INFO, fmt=LOG_FORMAT, handlers=None, burst=5, period=10.0):
+    """Route the root logger through a queue; safe to call from every script."""
+    global _listener, _queue_handler
+    with _setup_lock:
+        if _listener is not None:
+            return _listener
+        if handlers is None:
+            console = logging.StreamHandler()
+            console.setFormatter(logging.Formatter(fmt))
+            handlers = [console]
+        log_queue = queue.SimpleQueue()
+        queue_handler = LazyQueueHandler(log_queue)
+        queue_handler.addFilter(RateLimitFilter(burst=burst, period=period))
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(queue_handler)
+        root.setLevel(level)
+        _queue_handler = queue_handler
+        _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(stop_logging)
+        return _listener
+
+
+def stop_logging():
+    """Report still-suppressed messages, drain the queue and stop the listener thread."""
+    global _listener, _queue_handler
+    with _setup_lock:
+        if _listener is not None:
+            for log_filter in _queue_handler.filters:
+                if isinstance(log_filter, RateLimitFilter):
+                    for record in log_filter.flush():
+                        _queue_handler.enqueue(record)
+            _listener.stop()
+            _listener = None
+            _queue_handler = None
+
+
+def make_log(logger):
+    """Return the scripts' `log(msg, level, *args)` helper bound to logger.
+
+    `args` are %-style and only interpolated if the level is enabled, on the
+    listener thread.
+    """
+    def log(msg, level="INFO", *args):
+        levelno = LEVELS.get(level, logging.INFO)
+        if logger.isEnabledFor(levelno):
+            logger.log(levelno, msg, *args)
+    return log
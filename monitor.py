@@ -0,0 +1,269 @@
+import os
+import json
+import time
+import bisect
+import logging
+import argparse
+import threading
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from budget import Budget
+from log_setup import setup_logging
+from recycling import DriverRecycler
+
+# -------------------- Synthetic Monitoring --------------------
+# Runs one flow on a schedule against a warm browser session and serves the
+# results on /metrics in Prometheus text format (plus the latest runs as
+# JSON on /recent):
+#
+#   python monitor.py login --interval 300 --port 9464
+#
+# The browser is kept between runs and replaced by the RECYCLE_* limits
+# (recycling.py) or after a run raised. Recent results live in a bounded ring
+# buffer; the histograms are cumulative for the life of the process.
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = int(os.getenv("MONITOR_PORT", "9464"))
+DURATION_BUCKETS = (0.5, 1, 2, 5, 10, 20, 30, 60, 120, 300)
+
+
+class Histogram:
+    """Prometheus-style histogram with fixed upper bounds."""
+
+    def __init__(self, buckets=DURATION_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name, labels):
+        lines, cumulative = [], 0
+        for bound, count in zip(self.buckets + ("+Inf",), self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f"{name}_sum{{{labels}}} {self.sum:.6f}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MonitorMetrics:
+    """Thread-safe store of run results, rendered as Prometheus text."""
+
+    def __init__(self, history=500):
+        self._lock = threading.Lock()
+        self.flow_durations: dict = {}
+        self.step_durations: dict = {}
+        self.runs = Counter()
+        self.last_success: dict = {}
+        self.up: dict = {}
+        self.recent = deque(maxlen=history)
+
+    def record(self, flow, ok, duration, steps=None, error=None):
+        steps = steps or {}
+        with self._lock:
+            self.flow_durations.setdefault(flow, Histogram()).observe(duration)
+            for step, seconds in steps.items():
+                self.step_durations.setdefault((flow, step), Histogram()).observe(seconds)
+            self.runs[(flow, "success" if ok else "failure")] += 1
+            self.up[flow] = 1 if ok else 0
+            if ok:
+                self.last_success[flow] = time.time()
+            self.recent.append({"time": time.time(), "flow": flow, "ok": ok, "duration": round(duration, 3),
+                                "steps": {name: round(seconds, 3) for name, seconds in steps.items()},
+                                "error": error})
+
+    def render(self):
+        with self._lock:
+            lines = ["# HELP synthetic_flow_duration_seconds Wall-clock duration of a synthetic flow run.",
+                     "# TYPE synthetic_flow_duration_seconds histogram"]
+            for flow, histogram in sorted(self.flow_durations.items()):
+                lines += histogram.render("synthetic_flow_duration_seconds", f'flow="{_label(flow)}"')
+            lines += ["# HELP synthetic_step_duration_seconds Duration of one step of a synthetic flow.",
+                      "# TYPE synthetic_step_duration_seconds histogram"]
+            for (flow, step), histogram in sorted(self.step_durations.items()):
+                lines += histogram.render("synthetic_step_duration_seconds",
+                                          f'flow="{_label(flow)}",step="{_label(step)}"')
+            lines += ["# HELP synthetic_flow_runs_total Synthetic flow runs by result.",
+                      "# TYPE synthetic_flow_runs_total counter"]
+            for (flow, result), count in sorted(self.runs.items()):
+                lines.append(f'synthetic_flow_runs_total{{flow="{_label(flow)}",result="{result}"}} {count}')
+            lines += ["# HELP synthetic_flow_up Whether the last run of the flow succeeded.",
+                      "# TYPE synthetic_flow_up gauge"]
+            for flow, up in sorted(self.up.items()):
+                lines.append(f'synthetic_flow_up{{flow="{_label(flow)}"}} {up}')
+            lines += ["# HELP synthetic_flow_last_success_timestamp_seconds Unix time of the last successful run.",
+                      "# TYPE synthetic_flow_last_success_timestamp_seconds gauge"]
+            for flow, timestamp in sorted(self.last_success.items()):
+                lines.append(f'synthetic_flow_last_success_timestamp_seconds{{flow="{_label(flow)}"}} {timestamp:.3f}')
+        return "\n".join(lines) + "\n"
+
+    def recent_runs(self):
+        with self._lock:
+            return list(self.recent)
+
+
+# -------------------- HTTP Endpoint --------------------
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        metrics = self.server.metrics
+        if self.path.split("?")[0] == "/metrics":
+            body, content_type = metrics.render().encode("utf-8"), "text/plain; version=0.0.4; charset=utf-8"
+        elif self.path.split("?")[0] == "/recent":
+            body, content_type = json.dumps(metrics.recent_runs()).encode("utf-8"), "application/json"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug("metrics endpoint: " + format, *args)
+
+
+def start_metrics_server(metrics, host="127.0.0.1", port=DEFAULT_PORT):
+    """Serve metrics in a daemon thread; port=0 picks a free port."""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.metrics = metrics
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
+
+
+# -------------------- Flows --------------------
+# A flow is (driver factory, probe, on_start); probe(driver, fresh) returns (ok, {step: seconds}).
+def _login_driver():
+    from test_multi_login import start_driver
+    return start_driver(headless=True)
+
+
+def login_probe(driver, fresh):
+    """Log out (cookies and storage) and log in again on the warm browser."""
+    from test_multi_login import ACCOUNT1_EMAIL, ACCOUNT1_PASSWORD, login_to_kwiks
+    if not fresh:
+        driver.delete_all_cookies()
+        driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+    start = time.monotonic()
+    email = os.getenv("MONITOR_EMAIL", ACCOUNT1_EMAIL)
+    password = os.getenv("MONITOR_PASSWORD", ACCOUNT1_PASSWORD)
+    # A one-party barrier: nobody to wait for
+    ok = login_to_kwiks(driver, email, password, threading.Barrier(1))
+    return ok, {"login": time.monotonic() - start}
+
+
+def _mission_driver():
+    from grid import get_backend
+    return get_backend().create_driver("add_mission", headless=True, capture_network=True)
+
+
+def _mission_start(driver):
+    from add_mission import start_session
+    return start_session(driver)
+
+
+def mission_probe(driver, fresh):
+    """Run the Add New Mission wizard from the dashboard of the logged-in browser."""
+    from add_mission import MISSION_WIZARD
+    if not fresh:
+        driver.get(driver.home_url)
+    result = MISSION_WIZARD.run(driver)
+    return result.ok, {step.name: step.duration for step in result.steps}
+
+
+FLOWS = {
+    "login": (_login_driver, login_probe, None),
+    "add_mission": (_mission_driver, mission_probe, _mission_start),
+}
+
+
+class SyntheticMonitor:
+    """Run one flow every `interval` seconds on a warm session and record the results."""
+
+    def __init__(self, flow, interval=300, metrics=None, budget=180):
+        factory, self.probe, on_start = FLOWS[flow]
+        self.flow = flow
+        self.interval = interval
+        self.budget = budget
+        self.metrics = metrics or MonitorMetrics()
+        self.recycler = DriverRecycler.from_env(factory, on_start=on_start, name=f"monitor-{flow}")
+        self._stop = threading.Event()
+
+    def run_once(self):
+        start = time.monotonic()
+        ok, steps, error = False, {}, None
+        try:
+            with self.recycler.flow() as driver:
+                if not self.recycler.start_ok:
+                    error = "session start failed"
+                else:
+                    # Wizards nest their flow budget in this one, so --budget also caps MISSION_WIZARD's 600s
+                    with Budget(self.flow, self.budget).enter() as budget:
+                        ok, steps = self.probe(driver, self.recycler.fresh)
+                    if not ok and budget.exhausted:
+                        error = f"run budget ({self.budget:g}s) exhausted"
+        except Exception as e:
+            error = str(e).splitlines()[0] if str(e) else type(e).__name__
+            if self.recycler.driver is not None:
+                # The browser may be wedged; start the next run on a new one
+                self.recycler.recycle("error")
+        duration = time.monotonic() - start
+        self.metrics.record(self.flow, ok, duration, steps, error)
+        logger.info("%s: %s in %.1fs%s", self.flow, "ok" if ok else "FAILED", duration,
+                    f" ({error})" if error else "")
+        return ok
+
+    def run_forever(self):
+        """Fixed-rate schedule; a run that overruns the interval delays the next one instead of piling up."""
+        next_run = time.monotonic()
+        while not self._stop.is_set():
+            self.run_once()
+            next_run = max(next_run + self.interval, time.monotonic())
+            self._stop.wait(next_run - time.monotonic())
+
+    def stop(self):
+        self._stop.set()
+
+    def close(self):
+        self.stop()
+        self.recycler.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a flow on a schedule and expose Prometheus metrics")
+    parser.add_argument("flow", choices=sorted(FLOWS))
+    parser.add_argument("--interval", type=float, default=float(os.getenv("MONITOR_INTERVAL", "300")),
+                        help="seconds between run starts")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--host", default=os.getenv("MONITOR_HOST", "127.0.0.1"))
+    parser.add_argument("--history", type=int, default=500, help="runs kept for /recent")
+    parser.add_argument("--budget", type=float, default=180, help="time budget of one run, in seconds")
+    args = parser.parse_args()
+
+    setup_logging()
+    metrics = MonitorMetrics(history=args.history)
+    server = start_metrics_server(metrics, args.host, args.port)
+    logger.info("Serving metrics on http://%s:%d/metrics", *server.server_address[:2])
+    monitor = SyntheticMonitor(args.flow, args.interval, metrics, args.budget)
+    try:
+        monitor.run_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        monitor.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+import weakref
+from collections import deque
+
+# -------------------- Network Observer --------------------
+# Chrome forwards CDP Network.* events to the "performance" log when the
+# driver is started with `goog:loggingPrefs` (see browser_profiles.build_options).
+# The observer drains that log, tracks each request from requestWillBeSent to
+# loadingFinished/loadingFailed, and lets flows wait for a specific backend
+# call instead of sleeping a fixed amount of time. Requests that never finish
+# (long-polls, cancelled navigations) are dropped once they are older than the
+# longest finish_timeout any wait has used, so the table does not grow for the
+# life of the session.
+
+logger = logging.getLogger(__name__)
+
+# Backend calls the flows wait on; override with env vars if the API changes.
+GENERATE_DESCRIPTION_PATTERN = os.getenv("NETWORK_PATTERN_GENERATE", r"generat|description|/ai/")
+CV_UPLOAD_PATTERN = os.getenv("NETWORK_PATTERN_CV_UPLOAD", r"upload|/files?\b|/cv\b|resume")
+CV_PARSE_PATTERN = os.getenv("NETWORK_PATTERN_CV_PARSE", r"pars|extract|/cv\b|resume")
+
+NETWORK_EVENTS = (
+    "Network.requestWillBeSent",
+    "Network.responseReceived",
+    "Network.loadingFinished",
+    "Network.loadingFailed",
+)
+
+
+class RequestTiming:
+    """One observed request; times are CDP monotonic seconds."""
+
+    __slots__ = ("request_id", "seq", "url", "method", "resource_type", "started", "ended",
+                 "status", "error", "encoded_bytes")
+
+    def __init__(self, request_id, seq, url, method, resource_type, started):
+        self.request_id = request_id
+        self.seq = seq
+        self.url = url
+        self.method = method
+        self.resource_type = resource_type
+        self.started = started
+        self.ended = None
+        self.status = None
+        self.error = None
+        self.encoded_bytes = None
+
+    @property
+    def done(self):
+        return self.ended is not None
+
+    @property
+    def duration(self):
+        return None if self.ended is None else self.ended - self.started
+
+    def as_dict(self):
+        return {"url": self.url, "method": self.method, "type": self.resource_type, "status": self.status,
+                "error": self.error, "duration": self.duration, "bytes": self.encoded_bytes}
+
+
+class NetworkObserver:
+    """Track requests of one driver from its performance log."""
+
+    def __init__(self, driver, history=500):
+        self.driver = driver
+        self.available = True
+        self._pending: dict = {}
+        self._finished = deque(maxlen=history)
+        self._seq = 0
+        # Latest CDP timestamp seen, and how long an unfinished request is kept
+        self._now = 0.0
+        self.pending_ttl = 60.0
+        self._lock = threading.Lock()
+        self.metrics: dict = {}
+
+    def poll(self):
+        """Drain new performance-log entries into the request table."""
+        if not self.available:
+            return
+        try:
+            entries = self.driver.get_log("performance")
+        except Exception as e:
+            logger.warning("Performance log unavailable, network waits disabled: %s", e)
+            self.available = False
+            return
+        with self._lock:
+            for entry in entries:
+                try:
+                    message = json.loads(entry["message"])["message"]
+                except (KeyError, ValueError, TypeError):
+                    continue
+                method = message.get("method")
+                if method in NETWORK_EVENTS:
+                    params = message.get("params", {})
+                    self._now = max(self._now, params.get("timestamp") or 0.0)
+                    self._handle(method, params)
+            self._expire()
+
+    def _expire(self):
+        """Drop unfinished requests older than pending_ttl (CDP time)."""
+        cutoff = self._now - self.pending_ttl
+        expired = [request_id for request_id, timing in self._pending.items() if timing.started < cutoff]
+        for request_id in expired:
+            del self._pending[request_id]
+        if expired:
+            logger.debug("Dropped %d request(s) unfinished after %.0fs", len(expired), self.pending_ttl)
+
+    def _handle(self, method, params):
+        request_id = params.get("requestId")
+        if method == "Network.requestWillBeSent":
+            if request_id in self._pending:
+                # Redirect: keep the original start, follow the new URL
+                self._pending[request_id].url = params["request"]["url"]
+                return
+            self._seq += 1
+            self._pending[request_id] = RequestTiming(
+                request_id, self._seq, params["request"]["url"], params["request"].get("method"),
+                params.get("type"), params.get("timestamp", 0.0))
+            return
+        timing = self._pending.get(request_id)
+        if timing is None:
+            return
+        if method == "Network.responseReceived":
+            timing.status = params.get("response", {}).get("status")
+        elif method == "Network.loadingFinished":
+            timing.ended = params.get("timestamp", timing.started)
+            timing.encoded_bytes = params.get("encodedDataLength")
+            self._finished.append(self._pending.pop(request_id))
+        elif method == "Network.loadingFailed":
+            timing.ended = params.get("timestamp", timing.started)
+            timing.error = params.get("errorText")
+            self._finished.append(self._pending.pop(request_id))
+
+    def mark(self):
+        """Return a cursor; later waits only consider requests sent after it."""
+        self.poll()
+        return self._seq
+
+    def _matching(self, regex, since, method, resource_types):
+        with self._lock:
+            candidates = list(self._finished) + list(self._pending.values())
+        return [t for t in candidates
+                if t.seq > since and regex.search(t.url)
+                and (method is None or t.method == method)
+                and (not resource_types or t.resource_type in resource_types)]
+
+    def wait_for_request(self, pattern, since=0, start_timeout=10, finish_timeout=60,
+                         method=None, resource_types=("XHR", "Fetch"), name=None, poll_interval=0.2, on_idle=None):
+        """Wait until every request matching pattern (sent after `since`) has completed.
+
+        Gives up after `start_timeout` if no matching request was sent at all, or
+        after `finish_timeout` if one was sent but never finished. Returns the
+        slowest matching RequestTiming, or None on timeout / when the performance
+        log is missing. `on_idle()` is called between polls, e.g. to look up the
+        next step's elements while the request is still running.
+        """
+        regex = re.compile(pattern, re.IGNORECASE)
+        self.pending_ttl = max(self.pending_ttl, finish_timeout)
+        started_at = time.monotonic()
+        seen = None
+        # Matches are kept here too: a request this wait is following stays unfinished even if it expires
+        tracked = {}
+        while self.available:
+            self.poll()
+            tracked.update((t.seq, t) for t in self._matching(regex, since, method, resource_types))
+            matches = list(tracked.values())
+            if matches:
+                seen = seen or time.monotonic()
+                if all(t.done for t in matches):
+                    timing = max(matches, key=lambda t: t.duration)
+                    self.record(name or pattern, timing)
+                    return timing
+                if time.monotonic() - seen > finish_timeout:
+                    logger.warning("Request matching '%s' did not finish within %ss", pattern, finish_timeout)
+                    return None
+            elif time.monotonic() - started_at > start_timeout:
+                logger.warning("No request matching '%s' within %ss", pattern, start_timeout)
+                return None
+            if on_idle is not None:
+                on_idle()
+            time.sleep(poll_interval)
+        return None
+
+    def record(self, name, timing):
+        """Keep the duration of a waited-on request as a named metric."""
+        self.metrics.setdefault(name, []).append(timing.duration)
+        logger.info("Network %s: %s %s -> %s in %.2fs", name, timing.method, timing.url,
+                    timing.status or timing.error, timing.duration or 0.0)
+
+    def summary(self):
+        """Return {name: {count, avg, max}} for recorded metrics."""
+        return {name: {"count": len(values), "avg": sum(values) / len(values), "max": max(values)}
+                for name, values in self.metrics.items() if values}
+
+
+_observers = weakref.WeakKeyDictionary()
+
+
+def get_observer(driver):
+    """Return the observer attached to driver (one per driver, the log is consumed on read)."""
+    observer = _observers.get(driver)
+    if observer is None:
+        observer = NetworkObserver(driver)
+        _observers[driver] = observer
+    return observer
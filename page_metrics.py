@@ -0,0 +1,150 @@
+import logging
+import weakref
+
+# -------------------- Page Performance Metrics --------------------
+# The flows visit every key screen of the app, so they double as performance
+# monitoring of it. One PerformanceObserver script per session buffers
+# Navigation Timing, resource timing, long tasks and Web Vitals (LCP, CLS,
+# INP) in the page; flows drain the buffer in one call per step and attach
+# the summary to that step's result.
+#
+# On Chromium the script is registered with Page.addScriptToEvaluateOnNewDocument
+# so every new document is observed from the start. Elsewhere it is injected on
+# each drain (observers are `buffered`, so entries from before injection still
+# arrive). The buffer moves through sessionStorage across same-origin navigations.
+
+logger = logging.getLogger(__name__)
+
+OBSERVER_JS = """
+(() => {
+    if (window.__perfObserverInstalled) return;
+    window.__perfObserverInstalled = true;
+    const KEY = '__perfBuffer';
+    let saved = [];
+    try { saved = JSON.parse(sessionStorage.getItem(KEY) || '[]'); sessionStorage.removeItem(KEY); } catch (e) {}
+    const buffer = window.__perfBuffer = saved;
+    const push = entry => {
+        // Read per entry: client-side routing changes the path without a new document
+        entry.page = location.pathname;
+        buffer.push(entry);
+        if (buffer.length > 5000) buffer.splice(0, buffer.length - 5000);
+    };
+    const observe = (type, handler, extra) => {
+        try {
+            new PerformanceObserver(list => list.getEntries().forEach(handler))
+                .observe(Object.assign({type: type, buffered: true}, extra || {}));
+        } catch (e) {}
+    };
+    observe('navigation', e => push({type: 'navigation', ttfb: e.responseStart - e.startTime,
+        dcl: e.domContentLoadedEventEnd - e.startTime, load: e.loadEventEnd - e.startTime, size: e.transferSize}));
+    observe('resource', e => push({type: 'resource', name: e.name, initiator: e.initiatorType,
+        duration: e.duration, size: e.transferSize}));
+    observe('longtask', e => push({type: 'longtask', duration: e.duration}));
+    observe('largest-contentful-paint', e => push({type: 'lcp', value: e.renderTime || e.loadTime || e.startTime}));
+    observe('layout-shift', e => { if (!e.hadRecentInput) push({type: 'cls', value: e.value}); });
+    observe('event', e => { if (e.interactionId) push({type: 'inp', value: e.duration, name: e.name}); },
+        {durationThreshold: 40});
+    addEventListener('pagehide', () => { try { sessionStorage.setItem(KEY, JSON.stringify(buffer)); } catch (e) {} });
+})();
+"""
+
+DRAIN_JS = OBSERVER_JS + "\nreturn window.__perfBuffer.splice(0);"
+
+
+def summarize(entries, slowest=3):
+    """Reduce drained entries to per-step metrics (milliseconds; CLS is unitless)."""
+    navigation = [{"page": e["page"], "ttfb": e["ttfb"], "dcl": e["dcl"], "load": e["load"]}
+                  for e in entries if e["type"] == "navigation"]
+    resources = [e for e in entries if e["type"] == "resource"]
+    longtasks = [e["duration"] for e in entries if e["type"] == "longtask"]
+    lcp, cls = {}, {}
+    for e in entries:
+        if e["type"] == "lcp":
+            # The last LCP candidate of a page is its LCP
+            lcp[e["page"]] = e["value"]
+        elif e["type"] == "cls":
+            cls[e["page"]] = cls.get(e["page"], 0.0) + e["value"]
+    interactions = [e["value"] for e in entries if e["type"] == "inp"]
+    return {
+        "navigation": navigation,
+        "resources": {
+            "count": len(resources),
+            "bytes": sum(e.get("size") or 0 for e in resources),
+            "slowest": [(e["name"], round(e["duration"])) for e in
+                        sorted(resources, key=lambda e: e["duration"], reverse=True)[:slowest]],
+        },
+        "longtasks": {"count": len(longtasks), "total": sum(longtasks), "max": max(longtasks, default=0.0)},
+        "lcp": max(lcp.values(), default=None),
+        "cls": round(max(cls.values()), 4) if cls else None,
+        "inp": max(interactions, default=None),
+    }
+
+
+class PageMetrics:
+    """Install the observer script once per session and drain its buffer."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.installed = False
+        self.available = True
+
+    def install(self):
+        if self.installed or not self.available:
+            return self
+        try:
+            if hasattr(self.driver, "execute_cdp_cmd"):
+                self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": OBSERVER_JS})
+            self.driver.execute_script(OBSERVER_JS)
+        except Exception as e:
+            logger.warning("Could not install the performance observer: %s", e)
+            self.available = False
+            return self
+        self.installed = True
+        return self
+
+    def drain(self):
+        """Return and clear the entries buffered since the last drain."""
+        if not self.available:
+            return []
+        try:
+            return self.driver.execute_script(DRAIN_JS) or []
+        except Exception as e:
+            logger.warning("Could not drain performance entries: %s", e)
+            return []
+
+    def collect(self):
+        """drain() summarized; None when nothing was recorded."""
+        entries = self.drain()
+        return summarize(entries) if entries else None
+
+
+_metrics = weakref.WeakKeyDictionary()
+
+
+def get_page_metrics(driver):
+    """Return the installed PageMetrics for driver (one per session)."""
+    metrics = _metrics.get(driver)
+    if metrics is None:
+        metrics = _metrics[driver] = PageMetrics(driver).install()
+    return metrics
+
+
+def format_summary(summary):
+    """One-line rendering for logs."""
+    if not summary:
+        return "no page metrics"
+    parts = []
+    for nav in summary["navigation"]:
+        parts.append(f"{nav['page']} ttfb={nav['ttfb']:.0f}ms load={nav['load']:.0f}ms")
+    if summary["lcp"] is not None:
+        parts.append(f"LCP={summary['lcp']:.0f}ms")
+    if summary["cls"] is not None:
+        parts.append(f"CLS={summary['cls']}")
+    if summary["inp"] is not None:
+        parts.append(f"INP={summary['inp']:.0f}ms")
+    longtasks = summary["longtasks"]
+    if longtasks["count"]:
+        parts.append(f"long tasks={longtasks['count']} ({longtasks['total']:.0f}ms)")
+    resources = summary["resources"]
+    parts.append(f"{resources['count']} resources/{resources['bytes'] // 1024}KiB")
+    return ", ".join(parts)
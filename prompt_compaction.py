@@ -0,0 +1,152 @@
+import os
+import re
+
+from llm_client import estimate_tokens
+
+# -------------------- Prompt Compaction --------------------
+# Terminal output of a run is mostly retry chatter ("Trying selector: ...",
+# "Click intercepted, trying ActionChains (attempt 2)"). Before it goes into a
+# prompt it is compacted:
+#
+#   1. timestamps and "- INFO -" style prefixes are stripped,
+#   2. runs of near-identical lines (same text once numbers, quoted values and
+#      selectors are masked), including repeating blocks of up to
+#      MAX_PERIOD lines, are collapsed into one copy with a count,
+#   3. failure lines and `context` lines around them, and per-test outcome
+#      lines, are kept verbatim,
+#   4. if the result is still over `max_tokens`, the lines farthest from any
+#      failure (and from the start/end of the log) are dropped first.
+#
+#   text, stats = compact(raw, max_tokens=6000)
+
+DEFAULT_MAX_TOKENS = int(os.getenv("REPORT_PROMPT_TOKENS", "6000"))
+MAX_PERIOD = 3
+
+TIMESTAMP_RE = re.compile(
+    r"^\s*\[?\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?(?:Z|[+-]\d{2}:?\d{2})?\]?\s*(?:-\s*)?"
+    r"|^\s*\[?\d{2}:\d{2}:\d{2}(?:[.,]\d+)?\]?\s*(?:-\s*)?"
+)
+LEVEL_RE = re.compile(r"^(DEBUG|INFO|WARNING|ERROR|CRITICAL)\s+-\s+")
+FAILURE_RE = re.compile(r"\b(ERROR|CRITICAL|FAILED|FAIL|Traceback|Exception|Error)\b|AssertionError|❌")
+# Per-test outcomes are kept (without context) so the report can count them
+RESULT_RE = re.compile(r"\b(PASSED|SKIPPED|XFAIL|XPASS)\b")
+# Masks for the "near-identical" key: quoted values, XPath/CSS selectors, hex ids, numbers
+MASKS = [
+    (re.compile(r"'[^']*'|\"[^\"]*\""), "'_'"),
+    (re.compile(r"(?<![\w/])(//|\./)\S+"), "<selector>"),
+    (re.compile(r"\b0x[0-9a-fA-F]+\b|\b[0-9a-f]{8,}\b"), "<id>"),
+    (re.compile(r"\d+(?:\.\d+)?"), "<n>"),
+]
+
+
+def strip_prefix(line):
+    """Drop a leading timestamp; keep the level only when it is not INFO."""
+    stripped = TIMESTAMP_RE.sub("", line, count=1)
+    # Keep indentation (tracebacks) unless a prefix was removed
+    line = stripped.strip() if stripped != line else line.rstrip()
+    match = LEVEL_RE.match(line)
+    if match:
+        line = line[match.end():] if match.group(1) == "INFO" else f"{match.group(1)}: {line[match.end():]}"
+    return line
+
+
+def line_key(line):
+    for pattern, replacement in MASKS:
+        line = pattern.sub(replacement, line)
+    return line
+
+
+def _collapse(lines, protected):
+    """[(text, protected)] with repeated runs (period 1..MAX_PERIOD) folded into one copy plus a count."""
+    keys = [line_key(line) for line in lines]
+    out, i = [], 0
+    while i < len(lines):
+        best_period, best_repeats = 1, 1
+        for period in range(1, MAX_PERIOD + 1):
+            block = keys[i:i + period]
+            if len(block) < period or any(protected[i:i + period]):
+                break
+            repeats = 1
+            while (keys[i + repeats * period:i + (repeats + 1) * period] == block
+                   and not any(protected[i + repeats * period:i + (repeats + 1) * period])):
+                repeats += 1
+            # Prefer the shortest period that explains the run
+            if repeats > 1 and repeats * period > best_repeats * best_period:
+                best_period, best_repeats = period, repeats
+        if best_repeats == 1:
+            out.append((lines[i], protected[i]))
+            i += 1
+            continue
+        span = best_period * best_repeats
+        if best_period == 1:
+            last = lines[i + span - 1]
+            suffix = "" if last == lines[i] else f" (last: {last})"
+            out.append((f"[×{best_repeats}] {lines[i]}{suffix}", False))
+        else:
+            out.extend((line, False) for line in lines[i:i + best_period])
+            out.append((f"[previous {best_period} lines repeated ×{best_repeats}]", False))
+        i += span
+    return out
+
+
+def _protect(lines, context):
+    protected = [False] * len(lines)
+    for index, line in enumerate(lines):
+        if FAILURE_RE.search(line):
+            for j in range(max(0, index - context), min(len(lines), index + context + 1)):
+                protected[j] = True
+        elif RESULT_RE.search(line):
+            protected[index] = True
+    return protected
+
+
+def _fit(entries, max_tokens):
+    """Drop unprotected lines, farthest from failures and the log's ends first, until under max_tokens."""
+    tokens = [estimate_tokens(text) + 1 for text, _ in entries]
+    total = sum(tokens)
+    if total <= max_tokens:
+        return [text for text, _ in entries]
+    # Distance to the nearest protected line or end of the log, in two linear passes
+    distance, last = [0] * len(entries), 0
+    for i, (_, keep) in enumerate(entries):
+        last = i if keep else last
+        distance[i] = i - last
+    last = len(entries) - 1
+    for i in range(len(entries) - 1, -1, -1):
+        last = i if entries[i][1] else last
+        distance[i] = min(distance[i], last - i)
+    order = sorted((i for i, (_, keep) in enumerate(entries) if not keep), key=lambda i: -distance[i])
+    dropped = set()
+    for i in order:
+        if total <= max_tokens:
+            break
+        dropped.add(i)
+        total -= tokens[i]
+    out, gap = [], 0
+    for i, (text, _) in enumerate(entries):
+        if i in dropped:
+            gap += 1
+            continue
+        if gap:
+            out.append(f"[… {gap} lines omitted …]")
+            gap = 0
+        out.append(text)
+    if gap:
+        out.append(f"[… {gap} lines omitted …]")
+    # Failure windows alone can exceed the budget: cut from the end as a last resort
+    text = "\n".join(out)
+    if estimate_tokens(text) > max_tokens:
+        text = text[:max_tokens * 4] + "\n[… truncated …]"
+    return text.splitlines()
+
+
+def compact(text, max_tokens=DEFAULT_MAX_TOKENS, context=3):
+    """Return (compacted text, {"lines_before", "lines_after", "tokens_before", "tokens_after"})."""
+    lines = [strip_prefix(line) for line in text.splitlines()]
+    lines = [line for line in lines if line.strip()]
+    protected = _protect(lines, context)
+    entries = _collapse(lines, protected)
+    result = "\n".join(_fit(entries, max_tokens))
+    stats = {"lines_before": len(text.splitlines()), "lines_after": result.count("\n") + 1 if result else 0,
+             "tokens_before": estimate_tokens(text), "tokens_after": estimate_tokens(result)}
+    return result, stats
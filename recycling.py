@@ -0,0 +1,109 @@
+import os
+import time
+import logging
+from collections import Counter
+from contextlib import contextmanager
+
+from admission import process_tree_rss_mb
+
+# -------------------- Browser Recycling --------------------
+# Chrome renderers accumulate memory over long sessions. A DriverRecycler hands
+# the same driver to consecutive flows and replaces it *between* flows once it
+# has run too many flows, lived too long, or its process tree grew past an RSS
+# limit. A flow in progress is never interrupted.
+
+logger = logging.getLogger(__name__)
+
+
+def driver_pid(driver):
+    """PID of the chromedriver process behind a local driver, or None for remote sessions."""
+    service = getattr(driver, "service", None)
+    process = getattr(service, "process", None)
+    return getattr(process, "pid", None)
+
+
+class DriverRecycler:
+    """Reuse one driver across flows and restart it by flow count, age or RSS."""
+
+    def __init__(self, factory, max_flows=None, max_age=None, max_rss_mb=None, on_start=None, name="session"):
+        self.factory = factory
+        self.max_flows = max_flows
+        self.max_age = max_age
+        self.max_rss_mb = max_rss_mb
+        # Called with every new driver (e.g. login); a False result is reported by flow()
+        self.on_start = on_start
+        self.name = name
+        self.driver = None
+        self.started_at = None
+        self.flows = 0
+        self.start_ok = True
+        self.recycles = Counter()
+
+    @classmethod
+    def from_env(cls, factory, **kwargs):
+        """Limits from RECYCLE_MAX_FLOWS, RECYCLE_MAX_AGE (seconds) and RECYCLE_MAX_RSS_MB."""
+        def number(name, cast):
+            value = os.getenv(name)
+            return cast(value) if value else None
+        kwargs.setdefault("max_flows", number("RECYCLE_MAX_FLOWS", int))
+        kwargs.setdefault("max_age", number("RECYCLE_MAX_AGE", float))
+        kwargs.setdefault("max_rss_mb", number("RECYCLE_MAX_RSS_MB", float))
+        return cls(factory, **kwargs)
+
+    @property
+    def fresh(self):
+        """True while the current driver has not run a flow yet."""
+        return self.driver is not None and self.flows == 0
+
+    def _start(self):
+        self.driver = self.factory()
+        self.started_at = time.monotonic()
+        self.flows = 0
+        self.start_ok = self.on_start(self.driver) is not False if self.on_start else True
+        return self.driver
+
+    def recycle_reason(self):
+        """Why the current driver should be replaced before the next flow, or None."""
+        if self.driver is None:
+            return None
+        if not self.start_ok:
+            return "start hook failed"
+        if self.max_flows is not None and self.flows >= self.max_flows:
+            return f"ran {self.flows} flows"
+        age = time.monotonic() - self.started_at
+        if self.max_age is not None and age >= self.max_age:
+            return f"age {age:.0f}s"
+        if self.max_rss_mb is not None:
+            pid = driver_pid(self.driver)
+            rss = process_tree_rss_mb(pid) if pid else 0.0
+            if rss >= self.max_rss_mb:
+                return f"RSS {rss:.0f} MiB"
+        return None
+
+    def recycle(self, reason):
+        kind = reason.split(" ")[0] if reason else "manual"
+        self.recycles[kind] += 1
+        logger.info("%s: recycling driver after %d flows (%s); %d recycles so far",
+                    self.name, self.flows, reason, sum(self.recycles.values()))
+        self.close()
+
+    @contextmanager
+    def flow(self):
+        """Yield a driver for one flow; recycling is checked after the flow ends."""
+        if self.driver is None:
+            self._start()
+        try:
+            yield self.driver
+        finally:
+            self.flows += 1
+            reason = self.recycle_reason()
+            if reason:
+                self.recycle(reason)
+
+    def close(self):
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except Exception as e:
+                logger.warning("%s: error quitting driver: %s", self.name, e)
+            self.driver = None
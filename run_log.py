@@ -0,0 +1,167 @@
+import os
+import json
+import time
+import queue
+import atexit
+import threading
+import uuid
+
+# -------------------- Run Log Writer --------------------
+# Events are appended as JSON lines so a crash or a long run never loses what
+# already happened. Producers only push onto a queue; a single background
+# thread batches, writes and rotates the file.
+
+DEFAULT_LOG_PATH = "automation_log.jsonl"
+
+_writers: dict = {}
+_writers_lock = threading.Lock()
+
+
+def new_session_id():
+    """Return a short random id used to tag events of one session."""
+    return uuid.uuid4().hex[:12]
+
+
+class RunLogWriter:
+    """Buffered, thread-safe JSONL event writer with size-based rotation."""
+
+    def __init__(self, path=DEFAULT_LOG_PATH, max_bytes=5 * 1024 * 1024, backup_count=5,
+                 flush_interval=0.5, batch_size=256):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._queue = queue.SimpleQueue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="run-log-flusher", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def emit(self, kind, description, session_id=None, duration=None, **fields):
+        """Queue one event; never blocks on file I/O."""
+        event = {"ts": time.time(), "kind": kind, "session": session_id, "message": description}
+        if duration is not None:
+            event["duration"] = round(duration, 4)
+        if fields:
+            event.update(fields)
+        self._queue.put(event)
+
+    def flush(self, timeout=5):
+        """Block until every event queued so far has been written."""
+        if self._closed:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout=5):
+        if self._closed:
+            return
+        self.flush(timeout)
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            batch, waiters, stop = [], [], False
+            while True:
+                if item is None:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+                if stop or len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self._write(batch)
+            for waiter in waiters:
+                waiter.set()
+            if stop:
+                return
+
+    def _write(self, batch):
+        lines = "".join(json.dumps(event, ensure_ascii=False, default=str) + "\n" for event in batch)
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
+                size = f.tell()
+            if self.max_bytes and size >= self.max_bytes:
+                self._rotate()
+        except OSError as e:
+            print(f"[RUN LOG] Could not write events to '{self.path}': {e}")
+
+    def _rotate(self):
+        if self.backup_count <= 0:
+            os.remove(self.path)
+            return
+        for index in range(self.backup_count - 1, 0, -1):
+            src = f"{self.path}.{index}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{index + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+
+def get_run_log(path=DEFAULT_LOG_PATH, **kwargs):
+    """Return the shared writer for path so concurrent sessions use one sink."""
+    with _writers_lock:
+        writer = _writers.get(path)
+        if writer is None or writer._closed:
+            writer = RunLogWriter(path, **kwargs)
+            _writers[path] = writer
+        return writer
+
+
+# -------------------- Reading & Rendering --------------------
+def log_files(path=DEFAULT_LOG_PATH):
+    """Return the current file and its rotated backups, oldest first."""
+    backups = []
+    index = 1
+    while os.path.exists(f"{path}.{index}"):
+        backups.append(f"{path}.{index}")
+        index += 1
+    files = list(reversed(backups))
+    if os.path.exists(path):
+        files.append(path)
+    return files
+
+
+def read_events(path=DEFAULT_LOG_PATH, session_id=None):
+    """Yield events from the log (including rotated files), skipping torn lines."""
+    for file_path in log_files(path):
+        with open(file_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue
+                if session_id is None or event.get("session") == session_id:
+                    yield event
+
+
+def render_markdown(events):
+    """Render step/problem events in the AutomationLogger markdown layout."""
+    steps, problems = [], []
+    for event in events:
+        if event.get("kind") == "step":
+            steps.append(event["message"])
+        elif event.get("kind") == "problem":
+            problems.append(event["message"])
+    lines = ["# Automation Log\n", "## Steps Taken"]
+    lines += [f"{i}. {step}" for i, step in enumerate(steps, 1)]
+    lines += ["", "## Problems Encountered"]
+    if problems:
+        lines += [f"- {p}" for p in problems]
+    else:
+        lines.append("- No problems encountered.")
+    return "\n".join(lines) + "\n"
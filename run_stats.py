@@ -0,0 +1,263 @@
+import sys
+import json
+import html
+import time
+import argparse
+from datetime import datetime, timezone
+
+import numpy as np
+
+from run_log import DEFAULT_LOG_PATH, log_files
+
+# -------------------- Multi-Run Aggregation --------------------
+# Loads the wizard's per-step "timing" events from any number of run logs
+# into flat NumPy arrays and computes, per flow step and without Python
+# loops over records:
+#
+#   * duration percentiles of successful runs (sort once, index per group),
+#   * failure counts and a step x day failure-rate heatmap (bincount),
+#   * a slowest-step ranking by p95.
+#
+# The result is rendered as a static HTML and/or markdown dashboard:
+#
+#   python run_stats.py automation_log.jsonl ci_logs/*.jsonl --html dashboard.html --md dashboard.md
+
+PERCENTILES = (50, 90, 95, 99)
+DAY = 86400
+# timeouts.py records helper waits as the "wait" flow: input to the timeout advisor, not steps to chart
+HELPER_FLOWS = ("wait",)
+
+
+class StepTable:
+    """Columnar step records: group (flow/step code), timestamp, duration and outcome."""
+
+    def __init__(self, groups, group, ts, duration, ok):
+        self.groups = groups          # [(flow, step)] indexed by group code
+        self.group = group            # int32
+        self.ts = ts                  # float64, unix seconds
+        self.duration = duration      # float64, seconds
+        self.ok = ok                  # bool
+
+    def __len__(self):
+        return len(self.group)
+
+    @classmethod
+    def from_records(cls, records):
+        """Build from (flow, step, ts, duration, ok) tuples."""
+        codes, groups = {}, []
+        group, ts, duration, ok = [], [], [], []
+        for flow, step, timestamp, seconds, success in records:
+            key = (flow, step)
+            code = codes.get(key)
+            if code is None:
+                code = codes[key] = len(groups)
+                groups.append(key)
+            group.append(code)
+            ts.append(timestamp)
+            duration.append(seconds)
+            ok.append(success)
+        return cls(groups, np.array(group, dtype=np.int32), np.array(ts, dtype=np.float64),
+                   np.array(duration, dtype=np.float64), np.array(ok, dtype=bool))
+
+
+def iter_timings(paths, batch=50000):
+    """Yield (flow, step, ts, duration, ok) from "timing" events in run-log files."""
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            lines = []
+            for line in f:
+                # Skip other event kinds (and torn lines) without paying for json.loads
+                if '"timing"' in line and line.endswith("}\n"):
+                    lines.append(line)
+                    if len(lines) >= batch:
+                        yield from _decode(lines)
+                        lines = []
+            yield from _decode(lines)
+
+
+def _decode(lines):
+    # One json.loads per batch is several times faster than one per line
+    try:
+        events = json.loads("[" + ",".join(lines) + "]")
+    except ValueError:
+        events = []
+        for line in lines:
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                continue
+    for event in events:
+        if event.get("kind") == "timing":
+            yield (event.get("flow") or "unknown", event["message"], event["ts"],
+                   event.get("duration") or 0.0, bool(event.get("ok")))
+
+
+def load(paths, skip_flows=()):
+    """StepTable from run-log paths (rotated siblings of each path are included), without skip_flows."""
+    files = [file for path in paths for file in log_files(path)]
+    records = iter_timings(files)
+    if skip_flows:
+        records = (record for record in records if record[0] not in skip_flows)
+    return StepTable.from_records(records)
+
+
+def aggregate(table, percentiles=PERCENTILES):
+    """Per-group statistics as a dict of arrays indexed by group code."""
+    groups = len(table.groups)
+    counts = np.bincount(table.group, minlength=groups)
+    failures = np.bincount(table.group, weights=~table.ok, minlength=groups).astype(np.int64)
+
+    # Duration statistics over successful steps: sort by (group, duration) once
+    ok_group, ok_duration = table.group[table.ok], table.duration[table.ok]
+    order = np.lexsort((ok_duration, ok_group))
+    # A NaN sentinel keeps the index arithmetic valid when nothing succeeded
+    sorted_duration = ok_duration[order] if len(order) else np.array([np.nan])
+    ok_counts = np.bincount(ok_group, minlength=groups)
+    starts = np.concatenate(([0], np.cumsum(ok_counts)[:-1]))
+    has_data = ok_counts > 0
+    last = starts + np.maximum(ok_counts, 1) - 1
+    last_index = len(sorted_duration) - 1
+    stats = {
+        "count": counts,
+        "failures": failures,
+        "failure_rate": np.divide(failures, counts, out=np.zeros(groups), where=counts > 0),
+        "ok_count": ok_counts,
+        "mean": np.divide(np.bincount(ok_group, weights=ok_duration, minlength=groups), ok_counts,
+                          out=np.full(groups, np.nan), where=has_data),
+        "max": np.where(has_data, sorted_duration[np.minimum(last, last_index)], np.nan),
+    }
+    for q in percentiles:
+        # Linear interpolation between closest ranks, like numpy.percentile
+        position = starts + (np.maximum(ok_counts, 1) - 1) * (q / 100)
+        low = np.minimum(np.floor(position).astype(np.int64), last_index)
+        high = np.minimum(np.minimum(low + 1, last), last_index)
+        values = sorted_duration[low] + (sorted_duration[high] - sorted_duration[low]) * (position - low)
+        stats[f"p{q}"] = np.where(has_data, values, np.nan)
+    return stats
+
+
+def failure_heatmap(table, days=30):
+    """(day labels, failure-rate matrix [group, day], totals) for the last `days` days with data."""
+    if not len(table):
+        return [], np.zeros((len(table.groups), 0)), np.zeros((len(table.groups), 0), dtype=np.int64)
+    day = (table.ts // DAY).astype(np.int64)
+    last = day.max()
+    first = max(day.min(), last - days + 1)
+    keep = day >= first
+    width = int(last - first + 1)
+    cell = table.group[keep].astype(np.int64) * width + (day[keep] - first)
+    size = len(table.groups) * width
+    totals = np.bincount(cell, minlength=size).reshape(len(table.groups), width)
+    failed = np.bincount(cell, weights=~table.ok[keep], minlength=size).reshape(len(table.groups), width)
+    rates = np.divide(failed, totals, out=np.full(totals.shape, np.nan), where=totals > 0)
+    labels = [datetime.fromtimestamp((first + i) * DAY, timezone.utc).strftime("%m-%d") for i in range(width)]
+    return labels, rates, totals
+
+
+def slowest_steps(table, stats, top=10, key="p95"):
+    """[(flow, step, value)] ranked by the given statistic, slowest first."""
+    values = stats[key]
+    order = np.argsort(np.where(np.isnan(values), -np.inf, values))[::-1]
+    return [(*table.groups[i], float(values[i])) for i in order[:top] if not np.isnan(values[i])]
+
+
+# -------------------- Rendering --------------------
+def _fmt(value):
+    return "–" if value is None or np.isnan(value) else f"{value:.2f}"
+
+
+def render_markdown(table, stats, heatmap, ranking):
+    percentile_keys = [key for key in stats if key.startswith("p") and key[1:].isdigit()]
+    lines = ["# Run Statistics", "", f"{len(table):,} step records, {len(table.groups)} steps", "",
+             "## Slowest Steps (p95)", "", "| # | Flow | Step | p95 (s) |", "|---|---|---|---|"]
+    lines += [f"| {rank} | {flow} | {step} | {value:.2f} |" for rank, (flow, step, value) in enumerate(ranking, 1)]
+    lines += ["", "## Step Durations (successful runs, seconds)", "",
+              "| Flow | Step | Runs | Failures | Fail % | Mean | " + " | ".join(percentile_keys) + " | Max |",
+              "|---" * (6 + len(percentile_keys) + 1) + "|"]
+    for i, (flow, step) in enumerate(table.groups):
+        row = [flow, step, str(stats["count"][i]), str(stats["failures"][i]),
+               f"{stats['failure_rate'][i] * 100:.1f}", _fmt(stats["mean"][i])]
+        row += [_fmt(stats[key][i]) for key in percentile_keys] + [_fmt(stats["max"][i])]
+        lines.append("| " + " | ".join(row) + " |")
+    labels, rates, _ = heatmap
+    if labels:
+        lines += ["", "## Failure Rate by Day (%)", "", "| Step | " + " | ".join(labels) + " |",
+                  "|---" * (len(labels) + 1) + "|"]
+        for i, (flow, step) in enumerate(table.groups):
+            cells = ["" if np.isnan(rate) else f"{rate * 100:.0f}" for rate in rates[i]]
+            lines.append(f"| {flow}/{step} | " + " | ".join(cells) + " |")
+    return "\n".join(lines) + "\n"
+
+
+def render_html(table, stats, heatmap, ranking):
+    percentile_keys = [key for key in stats if key.startswith("p") and key[1:].isdigit()]
+    e = html.escape
+    out = ["<!DOCTYPE html><html><head><meta charset='utf-8'><title>Run Statistics</title><style>",
+           "body{font-family:sans-serif;margin:2em}table{border-collapse:collapse;margin-bottom:2em}",
+           "td,th{border:1px solid #ccc;padding:4px 8px;text-align:right}td.l,th.l{text-align:left}",
+           ".heat td{width:2.5em;text-align:center;font-size:12px}</style></head><body>",
+           f"<h1>Run Statistics</h1><p>{len(table):,} step records, {len(table.groups)} steps</p>",
+           "<h2>Slowest Steps (p95)</h2><table><tr><th>#</th><th class='l'>Flow</th><th class='l'>Step</th>"
+           "<th>p95 (s)</th></tr>"]
+    for rank, (flow, step, value) in enumerate(ranking, 1):
+        out.append(f"<tr><td>{rank}</td><td class='l'>{e(flow)}</td><td class='l'>{e(step)}</td>"
+                   f"<td>{value:.2f}</td></tr>")
+    out.append("</table><h2>Step Durations (successful runs, seconds)</h2><table><tr><th class='l'>Flow</th>"
+               "<th class='l'>Step</th><th>Runs</th><th>Failures</th><th>Fail %</th><th>Mean</th>"
+               + "".join(f"<th>{key}</th>" for key in percentile_keys) + "<th>Max</th></tr>")
+    for i, (flow, step) in enumerate(table.groups):
+        cells = [stats["count"][i], stats["failures"][i], f"{stats['failure_rate'][i] * 100:.1f}",
+                 _fmt(stats["mean"][i])] + [_fmt(stats[key][i]) for key in percentile_keys] + [_fmt(stats["max"][i])]
+        out.append(f"<tr><td class='l'>{e(flow)}</td><td class='l'>{e(step)}</td>"
+                   + "".join(f"<td>{cell}</td>" for cell in cells) + "</tr>")
+    out.append("</table>")
+    labels, rates, totals = heatmap
+    if labels:
+        out.append("<h2>Failure Rate by Day</h2><table class='heat'><tr><th class='l'>Step</th>"
+                   + "".join(f"<th>{label}</th>" for label in labels) + "</tr>")
+        for i, (flow, step) in enumerate(table.groups):
+            cells = []
+            for rate, total in zip(rates[i], totals[i]):
+                if np.isnan(rate):
+                    cells.append("<td></td>")
+                else:
+                    cells.append(f"<td style='background:rgba(220,38,38,{0.1 + 0.9 * rate:.2f})' "
+                                 f"title='{total} runs'>{rate * 100:.0f}</td>")
+            out.append(f"<tr><td class='l'>{e(flow)}/{e(step)}</td>" + "".join(cells) + "</tr>")
+        out.append("</table>")
+    out.append("</body></html>")
+    return "\n".join(out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aggregate step timings across runs into a dashboard")
+    parser.add_argument("paths", nargs="*", default=[DEFAULT_LOG_PATH], help="run-log JSONL files")
+    parser.add_argument("--html", help="write an HTML dashboard here")
+    parser.add_argument("--md", help="write a markdown dashboard here (default: print it)")
+    parser.add_argument("--days", type=int, default=30, help="days shown in the failure heatmap")
+    parser.add_argument("--top", type=int, default=10, help="steps in the slowest-step ranking")
+    parser.add_argument("--include-waits", action="store_true", help="also chart the helper waits (flow 'wait')")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    table = load(args.paths, skip_flows=() if args.include_waits else HELPER_FLOWS)
+    loaded = time.perf_counter()
+    stats = aggregate(table)
+    heatmap = failure_heatmap(table, args.days)
+    ranking = slowest_steps(table, stats, args.top)
+    print(f"Loaded {len(table):,} step records in {loaded - start:.2f}s, "
+          f"aggregated in {time.perf_counter() - loaded:.2f}s", file=sys.stderr)
+
+    markdown = render_markdown(table, stats, heatmap, ranking)
+    if args.md:
+        with open(args.md, "w", encoding="utf-8") as f:
+            f.write(markdown)
+    elif not args.html:
+        print(markdown)
+    if args.html:
+        with open(args.html, "w", encoding="utf-8") as f:
+            f.write(render_html(table, stats, heatmap, ranking))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import json
+import re
+import sys
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# -------------------- Stand-in API Server --------------------
+# Minimal in-memory imitation of the endpoints api_fixtures.py uses, for
+# running fixture seeding offline:
+#
+#   python stub_api_server.py 8765
+#   KWIKS_API_URL=http://127.0.0.1:8765/api python test_multi_login.py
+
+RESOURCES = ("missions", "talents", "applications")
+STUB_TOKEN = "stub-token"
+
+
+class StubApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, payload=None):
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"null") if length else None
+
+    def _route(self):
+        match = re.fullmatch(r"/api/(\w+)(?:/([\w-]+))?", self.path.split("?")[0])
+        return match.groups() if match else (None, None)
+
+    def _authorized(self):
+        return self.headers.get("Authorization") == f"Bearer {STUB_TOKEN}"
+
+    def do_POST(self):
+        kind, tail = self._route()
+        payload = self._body() or {}
+        if kind == "auth" and tail == "login":
+            if payload.get("email") and payload.get("password"):
+                return self._send(200, {"token": STUB_TOKEN})
+            return self._send(401, {"error": "invalid credentials"})
+        if kind not in RESOURCES:
+            return self._send(404, {"error": "not found"})
+        if not self._authorized():
+            return self._send(401, {"error": "unauthorized"})
+        store = self.server.store[kind]
+        if tail == "bulk-delete":
+            ids = payload.get("ids", [])
+            with self.server.lock:
+                removed = sum(1 for entity_id in ids if store.pop(entity_id, None) is not None)
+            return self._send(200, {"deleted": removed})
+        if tail is not None:
+            return self._send(404, {"error": "not found"})
+        key = self.headers.get("Idempotency-Key")
+        with self.server.lock:
+            # A retried create with the same key gets the entity created the first time
+            entity = self.server.idempotency.get(key) if key else None
+            if entity is None:
+                entity = dict(payload, id=uuid.uuid4().hex)
+                store[entity["id"]] = entity
+                if key:
+                    self.server.idempotency[key] = entity
+            # Fault injection: answer like a proxy that lost the response after the commit
+            failed = self.server.fail_after_commit > 0
+            self.server.fail_after_commit -= failed
+        if failed:
+            return self._send(502, {"error": "bad gateway"})
+        return self._send(201, entity)
+
+    def do_GET(self):
+        kind, tail = self._route()
+        if kind not in RESOURCES:
+            return self._send(404, {"error": "not found"})
+        store = self.server.store[kind]
+        if tail is None:
+            return self._send(200, {"data": list(store.values())})
+        if tail in store:
+            return self._send(200, store[tail])
+        return self._send(404, {"error": "not found"})
+
+    def do_DELETE(self):
+        kind, tail = self._route()
+        if kind not in RESOURCES or tail is None:
+            return self._send(404, {"error": "not found"})
+        if not self._authorized():
+            return self._send(401, {"error": "unauthorized"})
+        with self.server.lock:
+            removed = self.server.store[kind].pop(tail, None)
+        return self._send(204 if removed is not None else 404)
+
+
+def start_stub_server(host="127.0.0.1", port=0):
+    """Start the stand-in API in a daemon thread; returns (server, api_base_url)."""
+    server = ThreadingHTTPServer((host, port), StubApiHandler)
+    server.daemon_threads = True
+    server.store = {kind: {} for kind in RESOURCES}
+    server.idempotency = {}
+    # Set to n to make the next n creates commit and then answer 502
+    server.fail_after_commit = 0
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, name="stub-api", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/api"
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    server, url = start_stub_server(port=port)
+    print(f"Stand-in API listening on {url} (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
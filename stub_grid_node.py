@@ -0,0 +1,87 @@
+import json
+import re
+import sys
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# -------------------- Stand-in WebDriver Node --------------------
+# Speaks just enough of the W3C WebDriver protocol for grid.py: /status with
+# slot information, session create/delete, and a null answer to any other
+# command. Used to exercise scheduling and node-death handling locally:
+#
+#   python stub_grid_node.py 4445 2   # port, slots
+#   SELENIUM_NODES=http://127.0.0.1:4445 ...
+
+
+class StubNodeHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, value):
+        body = json.dumps({"value": value}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def do_GET(self):
+        node = self.server
+        if self.path.rstrip("/") == "/status":
+            with node.lock:
+                slots = [{"session": {"sessionId": sid} if sid else None} for sid in node.slots]
+            return self._send(200, {"ready": True, "message": "stub node",
+                                    "nodes": [{"availability": "UP", "slots": slots}]})
+        return self._send(200, None)
+
+    def do_POST(self):
+        self._read_body()
+        node = self.server
+        if self.path.rstrip("/") == "/session":
+            with node.lock:
+                if None not in node.slots:
+                    return self._send(500, {"error": "session not created", "message": "No free slots",
+                                            "stacktrace": ""})
+                session_id = uuid.uuid4().hex
+                node.slots[node.slots.index(None)] = session_id
+            return self._send(200, {"sessionId": session_id,
+                                    "capabilities": {"browserName": "chrome", "browserVersion": "stub"}})
+        return self._send(200, None)
+
+    def do_DELETE(self):
+        node = self.server
+        match = re.fullmatch(r"/session/(\w+)", self.path.rstrip("/"))
+        if match:
+            with node.lock:
+                if match.group(1) in node.slots:
+                    node.slots[node.slots.index(match.group(1))] = None
+        return self._send(200, None)
+
+
+def start_stub_node(slots=1, host="127.0.0.1", port=0):
+    """Start a stand-in node in a daemon thread; `server.shutdown()` simulates node death."""
+    server = ThreadingHTTPServer((host, port), StubNodeHandler)
+    server.daemon_threads = True
+    server.slots = [None] * slots
+    server.lock = threading.Lock()
+    server.url = f"http://{host}:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, name="stub-node", daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 4445
+    slots = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    server = start_stub_node(slots, port=port)
+    print(f"Stand-in WebDriver node on {server.url} with {slots} slot(s) (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -1,24 +1,33 @@
 import os
 import time
+import uuid
 import logging
+import argparse
 import threading
 from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from typing import Optional
 
 from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, ElementClickInterceptedException
 
 from webdriver_manager.chrome import ChromeDriverManager
 
-# -------------------- Logging Setup --------------------
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+from log_setup import setup_logging
+from browser_profiles import apply_profile, build_options, profile_for
+from browser_contexts import ContextsUnsupported, SharedBrowser
+from api_fixtures import ApiClient, FixtureSeeder
+from locators import Locator, clickable, find
+from coordination import connect
+from grid import RemoteBackend, get_backend
+from admission import get_admission_controller
+from budget import Budget, BudgetExceeded, bounded
+from page_metrics import format_summary, get_page_metrics
+from timeouts import AdvisedWait
 
 # -------------------- Load Credentials --------------------
 load_dotenv()
@@ -29,33 +38,89 @@ ACCOUNT2_PASSWORD = os.getenv("PASSWORD")
 ACCOUNT3_EMAIL = os.getenv("USERNAME_Clt")
 ACCOUNT3_PASSWORD = os.getenv("PASSWORD")
 
+# Time budget for one actor's whole session (login + actions), in seconds
+SESSION_BUDGET = float(os.getenv("SESSION_BUDGET", "180"))
+
+# Set MULTI_LOGIN_CONTEXTS=1 (or --contexts) to run every actor as an isolated
+# browser context of one Chrome (browser_contexts.py) instead of its own Chrome.
+SHARED_BROWSER = os.getenv("MULTI_LOGIN_CONTEXTS") == "1"
+
+# Set SEED_FIXTURES=1 to create the mission through the API (api_fixtures.py)
+# instead of waiting for Account-1 to pick one in the UI.
+SEED_FIXTURES = os.getenv("SEED_FIXTURES") == "1"
+
+# -------------------- Shared Scenario State --------------------
+# Actors coordinate through coordination.py: in-process by default, or via a
+# coordination server when COORDINATOR_URL is set (actors in other processes/hosts).
+# Names live in a per-run namespace (--run-id), so a long-lived server never
+# hands one run the event or mission name of the previous one.
+LOGIN_BARRIER = "multi-login/click-login"
+MISSION_SELECTED_EVENT = "multi-login/mission-selected"
+MISSION_NAME_KEY = "multi-login/mission-name"
+
 # -------------------- WebDriver Setup --------------------
-def start_driver(headless: bool = False) -> webdriver.Chrome:
-    options = Options()
-    if headless:
-        options.add_argument("--headless=new")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
+def start_driver(headless: bool = False, profile: Optional[str] = None) -> webdriver.Chrome:
+    profile = profile or profile_for("multi_login")
+    backend = get_backend()
+    if isinstance(backend, RemoteBackend):
+        return backend.create_driver(profile, headless=headless)
+    options = build_options(profile, headless=headless)
     service = Service(ChromeDriverManager().install())
     driver = webdriver.Chrome(service=service, options=options)
-    driver.maximize_window()
-    return driver
+    return apply_profile(driver, profile)
+
+def start_shared_browser(headless: bool = False) -> Optional[SharedBrowser]:
+    """One admitted Chrome for all actors, or None (one Chrome per actor) if it cannot host contexts."""
+    admission = get_admission_controller()
+    admission.acquire("shared-browser")
+    try:
+        driver = start_driver(headless=headless)
+    except Exception:
+        admission.release()
+        raise
+    try:
+        return SharedBrowser(driver, profile=profile_for("multi_login"))
+    except ContextsUnsupported as e:
+        logging.warning("%s; starting one Chrome per actor instead.", e)
+        driver.quit()
+        admission.release()
+        return None
+    except Exception:
+        driver.quit()
+        admission.release()
+        raise
 
 # -------------------- Utility --------------------
-def find_first_visible(wait: WebDriverWait, locators: list[tuple]) -> webdriver.remote.webelement.WebElement | None:
-    """Try multiple locator tuples until one element is present and visible."""
-    for by, value in locators:
-        try:
-            return wait.until(EC.presence_of_element_located((by, value)))
-        except TimeoutException:
-            continue
-    return None
+def find_first_visible(driver: webdriver.Chrome, locators: list, timeout: float = 20, page: Optional[str] = None,
+                       name: str = "find_first_visible") -> webdriver.remote.webelement.WebElement | None:
+    """Poll all locator tuples / Locators together; the whole chain shares one (advised) timeout."""
+    def first_match(d):
+        for locator in locators:
+            if isinstance(locator, Locator):
+                element = find(d, locator, page=page)
+            else:
+                elements = d.find_elements(*locator)
+                element = elements[0] if elements else None
+            if element is not None:
+                return element
+        return False
+    try:
+        return AdvisedWait(driver, f"multi_login.{name}", timeout).until(first_match)
+    except TimeoutException:
+        return None
+
+# -------------------- Locators --------------------
+# Case-insensitive text matches, compiled to CSS + one in-page text filter (see locators.py)
+LOGIN_BUTTON = Locator("login", css="button")
+MISSION_LINK = Locator("mission", role="clickable")
+APPLY_BUTTON = Locator("apply", role="clickable")
+ASSIGN_BUTTON = Locator("assign", css="a, button")
 
 # -------------------- Login Logic --------------------
-def login_to_kwiks(driver: webdriver.Chrome, email: str, password: str, click_barrier: threading.Barrier) -> None:
+def login_to_kwiks(driver: webdriver.Chrome, email: str, password: str, click_barrier) -> bool:
+    """Log in through the UI; returns True once the dashboard navigation shows up."""
     url = "https://preprod.kwiks.io/login"
     driver.get(url)
-    wait = WebDriverWait(driver, 20)
 
     # Step 1: Locate and fill the Email Address field
     email_locators = [
@@ -66,14 +131,14 @@ def login_to_kwiks(driver: webdriver.Chrome, email: str, password: str, click_ba
         (By.XPATH, "//input[contains(@placeholder, 'email')]"),
     ]
 
-    email_input = find_first_visible(wait, email_locators)
+    email_input = find_first_visible(driver, email_locators, name="login.email")
     if not email_input:
-        logging.error(f"{email}: Could not locate Email Address input.")
-        return
+        logging.error("%s: Could not locate Email Address input.", email)
+        return False
 
     email_input.clear()
     email_input.send_keys(email)
-    logging.info(f"{email}: Filled Email Address.")
+    logging.info("%s: Filled Email Address.", email)
 
     # Step 2: Locate and fill the Password field
     password_locators = [
@@ -84,181 +149,247 @@ def login_to_kwiks(driver: webdriver.Chrome, email: str, password: str, click_ba
         (By.XPATH, "//input[contains(@placeholder, 'password')]"),
     ]
 
-    password_input = find_first_visible(wait, password_locators)
+    password_input = find_first_visible(driver, password_locators, name="login.password")
     if not password_input:
-        logging.error(f"{email}: Could not locate Password input.")
-        return
+        logging.error("%s: Could not locate Password input.", email)
+        return False
 
     password_input.clear()
     password_input.send_keys(password)
-    logging.info(f"{email}: Filled Password.")
+    logging.info("%s: Filled Password.", email)
 
     # Step 3: Click the Login button after barrier to keep simultaneous behaviour
     try:
-        logging.info(f"{email}: Waiting at barrier before clicking Login.")
-        click_barrier.wait(timeout=30)
+        logging.info("%s: Waiting at barrier before clicking Login.", email)
+        click_barrier.wait(timeout=bounded(30))
     except threading.BrokenBarrierError:
-        logging.warning(f"{email}: Barrier broken — proceeding without sync.")
+        logging.warning("%s: Barrier broken — proceeding without sync.", email)
 
     button_locators = [
-        (By.XPATH, "//button[@type='submit' and contains(translate(normalize-space(text()), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'),'login')]"),
-        (By.XPATH, "//button[@type='button' and contains(translate(normalize-space(text()), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'),'login')]"),
-        (By.XPATH, "//button[contains(@class,'button') and contains(translate(normalize-space(text()), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'),'login')]"),
+        LOGIN_BUTTON,
         (By.CSS_SELECTOR, "button[type='submit']"),
     ]
 
-    login_button = find_first_visible(wait, button_locators)
+    login_button = find_first_visible(driver, button_locators, page="login", name="login.button")
     if login_button:
         try:
-            wait.until(EC.element_to_be_clickable(login_button))
+            AdvisedWait(driver, "multi_login.login.clickable", 5).until(EC.element_to_be_clickable(login_button))
             login_button.click()
-            logging.info(f"{email}: Clicked Login button.")
+            logging.info("%s: Clicked Login button.", email)
         except ElementClickInterceptedException:
-            logging.warning(f"{email}: Click intercepted — sending RETURN key.")
+            logging.warning("%s: Click intercepted — sending RETURN key.", email)
             password_input.send_keys(Keys.RETURN)
     else:
-        logging.warning(f"{email}: Login button not found — sending RETURN key.")
+        logging.warning("%s: Login button not found — sending RETURN key.", email)
         password_input.send_keys(Keys.RETURN)
 
     # Step 5: Wait for login success indicator
     try:
-        wait.until(EC.presence_of_element_located((By.XPATH, "//nav//*[contains(text(), 'Dashboard') or contains(text(), 'Logout')]")))
-        logging.info(f"{email}: Logged in successfully.")
+        AdvisedWait(driver, "multi_login.login.dashboard", 20).until(EC.presence_of_element_located((By.XPATH, "//nav//*[contains(text(), 'Dashboard') or contains(text(), 'Logout')]")))
+        logging.info("%s: Logged in successfully.", email)
+        return True
     except TimeoutException:
-        logging.warning(f"{email}: Login might have failed or confirmation element not found.")
+        logging.warning("%s: Login might have failed or confirmation element not found.", email)
+        return False
 
-# -------------------- Run Each Session --------------------
-def run_session(name: str, email: str, password: str, click_barrier: threading.Barrier, headless: bool = False) -> None:
-    driver = start_driver(headless=headless)
-    try:
-        login_to_kwiks(driver, email, password, click_barrier)
+# -------------------- Post-login Actions --------------------
+def perform_actor_actions(driver: webdriver.Chrome, name: str, coordinator) -> None:
+    mission_selected_event = coordinator.event(MISSION_SELECTED_EVENT)
+    if name == "Account-1":
+        try:
+            # One key per element, so each wait learns its own timeout
+            mission_element = AdvisedWait(driver, "multi_login.mission", 15).until(
+                clickable(MISSION_LINK, page="dashboard"))
+            mission_element.click()
+            logging.info("%s: Clicked 'Mission' successfully.", name)
 
-        # -------------------- Post-login actions --------------------
-        if name == "Account-1":
+            # Wait for an element labeled 'Apply' and click it
             try:
-                wait = WebDriverWait(driver, 15)
-                mission_element = wait.until(
-                    EC.element_to_be_clickable(
-                        (
-                            By.XPATH,
-                            "//*[self::a or self::button or self::div][contains(translate(normalize-space(text()), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'),'mission')]",
-                        )
-                    )
-                )
-                mission_element.click()
-                logging.info(f"{name}: Clicked 'Mission' successfully.")
-
-                # Wait for an element labeled 'Apply' and click it
+                apply_element = AdvisedWait(driver, "multi_login.apply", 15).until(
+                    clickable(APPLY_BUTTON, page="missions"))
+                # Capture mission name from surrounding card/row before clicking Apply
                 try:
-                    apply_element = wait.until(
-                        EC.element_to_be_clickable(
-                            (
-                                By.XPATH,
-                                "//*[self::a or self::button or self::div][contains(translate(normalize-space(text()), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'),'apply')]",
-                            )
-                        )
-                    )
-                    # Capture mission name from surrounding card/row before clicking Apply
-                    try:
-                        mission_card = apply_element.find_element(By.XPATH, "ancestor::*[self::tr or contains(@class,'card') or contains(@class,'chakra') or contains(@class,'Mui')]")
-                        mission_name_el = mission_card.find_element(By.XPATH, ".//*[self::h1 or self::h2 or self::h3 or self::span or self::p][normalize-space(text())!='']")
-                        global mission_name_selected
-                        mission_name_selected = mission_name_el.text.strip()
-                        logging.info(f"{name}: Selected mission '{mission_name_selected}'.")
-                    except Exception:
-                        logging.warning(f"{name}: Could not extract mission name; proceeding anyway.")
-
-                    apply_element.click()
-                    logging.info(f"{name}: Clicked 'Apply' successfully.")
-
-                    # Signal other threads mission selected
-                    mission_selected_event.set()
+                    mission_card = apply_element.find_element(By.XPATH, "ancestor::*[self::tr or contains(@class,'card') or contains(@class,'chakra') or contains(@class,'Mui')]")
+                    mission_name_el = mission_card.find_element(By.XPATH, ".//*[self::h1 or self::h2 or self::h3 or self::span or self::p][normalize-space(text())!='']")
+                    if not SEED_FIXTURES:
+                        coordinator.put(MISSION_NAME_KEY, mission_name_el.text.strip())
+                    logging.info("%s: Selected mission '%s'.", name, mission_name_el.text.strip())
+                except Exception:
+                    logging.warning("%s: Could not extract mission name; proceeding anyway.", name)
 
-                except TimeoutException:
-                    logging.error(f"{name}: 'Apply' element not found or not clickable.")
-                except ElementClickInterceptedException:
-                    logging.error(f"{name}: Click intercepted when trying to click 'Apply'.")
+                apply_element.click()
+                logging.info("%s: Clicked 'Apply' successfully.", name)
+
+                # Signal other actors mission selected
+                mission_selected_event.set()
 
             except TimeoutException:
-                logging.error(f"{name}: 'Mission' element not found or not clickable.")
+                logging.error("%s: 'Apply' element not found or not clickable.", name)
             except ElementClickInterceptedException:
-                logging.error(f"{name}: Click intercepted when trying to open 'Mission'.")
+                logging.error("%s: Click intercepted when trying to click 'Apply'.", name)
+
+        except TimeoutException:
+            logging.error("%s: 'Mission' element not found or not clickable.", name)
+        except ElementClickInterceptedException:
+            logging.error("%s: Click intercepted when trying to open 'Mission'.", name)
 
-        elif name == "Account-2":
-            # Wait until Account-1 has selected a mission
-            logging.info(f"{name}: Waiting for mission selection by Account-1...")
-            if mission_selected_event.wait(timeout=60):
-                logging.info(f"{name}: Detected mission '{mission_name_selected}' selected by Account-1. Navigating to assign.")
+    elif name == "Account-2":
+        # Wait until Account-1 has selected a mission
+        logging.info("%s: Waiting for mission selection by Account-1...", name)
+        if mission_selected_event.wait(timeout=bounded(60)):
+            mission_name_selected = coordinator.get(MISSION_NAME_KEY, timeout=bounded(5))
+            logging.info("%s: Detected mission '%s' selected by Account-1. Navigating to assign.", name, mission_name_selected)
 
+            try:
+                # Ensure Mission page open
                 try:
-                    wait = WebDriverWait(driver, 15)
-                    # Ensure Mission page open
-                    try:
-                        mission_tab = wait.until(
-                            EC.element_to_be_clickable(
-                                (
-                                    By.XPATH,
-                                    "//*[self::a or self::button or self::div][contains(translate(normalize-space(text()), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'),'mission')]",
-                                )
-                            )
-                        )
-                        mission_tab.click()
-                        logging.info(f"{name}: Opened 'Mission' page.")
-                    except TimeoutException:
-                        logging.warning(f"{name}: 'Mission' tab not found; assuming already there.")
-
-                    # Find mission row by name
-                    mission_row = wait.until(
-                        EC.presence_of_element_located(
-                            (
-                                By.XPATH,
-                                f"//*[contains(normalize-space(text()), '{mission_name_selected}')]",
-                            )
-                        )
-                    )
+                    mission_tab = AdvisedWait(driver, "multi_login.mission_tab", 15).until(
+                        clickable(MISSION_LINK, page="dashboard"))
+                    mission_tab.click()
+                    logging.info("%s: Opened 'Mission' page.", name)
+                except TimeoutException:
+                    logging.warning("%s: 'Mission' tab not found; assuming already there.", name)
 
-                    # Within same row/card, click 'Assign'
-                    try:
-                        assign_button = mission_row.find_element(
+                # Find mission row by name
+                mission_row = AdvisedWait(driver, "multi_login.mission_row", 15).until(
+                    EC.presence_of_element_located(
+                        (
                             By.XPATH,
-                            ".//*[self::a or self::button][contains(translate(normalize-space(text()), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'),'assign')]",
+                            f"//*[contains(normalize-space(text()), '{mission_name_selected}')]",
                         )
-                        wait.until(EC.element_to_be_clickable(assign_button))
-                        assign_button.click()
-                        logging.info(f"{name}: Clicked 'Assign' for mission '{mission_name_selected}'.")
-                    except Exception:
-                        logging.error(f"{name}: Could not click 'Assign' for mission '{mission_name_selected}'.")
-                except TimeoutException:
-                    logging.error(f"{name}: Mission '{mission_name_selected}' not found.")
-            else:
-                logging.error(f"{name}: Timed out waiting for mission selection.")
+                    )
+                )
+
+                # Within same row/card, click 'Assign'
+                try:
+                    assign_button = find(driver, ASSIGN_BUTTON, scope=mission_row, page="missions")
+                    if assign_button is None:
+                        raise TimeoutException("'Assign' not found in mission row")
+                    AdvisedWait(driver, "multi_login.assign", 15).until(EC.element_to_be_clickable(assign_button))
+                    assign_button.click()
+                    logging.info("%s: Clicked 'Assign' for mission '%s'.", name, mission_name_selected)
+                except Exception:
+                    logging.error("%s: Could not click 'Assign' for mission '%s'.", name, mission_name_selected)
+            except TimeoutException:
+                logging.error("%s: Mission '%s' not found.", name, mission_name_selected)
+        else:
+            logging.error("%s: Timed out waiting for mission selection.", name)
+
+# -------------------- Run Each Session --------------------
+def run_session(name: str, email: str, password: str, click_barrier, headless: bool = False, coordinator=None,
+                browser: Optional[SharedBrowser] = None) -> None:
+    coordinator = coordinator or connect()
+    admission = get_admission_controller()
+    if browser is not None:
+        # An isolated context in the shared Chrome, admitted once by main()
+        driver = browser.new_context(name)
+    else:
+        # Start Chrome only when the host has room for it (see admission.py)
+        admission.acquire(name)
+        try:
+            driver = start_driver(headless=headless)
+        except Exception:
+            admission.release()
+            raise
+    try:
+        session = Budget(name, SESSION_BUDGET)
+        page_metrics = get_page_metrics(driver)
+        try:
+            with session.enter():
+                with session.child("login", 60).enter():
+                    login_to_kwiks(driver, email, password, click_barrier)
+                logging.info("%s: login page metrics: %s", name, format_summary(page_metrics.collect()))
+                with session.child("actions").enter():
+                    perform_actor_actions(driver, name, coordinator)
+                logging.info("%s: actions page metrics: %s", name, format_summary(page_metrics.collect()))
+        except BudgetExceeded as e:
+            # Give the browser slot back now instead of idling
+            logging.error("%s: %s\n%s", name, e, session.report())
+            return
+        if any(budget.exhausted for budget in session.children):
+            logging.error("%s: ran out of time budget\n%s", name, session.report())
+            return
 
         # Keep session alive to observe actions
         time.sleep(10)
     finally:
         driver.quit()
-        logging.info(f"{name}: Session closed.")
+        if browser is None:
+            admission.release()
+        logging.info("%s: Session closed.", name)
 
 # -------------------- Main Entry --------------------
 def main() -> None:
-    accounts = [
+    setup_logging()
+    parser = argparse.ArgumentParser(description="Simultaneous multi-account login scenario")
+    parser.add_argument("--actor", action="append", dest="actors",
+                        help="Run only this actor here (repeatable); others run in other processes "
+                             "sharing COORDINATOR_URL")
+    parser.add_argument("--run-id", default=os.getenv("MULTI_LOGIN_RUN_ID"),
+                        help="Coordination namespace shared by every process of one run (MULTI_LOGIN_RUN_ID); "
+                             "required with --actor")
+    parser.add_argument("--contexts", action="store_true", default=SHARED_BROWSER,
+                        help="Run the actors as isolated browser contexts of one Chrome (MULTI_LOGIN_CONTEXTS=1)")
+    args = parser.parse_args()
+
+    all_accounts = [
         ("Account-1", ACCOUNT1_EMAIL, ACCOUNT1_PASSWORD),
         ("Account-2", ACCOUNT2_EMAIL, ACCOUNT2_PASSWORD),
         ("Account-3", ACCOUNT3_EMAIL, ACCOUNT3_PASSWORD),
     ]
+    accounts = [account for account in all_accounts if not args.actors or account[0] in args.actors]
 
-    # Remove accounts with missing emails/passwords
-    accounts = [(name, email, pwd) for name, email, pwd in accounts if email and pwd]
+    # Every actor run here needs an email and password
+    missing = [name for name, email, pwd in accounts if not (email and pwd)]
 
-    if len(accounts) < 3:
+    if missing or not accounts:
         logging.error("Please ensure all three account credentials are set in .env (USERNAME_FR, USERNAME_OSM, USERNAME_3 and corresponding PASSWORD/PASSWORD3).")
         return
 
-    click_barrier = threading.Barrier(len(accounts))
-
-    with ThreadPoolExecutor(max_workers=len(accounts)) as executor:
-        for name, email, pwd in accounts:
-            executor.submit(run_session, name, email, pwd, click_barrier, headless=False)
+    # Actors run elsewhere can only meet these through a coordination server, under the same run id
+    distributed = len(accounts) < len(all_accounts)
+    if distributed and not os.getenv("COORDINATOR_URL"):
+        logging.error("--actor runs only part of the scenario: set COORDINATOR_URL to the coordination server "
+                      "the other actors use.")
+        return
+    if distributed and not args.run_id:
+        logging.error("--actor needs --run-id (or MULTI_LOGIN_RUN_ID), the same for every process of the run.")
+        return
+    run_id = args.run_id or uuid.uuid4().hex[:12]
+    coordinator = connect().scoped(f"run-{run_id}")
+    logging.info("Coordination run id: %s", run_id)
+    # Every actor of the scenario meets at the barrier, wherever it runs
+    click_barrier = coordinator.barrier(LOGIN_BARRIER, len(all_accounts))
+
+    seeder = None
+    browser = None
+    try:
+        if SEED_FIXTURES:
+            # Created first so that cleanup() in finally removes whatever was seeded before a failure
+            seeder = FixtureSeeder(ApiClient.from_env())
+            mission_name = seeder.mission()["title"]
+            coordinator.put(MISSION_NAME_KEY, mission_name)
+            coordinator.event(MISSION_SELECTED_EVENT).set()
+            logging.info("Seeded mission '%s' through the API.", mission_name)
+        if args.contexts:
+            browser = start_shared_browser(headless=False)
+
+        with ThreadPoolExecutor(max_workers=len(accounts)) as executor:
+            for name, email, pwd in accounts:
+                executor.submit(run_session, name, email, pwd, click_barrier, headless=False, coordinator=coordinator,
+                                browser=browser)
+    finally:
+        if browser:
+            browser.close()
+            get_admission_controller().release()
+        if seeder:
+            seeder.cleanup()
+        if not distributed:
+            # Nobody else uses this run's names; don't leave them on a shared server
+            coordinator.reset()
+        waits = get_admission_controller().stats()
+        logging.info("Admission queue wait: %d sessions, mean %.1fs, p95 %.1fs, max %.1fs",
+                     waits["count"], waits["mean"], waits["p95"], waits["max"])
 
 # -------------------- Run --------------------
 if __name__ == "__main__":
@@ -1,10 +1,12 @@
 import os
 import sys
 import datetime
-import google.generativeai as genai
 from dotenv import load_dotenv
 import re
 
+from llm_client import get_llm_client
+from prompt_compaction import DEFAULT_MAX_TOKENS, compact
+
 # Load environment variables
 load_dotenv()
 
@@ -14,13 +16,9 @@ class TerminalReportGenerator:
     """Terminal-based test report generator using Gemini AI."""
     
     def __init__(self):
-        self.api_key = os.getenv("GEMINI_API_KEY")
-        if not self.api_key:
-            raise ValueError("GEMINI_API_KEY environment variable is not set")
-        
-        # Configure Gemini
-        genai.configure(api_key=self.api_key)
-        self.model = genai.GenerativeModel("models/gemini-1.5-flash")
+        # Shared, rate-limited client (raises ValueError when GEMINI_API_KEY is missing)
+        self.client = get_llm_client()
+        self.max_prompt_tokens = DEFAULT_MAX_TOKENS
     
     def get_test_results_input(self):
         """Get test results from command line arguments or stdin."""
@@ -41,18 +39,21 @@ class TerminalReportGenerator:
         try:
             timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-            # Parse test results to map terminal output lines to their corresponding test files
+            # The raw lines go in once, compacted; the per-file view only adds an index
             file_steps_map = self.parse_test_results(test_results)
-            parsed_steps_md = self._format_parsed_steps_md(file_steps_map)
-            
+            files_md = self._format_file_index(file_steps_map)
+            compacted, stats = compact(test_results, max_tokens=self.max_prompt_tokens)
+            print(f"🗜️ Compacted test output: {stats['lines_before']} → {stats['lines_after']} lines, "
+                  f"~{stats['tokens_before']} → ~{stats['tokens_after']} tokens")
+
             prompt = f"""
 You are a professional QA engineer. Generate a comprehensive test report in Markdown format based on the following test results.
 
-Test Results:
-{test_results}
+Test Results (timestamps stripped; "[×N]" marks N near-identical lines collapsed into one):
+{compacted}
 
-Parsed Test Steps by File:
-{parsed_steps_md}
+Test Files Referenced:
+{files_md}
 
 Requirements for the report:
 1. Use proper Markdown formatting
@@ -74,8 +75,9 @@ Generate timestamp: {timestamp}
 """
             
             print("🤖 Generating report with Gemini AI...")
-            response = self.model.generate_content(prompt)
-            return response.text
+            report = self.client.generate(prompt)
+            print(f"📈 {self.client.summary()}")
+            return report
             
         except Exception as e:
             print(f"❌ Error generating report with Gemini: {e}")
@@ -104,17 +106,10 @@ Generate timestamp: {timestamp}
             file_steps.setdefault(file_key, []).append(line)
         return file_steps
 
-    def _format_parsed_steps_md(self, file_steps_map: dict):
-        """Convert parsed steps into a Markdown-friendly string."""
-        md_lines: list[str] = []
-        for file, steps in file_steps_map.items():
-            md_lines.append(f"### {file}")
-            for s_idx, step_line in enumerate(steps, 1):
-                md_lines.append(f"{s_idx}. {step_line}")
-            md_lines.append("")  # blank line for spacing
-        if not md_lines:
-            md_lines.append("*(No test steps detected)*")
-        return "\n".join(md_lines)
+    def _format_file_index(self, file_steps_map: dict):
+        """List the files the output refers to, with line counts (the lines themselves are already in the prompt)."""
+        md_lines = [f"- {file}: {len(steps)} lines" for file, steps in file_steps_map.items() if file != "unknown"]
+        return "\n".join(md_lines) or "*(No test files detected)*"
     
     def generate_fallback_report(self, test_results, error_msg):
         """Generate a basic fallback report if AI generation fails."""
@@ -0,0 +1,16 @@
+import pytest
+
+import timeouts
+from timeouts import TimeoutAdvisor
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cwd(tmp_path, monkeypatch):
+    # Run logs, failure artifacts and override files land in a scratch directory
+    monkeypatch.chdir(tmp_path)
+
+
+@pytest.fixture(autouse=True)
+def _coded_timeouts(monkeypatch):
+    # Flows wait for their coded timeouts, whatever run logs or overrides this machine has
+    monkeypatch.setattr(timeouts, "_advisor", TimeoutAdvisor(enabled=False))
@@ -0,0 +1,126 @@
+import pytest
+
+import add_mission
+from fake_driver import fake_session
+
+BASE = "https://preprod.kwiks.io"
+DASHBOARD = BASE + "/dashboard"
+NEW_MISSION = BASE + "/missions/new"
+
+LOGIN_HTML = """<html><body><form action="/dashboard">
+  <input id="email" type="email"><input id="password" type="password">
+  <button type="submit">Login</button>
+</form></body></html>"""
+
+BUSINESS_HTML = """<html><body>
+  <div class="field"><p>Business Line</p>
+    <div><input role="combobox" data-options="Information Technology &amp; Software|Finance"></div></div>
+  <div class="field"><p>Skills</p><div><input role="combobox" data-options="IT|HR"></div></div>
+  <div class="field"><p>Education Level</p>
+    <div><input role="combobox" data-options="Bachelor's Degree (e.g., BA, BSc, BEng)|Master"></div></div>
+  <div class="field"><input placeholder="Salary"></div>
+  <div class="field"><p>Contract</p><div><input role="combobox" data-options="Fixed-Term Contract|Permanent"></div></div>
+  <button><svg></svg>Add</button>
+  <button id="next">Next Step</button>
+</body></html>"""
+
+PUBLISH_HTML = "<html><body><h2>Review</h2><button id='publish'>Publish</button></body></html>"
+
+
+@pytest.fixture(autouse=True)
+def account(monkeypatch):
+    monkeypatch.setattr(add_mission, "USERNAME_Clt", "client@example.test")
+    monkeypatch.setattr(add_mission, "PASSWORD", "secret")
+
+
+def submitted(driver):
+    """Capture the form's field values on submit, then go to the dashboard."""
+    fields = {}
+
+    def handler(d, form):
+        fields.update((el.get_attribute("id") or el.get_attribute("placeholder"), el.get_attribute("value"))
+                      for el in form.find_elements("tag name", "input"))
+        d.get("/dashboard")
+    driver.on_submit("form", handler)
+    return fields
+
+
+def test_login_submits_credentials():
+    with fake_session({add_mission.LOGIN_URL: LOGIN_HTML, DASHBOARD: "<h1>Dashboard</h1>"}) as driver:
+        fields = submitted(driver)
+        assert add_mission.login(driver)
+        assert driver.current_url == DASHBOARD
+    assert fields == {"email": "client@example.test", "password": "secret"}
+
+
+def test_login_falls_back_to_placeholder_selectors():
+    html = """<html><body><form>
+      <input placeholder="Email address"><input placeholder="Password" type="text">
+      <button>Sign In</button></form></body></html>"""
+    with fake_session({add_mission.LOGIN_URL: html, DASHBOARD: "<h1>Dashboard</h1>"}) as driver:
+        fields = submitted(driver)
+        assert add_mission.login(driver)
+    assert fields == {"Email address": "client@example.test", "Password": "secret"}
+
+
+def test_login_fails_without_email_field():
+    with fake_session({add_mission.LOGIN_URL: "<html><body><p>Maintenance</p></body></html>"}) as driver:
+        assert add_mission.login(driver) is False
+
+
+@pytest.mark.parametrize("dashboard", [
+    # First XPath: the <p> itself
+    "<button data-href='/missions/new'><p>Add New Hiring Process</p></button>",
+    # Locator(role="*") after every XPath missed
+    "<div data-href='/missions/new'><span>Add new mission</span></div>",
+    # Last resort: "add" and "mission" anywhere in a clickable's text
+    "<a href='/missions/new'>Mission: add one</a>",
+])
+def test_click_add_new_mission(dashboard):
+    pages = {DASHBOARD: f"<html><body><h1>Dashboard</h1>{dashboard}</body></html>", NEW_MISSION: "<h2>New</h2>"}
+    with fake_session(pages, DASHBOARD) as driver:
+        assert add_mission.click_add_new_mission(driver, timeout=2)
+        assert driver.current_url == NEW_MISSION
+
+
+def test_click_add_new_mission_text_search_takes_the_first_on_the_page():
+    dashboard = ("<a href='/missions/new'>Mission: add a new one</a>"
+                 "<a href='/missions/archived'>Mission: add</a>")
+    pages = {DASHBOARD: f"<html><body>{dashboard}</body></html>", NEW_MISSION: "<h2>New</h2>"}
+    with fake_session(pages, DASHBOARD) as driver:
+        assert add_mission.click_add_new_mission(driver, timeout=2)
+        assert driver.current_url == NEW_MISSION
+
+
+def test_click_add_new_mission_survives_overlay():
+    pages = {DASHBOARD: "<button data-intercept data-href='/missions/new'><p>Add New Hiring Process</p></button>",
+             NEW_MISSION: "<h2>New</h2>"}
+    with fake_session(pages, DASHBOARD) as driver:
+        assert add_mission.click_add_new_mission(driver, timeout=2)
+        assert driver.current_url == NEW_MISSION
+
+
+def test_click_add_new_mission_reports_missing_button():
+    with fake_session({DASHBOARD: "<h1>Dashboard</h1><button>Settings</button>"}, DASHBOARD) as driver:
+        assert add_mission.click_add_new_mission(driver, timeout=2) is False
+
+
+def test_set_business_details_fills_salary_before_contract():
+    with fake_session({NEW_MISSION: BUSINESS_HTML, BASE + "/publish": PUBLISH_HTML}, NEW_MISSION) as driver:
+        driver.on_click("#next", lambda d, el: d.get("/publish"))
+        published = []
+        driver.on_click("#publish", lambda d, el: published.append(True))
+        salary = driver.find_element("css selector", "input[placeholder='Salary']").node
+        assert add_mission.set_business_details(driver, timeout=2)
+        assert salary.value == "10000 dh"
+        assert published == [True]
+    clicked = [node.text_content().strip() or node.attrs.get("placeholder") for node in driver.clicks]
+    assert clicked.index("Salary") < clicked.index("Fixed-Term Contract")
+    assert clicked.index("Bachelor's Degree (e.g., BA, BSc, BEng)") < clicked.index("Salary")
+
+
+def test_set_business_details_stops_on_missing_option():
+    html = BUSINESS_HTML.replace("IT|HR", "HR|Sales")
+    with fake_session({NEW_MISSION: html}, NEW_MISSION) as driver:
+        assert add_mission.set_business_details(driver, timeout=2) is False
+        assert driver.find_element("css selector", "input[placeholder='Salary']").get_attribute("value") == ""
@@ -0,0 +1,73 @@
+import pytest
+
+from add_qualified_talent import find_salary_fields, next_step
+from fake_driver import fake_session
+from wizard import Wizard
+
+BASE = "https://preprod.kwiks.io/talents/new"
+
+
+def attrs(element):
+    return element and (element.get_attribute("id") or element.get_attribute("placeholder"))
+
+
+@pytest.mark.parametrize("html, expected", [
+    ('<input placeholder="Current salary"><input placeholder="Desired salary">',
+     ("Current salary", "Desired salary")),
+    ('<input id="current_salary"><input id="desired_salary">', ("current_salary", "desired_salary")),
+    ('<div><label>Current</label><input id="a"><label>Desired</label><div><input id="b"></div></div>', ("a", "b")),
+    ('<label>Current</label><input id="a">', ("a", None)),
+    ('<p>No salary on this step</p>', (None, None)),
+])
+def test_find_salary_fields(html, expected):
+    with fake_session({BASE: f"<html><body>{html}</body></html>"}, BASE) as driver:
+        current, desired = find_salary_fields(driver)
+        assert (attrs(current), attrs(desired)) == expected
+
+
+def step_page(number):
+    return (f"<html><body><h2>Step {number}</h2><label>Field {number}</label><input name='f{number}'>"
+            f"<button>Next Step</button></body></html>")
+
+
+def stepper(pages, delay=0.5, stuck_at=None):
+    """Next Step loads the following page after `delay` (virtual) seconds, except on page `stuck_at`."""
+    driver_pages = {f"{BASE}?step={number}": step_page(number) for number in range(1, pages + 1)}
+
+    def advance(driver, element):
+        number = int(driver.current_url.rsplit("=", 1)[1])
+        if number != stuck_at:
+            driver.later(delay, lambda d: d.get(f"{BASE}?step={number + 1}"))
+    return driver_pages, advance
+
+
+def test_talent_step_loop_walks_every_page():
+    pages, advance = stepper(7)
+    with fake_session(pages, f"{BASE}?step=1") as driver:
+        driver.on_click("button", advance)
+        result = Wizard("talent_steps", [next_step(f"next_step_{number}") for number in range(1, 6)]).run(driver)
+        assert result.ok, result.summary()
+        assert driver.current_url == f"{BASE}?step=6"
+    assert [step.name for step in result.steps] == [f"next_step_{number}" for number in range(1, 6)]
+    assert all(step.duration < 5 for step in result.steps)
+
+
+def test_talent_step_loop_stops_where_the_page_does_not_advance():
+    pages, advance = stepper(7, stuck_at=3)
+    with fake_session(pages, f"{BASE}?step=1") as driver:
+        driver.on_click("button", advance)
+        result = Wizard("talent_steps", [next_step(f"next_step_{number}") for number in range(1, 6)]).run(driver)
+    assert not result.ok
+    assert [step.name for step in result.steps] == ["next_step_1", "next_step_2", "next_step_3"]
+    assert result.failed.name == "next_step_3"
+    assert result.failed.reason.endswith("page did not advance")
+
+
+def test_talent_step_loop_clicks_through_an_overlay():
+    pages, advance = stepper(3)
+    pages = {url: html.replace("<button>", "<button data-intercept>") for url, html in pages.items()}
+    with fake_session(pages, f"{BASE}?step=1") as driver:
+        driver.on_click("button", advance)
+        result = Wizard("talent_steps", [next_step("next_step_1"), next_step("next_step_2")]).run(driver)
+    # safe_click falls back to ActionChains, which the overlay does not block
+    assert result.ok, result.summary()
@@ -0,0 +1,75 @@
+import pytest
+from urllib3.exceptions import MaxRetryError
+
+from api_fixtures import ApiClient, ApiError, FixtureSeeder
+from stub_api_server import start_stub_server
+
+
+@pytest.fixture
+def stub():
+    server, url = start_stub_server()
+    yield server, url
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(stub):
+    _, url = stub
+    client = ApiClient(url)
+    client.login("client@example.test", "secret")
+    yield client
+    client.close()
+
+
+def test_login_rejects_missing_password(stub):
+    with pytest.raises(ValueError):
+        ApiClient(stub[1]).login("client@example.test", "")
+
+
+def test_unauthorized_create_raises(stub):
+    with pytest.raises(ApiError) as error:
+        ApiClient(stub[1]).create("missions", {"title": "x"})
+    assert error.value.status == 401
+
+
+def test_seed_and_cleanup(stub, client):
+    server, _ = stub
+    with FixtureSeeder(client) as seed:
+        mission = seed.mission(title="QA Mission")
+        talent = seed.talent()
+        application = seed.application(mission, talent)
+        assert mission["title"] == "QA Mission"
+        assert application["missionId"] == mission["id"] and application["talentId"] == talent["id"]
+        assert {kind: len(store) for kind, store in server.store.items()} == {
+            "missions": 1, "talents": 1, "applications": 1}
+    assert all(not store for store in server.store.values())
+
+
+def test_cleanup_removes_everything_created(stub, client):
+    server, _ = stub
+    seed = FixtureSeeder(client)
+    for _ in range(3):
+        seed.mission()
+    assert seed.cleanup() == 3
+    assert not server.store["missions"]
+    assert seed.cleanup() == 0
+
+
+def test_create_retried_after_502_is_not_duplicated(stub, client):
+    server, _ = stub
+    server.fail_after_commit = 1
+    with FixtureSeeder(client) as seed:
+        mission = seed.mission()
+        assert list(server.store["missions"]) == [mission["id"]]
+        assert seed.created["missions"] == [mission["id"]]
+    assert not server.store["missions"]
+
+
+def test_create_gives_up_after_retries(stub, client):
+    server, _ = stub
+    server.fail_after_commit = 10
+    with pytest.raises(MaxRetryError):
+        client.create("missions", {"title": "x"})
+    # Every attempt carried the same key, so the backend holds one mission
+    assert len(server.store["missions"]) == 1
@@ -0,0 +1,119 @@
+import threading
+import time
+
+import pytest
+
+from coordination import CoordinationClient, InProcessCoordinator, start_server
+
+
+@pytest.fixture(params=["in_process", "socket"])
+def coordinator(request):
+    if request.param == "in_process":
+        yield InProcessCoordinator()
+        return
+    server = start_server(port=0)
+    client = CoordinationClient(server.url)
+    yield client
+    client.close()
+    server.shutdown()
+    server.server_close()
+
+
+def run_in_threads(target, count):
+    results = [None] * count
+
+    def call(index):
+        results[index] = target()
+
+    threads = [threading.Thread(target=call, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    return results
+
+
+def test_barrier_releases_all_parties(coordinator):
+    barrier = coordinator.barrier("login", 3)
+    results = run_in_threads(lambda: barrier.wait(timeout=5), 3)
+    assert sorted(results) == [0, 1, 2]
+
+
+def test_barrier_times_out_when_a_party_is_missing(coordinator):
+    barrier = coordinator.barrier("login", 3)
+    started = time.monotonic()
+    with pytest.raises(threading.BrokenBarrierError):
+        barrier.wait(timeout=0.2)
+    assert time.monotonic() - started < 3
+
+
+def test_barrier_rejects_other_party_count(coordinator):
+    def wait():
+        with pytest.raises(threading.BrokenBarrierError):
+            coordinator.barrier("login", 2).wait(timeout=1)
+
+    waiter = threading.Thread(target=wait)
+    waiter.start()
+    time.sleep(0.2)
+    # Socket clients see the server's ValueError as a RuntimeError
+    with pytest.raises((ValueError, RuntimeError), match="has 2 parties"):
+        coordinator.barrier("login", 3).wait(timeout=0.1)
+    waiter.join()
+
+
+def test_event_wait(coordinator):
+    event = coordinator.event("mission-selected")
+    assert not event.is_set()
+    assert event.wait(timeout=0.1) is False
+    threading.Timer(0.1, event.set).start()
+    assert event.wait(timeout=5) is True
+    assert coordinator.event("mission-selected").is_set()
+
+
+def test_put_and_get(coordinator):
+    assert coordinator.get("mission-name", timeout=0.1, default="none") == "none"
+    threading.Timer(0.1, coordinator.put, args=("mission-name", "QA Mission")).start()
+    assert coordinator.get("mission-name", timeout=5) == "QA Mission"
+    coordinator.put("counts", {"talents": 2})
+    assert coordinator.get("counts") == {"talents": 2}
+
+
+def test_scoped_runs_do_not_see_each_other(coordinator):
+    first, second = coordinator.scoped("run-1"), coordinator.scoped("run-2")
+    first.event("mission-selected").set()
+    first.put("mission-name", "Old Mission")
+    assert not second.event("mission-selected").is_set()
+    assert second.get("mission-name", timeout=0.1) is None
+    assert coordinator.get("run-1/mission-name") == "Old Mission"
+
+
+def test_reset_drops_only_the_run(coordinator):
+    first, second = coordinator.scoped("run-1"), coordinator.scoped("run-2")
+    first.event("mission-selected").set()
+    first.put("mission-name", "Old Mission")
+    second.put("mission-name", "New Mission")
+    assert first.reset() == 2
+    assert not first.event("mission-selected").is_set()
+    assert first.get("mission-name", timeout=0.1) is None
+    assert second.get("mission-name") == "New Mission"
+
+
+def test_reset_releases_barrier_waiters(coordinator):
+    scoped = coordinator.scoped("run-1")
+    outcome = []
+
+    def wait():
+        try:
+            scoped.barrier("login", 2).wait(timeout=5)
+        except threading.BrokenBarrierError:
+            outcome.append("broken")
+
+    waiter = threading.Thread(target=wait)
+    waiter.start()
+    time.sleep(0.2)
+    started = time.monotonic()
+    # Client connections are per thread, so the reset does not queue behind the wait
+    scoped.reset()
+    waiter.join(5)
+    assert outcome == ["broken"]
+    assert time.monotonic() - started < 3
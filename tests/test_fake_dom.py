@@ -0,0 +1,39 @@
+import pytest
+
+from fake_dom import InvalidSelector, parse_html, select_css, select_xpath
+
+DOC = parse_html("""<html><body>
+  <div id="card"><p>Add New Mission</p><span class="hint">or import one</span></div>
+  <section><div><b>Skills</b></div></section>
+</body></html>""")
+
+
+def tags(nodes):
+    return [node.tag for node in nodes]
+
+
+def test_universal_selector_matches_every_element():
+    assert tags(select_css(DOC, "*")) == ["html", "body", "div", "p", "span", "section", "div", "b"]
+
+
+@pytest.mark.parametrize("selector, expected", [
+    ("div > *", ["p", "span", "b"]),
+    ("div *", ["p", "span", "b"]),
+    ("#card > *", ["p", "span"]),
+    ("* > b", ["b"]),
+    ("section *", ["div", "b"]),
+    ("*.hint", ["span"]),
+    ("p, *[class='hint']", ["p", "span"]),
+])
+def test_universal_selector_in_compounds(selector, expected):
+    assert tags(select_css(DOC, selector)) == expected
+
+
+def test_empty_selector_is_still_invalid():
+    with pytest.raises(InvalidSelector):
+        select_css(DOC, "p, ")
+
+
+def test_xpath_text_predicates():
+    assert tags(select_xpath(DOC, "//p[contains(text(), 'Add New')]")) == ["p"]
+    assert tags(select_xpath(DOC, "//b[normalize-space()='Skills']/ancestor::section[1]")) == ["section"]
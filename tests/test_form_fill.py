@@ -0,0 +1,93 @@
+import time
+
+from budget import Budget
+from fake_driver import fake_session
+from form_fill import fill_selects
+
+URL = "https://preprod.kwiks.io/missions/new"
+
+
+def field(label, options=None):
+    control = (f'<div class="control"><input role="combobox" data-options="{options}"></div>'
+               if options else '<div class="control"></div>')
+    return f'<div class="field"><p>{label}</p>{control}</div>'
+
+
+def page(*fields):
+    return f"<html><body><form>{''.join(fields)}</form></body></html>"
+
+
+def shown(driver):
+    return [el.text for el in driver.find_elements("css selector", ".field")]
+
+
+def test_fills_each_label_own_combobox():
+    html = page(field("Country", "Morocco|France"), field("City", "Casablanca|Rabat"))
+    with fake_session({URL: html}, URL) as driver:
+        results = fill_selects(driver, {"City": "Rabat", "Country": "Morocco"})
+        assert results == {"City": True, "Country": True}
+        assert shown(driver) == ["Country Morocco", "City Rabat"]
+
+
+def test_does_not_fill_the_next_fields_combobox():
+    # Country's combobox is not rendered (yet): City's must stay untouched
+    html = page(field("Country"), field("City", "Casablanca|Rabat|Morocco"))
+    with fake_session({URL: html}, URL) as driver:
+        results = fill_selects(driver, {"Country": "Morocco"})
+        assert results == {"Country": False}
+        assert shown(driver) == ["Country", "City"]
+
+
+def test_label_without_field_wrapper():
+    html = page('<label>Skills</label><div class="control"><input role="combobox" data-options="IT|HR"></div>')
+    with fake_session({URL: html}, URL) as driver:
+        assert fill_selects(driver, {"Skills": "IT"}) == {"Skills": True}
+
+
+def test_waits_for_a_step_that_renders_late():
+    with fake_session({URL: page()}, URL) as driver:
+        driver.later(3, lambda d: d.append_html("form", field("Skills", "IT|HR")))
+        assert fill_selects(driver, {"Skills": "IT"}) == {"Skills": True}
+
+
+def test_waits_for_a_field_rendered_by_an_earlier_one():
+    with fake_session({URL: page(field("Country", "Morocco|France"))}, URL) as driver:
+        driver.on_click("[role='option']", lambda d, el: d.later(2, lambda d: d.append_html(
+            "form", field("City", "Casablanca|Rabat"))) if el.node.text_content() == "Morocco" else None)
+        results = fill_selects(driver, {"Country": "Morocco", "City": "Rabat"})
+        assert results == {"Country": True, "City": True}
+
+
+def test_waits_for_a_field_unlocked_by_an_earlier_one():
+    html = page(field("Country", "Morocco|France"), field("City", "Casablanca|Rabat").replace(
+        'role="combobox"', 'role="combobox" disabled'))
+    picked = []
+
+    def unlock(driver, option):
+        city = driver.find_elements("css selector", "input[role='combobox']")[1]
+        # The picked option is already detached: read its node
+        picked.append((option.node.text_content(), city.is_enabled()))
+        if option.node.text_content() == "Morocco":
+            driver.later(2, lambda d: city.node.attrs.pop("disabled"))
+    with fake_session({URL: html}, URL) as driver:
+        driver.on_click("[role='option']", unlock)
+        assert fill_selects(driver, {"Country": "Morocco", "City": "Rabat"}) == {"Country": True, "City": True}
+    assert picked == [("Morocco", False), ("Rabat", True)]
+
+
+def test_gives_up_on_a_missing_combobox_after_wait():
+    with fake_session({URL: page(field("Country"))}, URL) as driver:
+        started = time.monotonic()
+        assert fill_selects(driver, {"Country": "Morocco"}, wait=4) == {"Country": False}
+        assert 4 <= time.monotonic() - started < 6
+
+
+def test_option_wait_draws_on_the_step_budget():
+    with fake_session({URL: page(field("Skills", "HR"))}, URL) as driver:
+        # The option only renders after 4s, past the 2s left in the step
+        driver.later(4, lambda d: d.append_html(".control", "<div role='option'>IT</div>"))
+        started = time.monotonic()
+        with Budget("business_details", 2).enter():
+            assert fill_selects(driver, {"Skills": "IT"}) == {"Skills": False}
+        assert time.monotonic() - started <= 2
+    assert "IT" not in [node.text_content() for node in driver.clicks]
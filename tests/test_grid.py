@@ -0,0 +1,105 @@
+import threading
+
+import pytest
+
+from grid import GridScheduler, LocalBackend, NodeFailure, RemoteBackend
+from stub_grid_node import start_stub_node
+
+
+@pytest.fixture
+def nodes():
+    servers = [start_stub_node(slots=2), start_stub_node(slots=1)]
+    yield servers
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def kill(server):
+    server.shutdown()
+    server.server_close()
+
+
+def test_schedules_flows_across_nodes(nodes):
+    backend = RemoteBackend([server.url for server in nodes])
+    scheduler = GridScheduler(backend, profile="lean")
+    try:
+        futures = [scheduler.submit(lambda driver, index: (index, driver.grid_node.url), index) for index in range(6)]
+        results = [future.result(timeout=30) for future in futures]
+    finally:
+        scheduler.shutdown()
+    assert [index for index, _ in results] == list(range(6))
+    assert {url for _, url in results} <= {server.url for server in nodes}
+    # Every session was deleted again and its slot handed back
+    assert all(slot is None for server in nodes for slot in server.slots)
+    assert all(node.in_flight == 0 for node in backend.pool.nodes)
+
+
+def test_requeues_flow_when_its_node_dies(nodes):
+    backend = RemoteBackend([server.url for server in nodes])
+    scheduler = GridScheduler(backend, workers=1)
+    servers = {server.url: server for server in nodes}
+    attempts = []
+
+    def flow(driver):
+        attempts.append(driver.grid_node.url)
+        if len(attempts) == 1:
+            kill(servers[driver.grid_node.url])
+            raise NodeFailure("node went away")
+        return driver.grid_node.url
+
+    try:
+        url = scheduler.submit(flow).result(timeout=30)
+    finally:
+        scheduler.shutdown()
+    assert len(attempts) == 2
+    assert url != attempts[0]
+    dead = next(node for node in backend.pool.nodes if node.url == attempts[0])
+    assert not dead.alive
+
+
+def test_gives_up_after_max_attempts(nodes):
+    scheduler = GridScheduler(RemoteBackend([server.url for server in nodes]), workers=1, max_attempts=2)
+    calls = []
+
+    def flow(driver):
+        calls.append(driver.grid_node.url)
+        raise NodeFailure("node went away")
+
+    try:
+        with pytest.raises(NodeFailure):
+            scheduler.submit(flow).result(timeout=30)
+    finally:
+        scheduler.shutdown()
+    assert len(calls) == 2
+
+
+class FakeLocalDriver:
+    def __init__(self):
+        self.closed = False
+
+    def quit(self):
+        self.closed = True
+
+
+class FakeLocalBackend(LocalBackend):
+    def __init__(self):
+        self.drivers = []
+        self.lock = threading.Lock()
+
+    def create_driver(self, profile, headless=False, capture_network=False):
+        driver = FakeLocalDriver()
+        with self.lock:
+            self.drivers.append(driver)
+        return driver
+
+
+def test_runs_flows_on_local_backend():
+    backend = FakeLocalBackend()
+    scheduler = GridScheduler(backend, workers=2)
+    try:
+        results = [scheduler.submit(lambda driver, index: index * 2, index).result(timeout=10) for index in range(3)]
+    finally:
+        scheduler.shutdown()
+    assert results == [0, 2, 4]
+    assert len(backend.drivers) == 3 and all(driver.closed for driver in backend.drivers)
@@ -0,0 +1,21 @@
+from fake_driver import FakeDriver
+from locators import Locator, find, find_all
+
+URL = "https://preprod.kwiks.io/dashboard"
+
+# Four hidden copies of the menu button (mobile, collapsed, ...) before the visible one
+MENU = "".join(f"<div style='display:none'><button class='menu' data-testid='menu' id='copy-{n}'>Menu</button></div>"
+               for n in range(4)) + "<button class='menu' data-testid='menu' id='menu'>Menu</button>"
+
+
+def test_css_locator_finds_a_visible_match_after_hidden_duplicates():
+    driver = FakeDriver({URL: f"<html><body>{MENU}</body></html>"}, URL)
+    assert find(driver, Locator(css="button.menu")).get_attribute("id") == "menu"
+    assert find(driver, Locator(testid="menu")).get_attribute("id") == "menu"
+
+
+def test_css_locator_stops_at_limit_visible_matches():
+    buttons = "".join(f"<button class='menu' id='b{n}'>Menu</button>" for n in range(5))
+    driver = FakeDriver({URL: f"<html><body>{MENU}{buttons}</body></html>"}, URL)
+    assert [el.get_attribute("id") for el in find_all(driver, Locator(css="button.menu"), limit=3)] == [
+        "menu", "b0", "b1"]
@@ -0,0 +1,66 @@
+import logging
+import os
+import subprocess
+import sys
+
+import pytest
+
+import log_setup
+from log_setup import RateLimitFilter, setup_logging, stop_logging
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class Capture(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+@pytest.fixture
+def root_logger():
+    """setup_logging() replaces the root handlers: give pytest's back afterwards."""
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield root
+    stop_logging()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    for handler in handlers:
+        root.addHandler(handler)
+    root.setLevel(level)
+
+
+def test_importing_the_flows_keeps_the_importers_logging():
+    script = ("import logging; logging.basicConfig(); handlers = list(logging.getLogger().handlers)\n"
+              "import add_mission, add_qualified_talent, test_multi_login, log_setup\n"
+              "assert logging.getLogger().handlers == handlers, logging.getLogger().handlers\n"
+              "assert log_setup._listener is None")
+    subprocess.run([sys.executable, "-c", script], cwd=ROOT, check=True, timeout=60)
+
+
+def test_stop_logging_reports_the_final_burst(root_logger):
+    capture = Capture()
+    setup_logging(handlers=[capture], burst=2, period=60)
+    logger = logging.getLogger("test_log_setup")
+    for attempt in range(5):
+        logger.warning("Click intercepted (attempt %d)", attempt)
+    stop_logging()
+    assert capture.messages == [
+        "Click intercepted (attempt 0)",
+        "Click intercepted (attempt 1)",
+        "Click intercepted (attempt 4) (last of 3 suppressed similar messages)",
+    ]
+    assert log_setup._listener is None
+
+
+def test_flush_forgets_the_windows():
+    rate_limit = RateLimitFilter(burst=1, period=60)
+    records = [logging.makeLogRecord({"msg": "retry %d", "args": (n,), "levelno": logging.WARNING}) for n in range(3)]
+    assert [rate_limit.filter(record) for record in records] == [True, False, False]
+    assert [record.getMessage() for record in rate_limit.flush()] == ["retry 2 (last of 2 suppressed similar messages)"]
+    assert rate_limit.flush() == []
+    assert rate_limit.filter(records[0])
@@ -0,0 +1,27 @@
+import monitor
+from fake_driver import FakeDriver, VirtualClock
+from locators import Locator
+from wizard import Step, Wizard
+
+URL = "https://preprod.kwiks.io/dashboard"
+
+
+def stuck_probe(driver, fresh):
+    # Flow budget left at its 600s default, one step allowed 300s
+    result = Wizard("stuck", [Step("never_ready", ready=Locator(css="#missing"), timeout=300)]).run(driver)
+    return result.ok, {step.name: step.duration for step in result.steps}
+
+
+def test_run_budget_caps_the_wizard(monkeypatch):
+    monkeypatch.setitem(monitor.FLOWS, "stuck", (lambda: FakeDriver({URL: "<p>Dashboard</p>"}, URL), stuck_probe, None))
+    metrics = monitor.MonitorMetrics()
+    with VirtualClock():
+        probe = monitor.SyntheticMonitor("stuck", metrics=metrics, budget=20)
+        try:
+            assert probe.run_once() is False
+        finally:
+            probe.close()
+    run = metrics.recent[-1]
+    assert run["duration"] <= 21
+    assert run["steps"]["never_ready"] <= 21
+    assert run["error"] == "run budget (20s) exhausted"
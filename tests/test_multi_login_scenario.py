@@ -0,0 +1,98 @@
+import sys
+
+import pytest
+
+import test_multi_login
+
+
+class RecordingSeeder:
+    instances = []
+
+    def __init__(self, client, mission=None):
+        self.cleaned = False
+        self._mission = mission if mission is not None else {"title": "autotest-mission"}
+        RecordingSeeder.instances.append(self)
+
+    def mission(self):
+        return self._mission
+
+    def cleanup(self):
+        self.cleaned = True
+
+
+@pytest.fixture
+def scenario(monkeypatch):
+    """main() with credentials and seeding on, no browsers: run_session only records its actor."""
+    RecordingSeeder.instances = []
+    for number in (1, 2, 3):
+        monkeypatch.setattr(test_multi_login, f"ACCOUNT{number}_EMAIL", f"user{number}@example.test")
+        monkeypatch.setattr(test_multi_login, f"ACCOUNT{number}_PASSWORD", "secret")
+    monkeypatch.setattr(test_multi_login, "SEED_FIXTURES", True)
+    monkeypatch.setattr(test_multi_login.ApiClient, "from_env", classmethod(lambda cls: None))
+    monkeypatch.setattr(test_multi_login, "FixtureSeeder", RecordingSeeder)
+    monkeypatch.delenv("COORDINATOR_URL", raising=False)
+    actors = []
+    monkeypatch.setattr(test_multi_login, "run_session", lambda name, *args, **kwargs: actors.append(name))
+    monkeypatch.setattr(sys, "argv", ["test_multi_login.py"])
+    return actors
+
+
+def test_seeded_fixtures_are_cleaned_up(scenario):
+    test_multi_login.main()
+    assert sorted(scenario) == ["Account-1", "Account-2", "Account-3"]
+    assert [seeder.cleaned for seeder in RecordingSeeder.instances] == [True]
+
+
+def test_seeded_fixtures_are_cleaned_up_when_publishing_them_fails(scenario, monkeypatch):
+    # The seeded mission comes back without a title: main() fails right after seeding
+    monkeypatch.setattr(test_multi_login, "FixtureSeeder", lambda client: RecordingSeeder(client, mission={"id": 7}))
+    with pytest.raises(KeyError):
+        test_multi_login.main()
+    assert scenario == []
+    assert [seeder.cleaned for seeder in RecordingSeeder.instances] == [True]
+
+
+class RecordingAdmission:
+    def __init__(self):
+        self.active = 0
+
+    def acquire(self, name="session", timeout=None):
+        self.active += 1
+        return 0.0
+
+    def release(self):
+        self.active -= 1
+
+    def stats(self):
+        return {"count": 0, "mean": 0.0, "p95": 0.0, "max": 0.0}
+
+
+class FailingDriver:
+    quit_calls = 0
+
+    def quit(self):
+        FailingDriver.quit_calls += 1
+
+
+@pytest.mark.parametrize("failure", ["driver", "contexts"])
+def test_shared_browser_failure_after_admission_cleans_up(scenario, monkeypatch, failure):
+    admission = RecordingAdmission()
+    monkeypatch.setattr(test_multi_login, "get_admission_controller", lambda: admission)
+    monkeypatch.setattr(sys, "argv", ["test_multi_login.py", "--contexts"])
+    FailingDriver.quit_calls = 0
+
+    def start_driver(headless=False):
+        if failure == "driver":
+            raise RuntimeError("chromedriver did not start")
+        return FailingDriver()
+
+    def shared_browser(driver, profile=None):
+        raise RuntimeError("CDP connection lost")
+    monkeypatch.setattr(test_multi_login, "start_driver", start_driver)
+    monkeypatch.setattr(test_multi_login, "SharedBrowser", shared_browser)
+    with pytest.raises(RuntimeError):
+        test_multi_login.main()
+    assert scenario == []
+    assert [seeder.cleaned for seeder in RecordingSeeder.instances] == [True]
+    assert admission.active == 0
+    assert FailingDriver.quit_calls == (1 if failure == "contexts" else 0)
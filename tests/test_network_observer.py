@@ -0,0 +1,72 @@
+import json
+
+from browser_profiles import build_options
+from fake_driver import VirtualClock
+from network_observer import NetworkObserver
+
+
+class LogDriver:
+    """Serves queued CDP events from get_log("performance"), like chromedriver."""
+
+    def __init__(self):
+        self.entries = []
+
+    def send(self, method, **params):
+        self.entries.append({"message": json.dumps({"message": {"method": method, "params": params}})})
+
+    def request(self, request_id, url, timestamp):
+        self.send("Network.requestWillBeSent", requestId=request_id, request={"url": url, "method": "GET"},
+                  type="XHR", timestamp=timestamp)
+
+    def finish(self, request_id, timestamp):
+        self.send("Network.loadingFinished", requestId=request_id, timestamp=timestamp, encodedDataLength=10)
+
+    def get_log(self, kind):
+        entries, self.entries = self.entries, []
+        return entries
+
+
+def test_capture_is_opt_in():
+    assert "goog:loggingPrefs" not in build_options("lean").to_capabilities()
+    assert build_options("lean", capture_network=True).to_capabilities()["goog:loggingPrefs"] == {"performance": "ALL"}
+
+
+def test_unfinished_requests_expire():
+    driver = LogDriver()
+    observer = NetworkObserver(driver)
+    driver.request("poll", "https://api.example.test/events", 100.0)
+    driver.request("ok", "https://api.example.test/me", 100.0)
+    driver.finish("ok", 100.5)
+    observer.poll()
+    assert list(observer._pending) == ["poll"]
+    # Another request 61s later: the long-poll is older than the 60s default finish timeout
+    driver.request("next", "https://api.example.test/next", 161.0)
+    observer.poll()
+    assert list(observer._pending) == ["next"]
+    assert [timing.request_id for timing in observer._finished] == ["ok"]
+
+
+def test_ttl_follows_the_longest_finish_timeout():
+    driver = LogDriver()
+    observer = NetworkObserver(driver)
+    driver.request("upload", "https://api.example.test/upload", 100.0)
+    driver.finish("upload", 101.0)
+    assert observer.wait_for_request("upload", finish_timeout=150, poll_interval=0).request_id == "upload"
+    driver.request("parse", "https://api.example.test/parse", 102.0)
+    driver.request("other", "https://api.example.test/other", 200.0)
+    observer.poll()
+    assert sorted(observer._pending) == ["other", "parse"]
+
+
+def test_wait_keeps_following_an_expired_request():
+    driver = LogDriver()
+    observer = NetworkObserver(driver)
+    driver.request("gen-1", "https://api.example.test/generate", 100.0)
+    driver.finish("gen-1", 101.0)
+    driver.request("gen-2", "https://api.example.test/generate", 100.0)
+    later = [lambda: driver.request("other", "https://api.example.test/other", 200.0)]
+    with VirtualClock():
+        # gen-2 expires from the table while the wait is on it: still unfinished, not a success
+        timing = observer.wait_for_request("generate", finish_timeout=30,
+                                           on_idle=lambda: later and later.pop()())
+    assert timing is None
@@ -0,0 +1,154 @@
+import os
+from urllib.parse import quote
+
+import pytest
+
+import fake_driver
+import form_fill
+import locators
+import text_index
+import wizard
+from fake_driver import FakeDriver
+
+# The repo's page scripts against the same fixtures, on FakeDriver (their
+# Python ports) and, with CHROME_TESTS=1, on headless Chrome (the real JS).
+# Elements are compared by id.
+
+URL = "https://preprod.kwiks.io/fixture"
+
+# What react-select does for the fake's `data-options` comboboxes, for Chrome
+COMBOBOX_SHIM = """
+document.addEventListener('input', event => {
+    const input = event.target;
+    if (!input.matches('input[role="combobox"][data-options]')) return;
+    input.parentElement.querySelectorAll('.menu').forEach(menu => menu.remove());
+    const typed = input.value.trim().toLowerCase();
+    if (!typed) return;
+    const menu = document.createElement('div');
+    menu.className = 'menu';
+    menu.setAttribute('role', 'listbox');
+    for (const label of input.dataset.options.split('|')) {
+        if (!label.toLowerCase().includes(typed)) continue;
+        const option = document.createElement('div');
+        option.setAttribute('role', 'option');
+        option.textContent = label;
+        option.addEventListener('click', () => {
+            menu.remove();
+            input.value = '';
+            input.parentElement.querySelectorAll('.single-value').forEach(shown => shown.remove());
+            const shown = document.createElement('div');
+            shown.className = 'single-value';
+            shown.textContent = label;
+            input.parentElement.appendChild(shown);
+        });
+        menu.appendChild(option);
+    }
+    input.parentElement.appendChild(menu);
+});
+"""
+
+FORM = """<html><body><form>
+  <div class="field"><p>Country</p><div class="control">
+    <input id="country" role="combobox" data-options="Morocco|France"></div></div>
+  <div class="field"><p>City</p><div class="control">
+    <input id="city" role="combobox" data-options="Casablanca|Rabat"></div></div>
+  <div class="field"><label>Contract</label><div class="control"></div></div>
+  <div class="field"><p>Skills</p><div class="control">
+    <input id="skills" role="combobox"><div class="single-value">IT</div></div></div>
+</form></body></html>"""
+
+MENU = """<html><body>
+  <h2>Dashboard</h2>
+  <div id="mobile" style="display:none"><button id="hidden-add">Add New Mission</button></div>
+  <nav><a id="missions" href="/missions">Missions</a> <button id="add">Add New Mission</button>
+    <div id="card" role="button"><span>Add <b>talent</b></span></div></nav>
+  <p id="note">Create a mission to start hiring</p>
+  <label>Salary</label><input name="salary" placeholder="Salary">
+  <div class="spinner">Loading</div>
+</body></html>"""
+
+
+def ids(value):
+    """Elements -> their id, recursively."""
+    if isinstance(value, list):
+        return [ids(item) for item in value]
+    if hasattr(value, "get_attribute"):
+        return value.get_attribute("id")
+    return value
+
+
+@pytest.fixture(scope="module")
+def chrome():
+    if os.getenv("CHROME_TESTS") != "1":
+        pytest.skip("set CHROME_TESTS=1 to run the page scripts in headless Chrome")
+    from browser_profiles import create_driver
+    try:
+        driver = create_driver("lean", headless=True)
+    except Exception as e:
+        pytest.skip(f"Chrome unavailable: {e}")
+    yield driver
+    driver.quit()
+
+
+@pytest.fixture(params=["fake", "chrome"])
+def load(request):
+    """load(html) -> a driver showing html."""
+    def fake(html):
+        return FakeDriver({URL: html}, URL)
+
+    def real(html):
+        driver = request.getfixturevalue("chrome")
+        driver.get("data:text/html;charset=utf-8," + quote(html))
+        driver.execute_script(COMBOBOX_SHIM)
+        return driver
+    return fake if request.param == "fake" else real
+
+
+def test_ports_match_the_scripts():
+    assert fake_driver.stale_ports() == [], "page script changed: update its port in fake_driver.py and the pin"
+
+
+def test_resolve_comboboxes(load):
+    driver = load(FORM)
+    found = driver.execute_script(form_fill.RESOLVE_JS, ["City", "Country", "Contract", "Missing"], None)
+    # Contract has no combobox of its own: Skills' (after the Skills label) is not its
+    assert ids(found) == ["city", "country", None, None]
+
+
+def test_select_and_verify(load):
+    driver = load(FORM)
+    country, city = driver.execute_script(form_fill.RESOLVE_JS, ["Country", "City"], None)
+    assert driver.execute_async_script(form_fill.SELECT_JS, country, "Morocco", True, 2000) == "selected"
+    assert driver.execute_async_script(form_fill.SELECT_JS, city, "Paris", True, 500) == "no_menu"
+    skills = driver.find_element("id", "skills")
+    assert driver.execute_script(form_fill.VERIFY_JS, [country, city, skills], ["Morocco", "Paris", "IT"]) == [
+        True, False, True]
+
+
+def test_text_index(load):
+    driver = load(MENU)
+    entries = driver.execute_script(text_index.COLLECT_JS, text_index.INTERACTIVE_CSS, None, "token-1")
+    assert entries == [["a", "Missions"], ["button", "Add New Mission"], ["div", "Add talent"],
+                       ["p", "Create a mission to start hiring"]]
+    assert ids(driver.execute_script(text_index.RESOLVE_JS, "token-1", [1, 3])) == ["add", "note"]
+    assert driver.execute_script(text_index.RESOLVE_JS, "other-token", [0]) is None
+
+
+@pytest.mark.parametrize("args, expected", [
+    # css, needle, case_sensitive, deep, exact, closest, limit
+    (("button", "add new mission", False, False, False, None, 5), ["add"]),
+    (("button", "Add new mission", True, False, False, None, 5), []),
+    (("[role='button'], button", "add talent", False, True, True, None, 5), ["card"]),
+    (("span", "add", False, False, False, "[role='button']", 5), ["card"]),
+    (("a, button", None, False, False, False, None, 1), ["missions"]),
+])
+def test_text_query(load, args, expected):
+    driver = load(MENU)
+    assert ids(driver.execute_script(locators.TEXT_QUERY_JS, None, *args)) == expected
+
+
+def test_fingerprint_and_settled(load):
+    driver = load(MENU)
+    assert driver.execute_script(wizard.FINGERPRINT_JS) == "H2:Dashboard|LABEL:Salary|INPUT:Salary"
+    assert driver.execute_script(wizard.SETTLED_JS, wizard.LOADING_CSS) is False
+    assert driver.execute_script(wizard.SETTLED_JS, "#nothing-loading") is True
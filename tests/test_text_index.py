@@ -0,0 +1,27 @@
+from fake_driver import FakeDriver
+from text_index import TextIndex, find_by_text
+
+URL = "https://preprod.kwiks.io/dashboard"
+
+
+def index(*entries):
+    return TextIndex(None, [("button", text) for text in entries], "token")
+
+
+def test_equal_hits_keep_document_order():
+    hits = index("Add mission", "Missions", "Add mission", "Add mission").search("mission")
+    assert [position for _, position, _ in hits] == [1, 0, 2, 3]
+
+
+def test_tighter_match_ranks_first():
+    hits = index("Add new mission to your hiring pipeline", "Add mission").search("mission")
+    assert [position for _, position, _ in hits] == [1, 0]
+
+
+def test_find_by_text_in_document_order():
+    html = ("<html><body><a id='long' href='/missions/new'>Add a new mission</a>"
+            "<button id='short'>Add mission</button></body></html>")
+    driver = FakeDriver({URL: html}, URL)
+    assert [el.get_attribute("id") for el, _ in find_by_text(driver, "mission")] == ["short", "long"]
+    assert [el.get_attribute("id") for el, _ in find_by_text(driver, "mission", document_order=True)] == [
+        "long", "short"]
@@ -0,0 +1,96 @@
+import json
+
+import pytest
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+
+import add_mission
+import timeouts
+from fake_driver import fake_session
+from run_stats import load
+from timeouts import TimeoutAdvisor, WaitChain
+
+URL = "https://preprod.kwiks.io/login"
+PAGE = "<html><body><form><input placeholder='Email address'></form></body></html>"
+SELECTORS = [(By.ID, "email"), (By.NAME, "email"), (By.CSS_SELECTOR, "input[placeholder*='Email']")]
+
+
+@pytest.fixture
+def recorded(monkeypatch):
+    waits = []
+    monkeypatch.setattr(timeouts, "record_wait", lambda name, seconds, ok: waits.append((name, seconds, ok)))
+    return waits
+
+
+def first_present(driver, selectors):
+    with WaitChain(driver, "login.email", 8) as chain:
+        for locator in selectors:
+            try:
+                return chain.until(EC.presence_of_element_located(locator))
+            except TimeoutException:
+                continue
+    return None
+
+
+def test_wait_chain_records_the_time_to_a_late_element(recorded):
+    with fake_session({URL: "<html><body><form></form></body></html>"}, URL) as driver:
+        driver.later(5, lambda d: d.append_html("form", "<input id='email'>"))
+        assert first_present(driver, SELECTORS) is not None
+    assert len(recorded) == 1
+    name, seconds, ok = recorded[0]
+    assert (name, ok) == ("login.email", True)
+    assert 5 <= seconds < 6
+
+
+def test_wait_chain_does_not_sample_a_later_match(recorded):
+    with fake_session({URL: PAGE}, URL) as driver:
+        assert first_present(driver, SELECTORS) is not None
+    # The two expected misses cost 16s: neither a failure of the key nor a ~0s sample
+    assert recorded == []
+
+
+def test_wait_chain_does_not_sample_a_late_element_found_by_a_fallback(recorded):
+    with fake_session({URL: "<html><body><form></form></body></html>"}, URL) as driver:
+        driver.later(10, lambda d: d.append_html("form", "<input placeholder='Email address'>"))
+        assert first_present(driver, SELECTORS) is not None
+    assert recorded == []
+
+
+def test_wait_chain_records_one_failure_when_nothing_matches(recorded):
+    with fake_session({URL: PAGE}, URL) as driver:
+        assert first_present(driver, SELECTORS[:2]) is None
+    assert [(name, ok) for name, _, ok in recorded] == [("login.email", False)]
+    assert recorded[0][1] >= 16
+
+
+def test_wait_chain_uses_the_advised_timeout(recorded, monkeypatch):
+    monkeypatch.setattr(timeouts, "_advisor", TimeoutAdvisor(overrides={"wait/login.*": 2}))
+    with fake_session({URL: PAGE}, URL) as driver:
+        assert first_present(driver, SELECTORS[:2]) is None
+    assert 4 <= recorded[0][1] < 5
+
+
+def test_login_fallbacks_record_one_outcome_per_field(recorded, monkeypatch):
+    monkeypatch.setattr(add_mission, "USERNAME_Clt", "client@example.test")
+    monkeypatch.setattr(add_mission, "PASSWORD", "secret")
+    html = ("<html><body><form action='/dashboard'><input id='email'>"
+            "<input id='password'><button type='submit'>Login</button></form></body></html>")
+    with fake_session({add_mission.LOGIN_URL: html, "https://preprod.kwiks.io/dashboard": "<h1>Home</h1>"}) as driver:
+        assert add_mission.login(driver)
+    outcomes = [(name, ok) for name, _, ok in recorded if name.startswith("add_mission.login.")]
+    assert outcomes == [("add_mission.login.email", True), ("add_mission.login.password", True),
+                        ("add_mission.login.button", True), ("add_mission.login.redirect", True)]
+
+
+def test_dashboards_skip_helper_waits(tmp_path):
+    log = tmp_path / "run.jsonl"
+    events = [
+        {"kind": "timing", "message": "business_details", "flow": "add_mission", "ts": 1.0, "duration": 3.0, "ok": True},
+        {"kind": "timing", "message": "add_mission.login.email", "flow": "wait", "ts": 1.0, "duration": 8.0,
+         "ok": False},
+        {"kind": "step", "message": "Logged in", "ts": 1.0},
+    ]
+    log.write_text("".join(json.dumps(event) + "\n" for event in events), encoding="utf-8")
+    assert load([str(log)], skip_flows=("wait",)).groups == [("add_mission", "business_details")]
+    assert load([str(log)]).groups == [("add_mission", "business_details"), ("wait", "add_mission.login.email")]
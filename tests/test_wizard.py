@@ -0,0 +1,78 @@
+import budget
+from fake_driver import fake_session
+from locators import Locator
+from wizard import Step, Wizard
+
+URL = "https://preprod.kwiks.io/missions/new"
+
+STEP_HTML = """<html><body>
+  <h2>Business details</h2>
+  <label>Salary</label><input name="salary">
+  <button type="button" id="next">Next</button>
+</body></html>"""
+
+NEXT = Locator(css="#next")
+
+
+def click_ready(run):
+    run.element.click()
+
+
+def next_wizard(**step):
+    return Wizard("test_flow", [Step("next", ready=NEXT, actions=[click_ready], advances=True, timeout=10, **step)])
+
+
+def test_advances_on_url_change_alone():
+    with fake_session({URL: STEP_HTML}, URL) as driver:
+        # Client-side routing: same fields, new URL
+        driver.on_click("#next", lambda d, el: setattr(d, "_current_url", URL + "?step=2"))
+        result = next_wizard().run(driver)
+    assert result.ok, result.summary()
+
+
+def test_advances_when_next_button_gets_disabled():
+    with fake_session({URL: STEP_HTML}, URL) as driver:
+        driver.on_click("#next", lambda d, el: el.node.attrs.update(disabled=""))
+        result = next_wizard().run(driver)
+    assert result.ok, result.summary()
+
+
+def test_advances_on_new_content():
+    with fake_session({URL: STEP_HTML}, URL) as driver:
+        driver.on_click("#next", lambda d, el: d.later(1, lambda d: d.append_html("body", "<h2>Contract</h2>")))
+        result = next_wizard().run(driver)
+    assert result.ok, result.summary()
+
+
+def test_fails_when_nothing_changes():
+    with fake_session({URL: STEP_HTML}, URL) as driver:
+        driver.on_click("#next", lambda d, el: None)
+        result = next_wizard().run(driver)
+    assert not result.ok
+    assert result.failed.reason.endswith("page did not advance")
+
+
+def test_flow_budget_is_entered_around_the_steps():
+    seen = []
+
+    def record(run):
+        seen.append((budget.current().path, budget.bounded(1000)))
+
+    with fake_session({URL: STEP_HTML}, URL) as driver:
+        result = Wizard("test_flow", [Step("record", actions=[record], timeout=1000)], budget=60).run(driver)
+    assert result.ok
+    path, timeout = seen[0]
+    assert path == "test_flow/record"
+    # The step asked for 1000s but the flow only has 60
+    assert timeout <= 60
+
+
+def test_callers_budget_caps_the_flow():
+    with fake_session({URL: STEP_HTML}, URL) as driver:
+        wizard = Wizard("test_flow", [Step("missing", ready=Locator(css="#nowhere"), timeout=120)], budget=600)
+        with budget.Budget("session", 5).enter() as session:
+            result = wizard.run(driver)
+    assert not result.ok
+    assert result.steps[0].duration <= 6
+    assert "budget 'session' (5s) exhausted" in result.failed.reason
+    assert session.children == [result.budget]
@@ -0,0 +1,121 @@
+import difflib
+import re
+import uuid
+
+# -------------------- DOM Text Index --------------------
+# Text-based recovery used to call `element.text` once per candidate, i.e.
+# one WebDriver round trip per element. Here a single script collects the
+# visible text of every interactive element and keeps the elements in a
+# page-side array; matching runs in Python and only the hits are turned
+# back into WebElements.
+
+INTERACTIVE_CSS = "button, a, [role='button'], [role='link'], [role='tab'], [role='menuitem'], [role='option'], p"
+
+COLLECT_JS = """
+const [css, scope, token] = arguments;
+const root = scope || document;
+const elements = [];
+const texts = [];
+for (const el of root.querySelectorAll(css)) {
+    if (!(el.offsetWidth || el.offsetHeight || el.getClientRects().length)) continue;
+    const text = (el.innerText || el.textContent || '').replace(/\\s+/g, ' ').trim();
+    if (!text) continue;
+    elements.push(el);
+    texts.push([el.tagName.toLowerCase(), text]);
+}
+window.__textIndex = {token: token, elements: elements};
+return texts;
+"""
+
+RESOLVE_JS = """
+const [token, positions] = arguments;
+const index = window.__textIndex;
+if (!index || index.token !== token) return null;
+return positions.map(i => index.elements[i]);
+"""
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def _tokens(text):
+    return _TOKEN_RE.findall(text.lower())
+
+
+class TextIndex:
+    """Visible text of a page's interactive elements, searchable in Python."""
+
+    def __init__(self, driver, entries, token):
+        self.driver = driver
+        self.entries = entries  # [(tag, text)] in document order
+        self.token = token
+        self._lowered = [text.lower() for _, text in entries]
+
+    @classmethod
+    def collect(cls, driver, css=INTERACTIVE_CSS, scope=None):
+        """Build the index with one script call."""
+        token = uuid.uuid4().hex
+        entries = driver.execute_script(COLLECT_JS, css, scope, token) or []
+        return cls(driver, [tuple(entry) for entry in entries], token)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def search(self, query, mode="substring", threshold=0.8, limit=10):
+        """Return [(score, position, text)] best first: highest score, then shortest text, then document order.
+
+        mode: "substring" (query inside the text), "tokens" (every query word
+        present, any order) or "fuzzy" (difflib ratio of the closest window of
+        words, at least `threshold`).
+        """
+        query_lower = " ".join(query.lower().split())
+        query_tokens = _tokens(query)
+        hits = []
+        for position, text in enumerate(self._lowered):
+            if mode == "substring":
+                score = 1.0 if query_lower in text else 0.0
+            elif mode == "tokens":
+                words = set(_tokens(text))
+                score = 1.0 if all(token in words for token in query_tokens) else 0.0
+            elif mode == "fuzzy":
+                score = self._fuzzy(query_lower, query_tokens, text)
+                if score < threshold:
+                    score = 0.0
+            else:
+                raise ValueError(f"Unknown text search mode: {mode}")
+            if score:
+                # Prefer tighter matches: short labels over whole containers; then the first on the page
+                hits.append((score, -len(text), -position))
+        hits.sort(reverse=True)
+        return [(score, -position, self.entries[-position][1]) for score, _, position in hits[:limit]]
+
+    @staticmethod
+    def _fuzzy(query, query_tokens, text):
+        words = _tokens(text)
+        width = max(len(query_tokens), 1)
+        if len(words) <= width:
+            return difflib.SequenceMatcher(None, query, " ".join(words)).ratio()
+        best = 0.0
+        for start in range(len(words) - width + 1):
+            window = " ".join(words[start:start + width])
+            best = max(best, difflib.SequenceMatcher(None, query, window).ratio())
+        return best
+
+    def elements(self, positions):
+        """Fetch WebElements for positions in one call; None if the page changed since collect()."""
+        if not positions:
+            return []
+        return self.driver.execute_script(RESOLVE_JS, self.token, list(positions))
+
+
+def find_by_text(driver, query, mode="substring", css=INTERACTIVE_CSS, scope=None, threshold=0.8, limit=5,
+                 document_order=False):
+    """Collect, search and resolve in two round trips; returns [(WebElement, text)] (limit=None: all hits).
+
+    Hits come best first (see TextIndex.search), or in page order with document_order=True.
+    """
+    index = TextIndex.collect(driver, css=css, scope=scope)
+    hits = index.search(query, mode=mode, threshold=threshold, limit=limit)
+    if document_order:
+        hits.sort(key=lambda hit: hit[1])
+    elements = index.elements([position for _, position, _ in hits]) or []
+    return [(element, text) for element, (_, _, text) in zip(elements, hits) if element is not None]
@@ -0,0 +1,270 @@
+import os
+import sys
+import json
+import time
+import fnmatch
+import logging
+import argparse
+import threading
+
+from selenium.webdriver.support.ui import WebDriverWait
+
+from budget import bounded
+from run_log import DEFAULT_LOG_PATH, get_run_log
+
+# -------------------- Timeout Advisor --------------------
+# Timeouts derived from how long things actually took instead of magic
+# numbers. Every wizard step and every AdvisedWait is a "timing" event in the
+# run log; per key the advisor takes the p99 of the successful ones over the
+# last TIMEOUT_WINDOW_DAYS and proposes
+#
+#   clamp(p99 * TIMEOUT_FACTOR, TIMEOUT_FLOOR, TIMEOUT_CEILING)
+#
+# once a key has TIMEOUT_MIN_SAMPLES successes (the coded default before
+# that). A key that fails often keeps at least its default: its failures may
+# be timeouts that were too short, whose real duration was never seen.
+#
+# Keys are "<flow>/<step>" for wizard steps and "wait/<name>" for helper
+# waits. An override file (TIMEOUT_OVERRIDES, default timeouts.json) wins over
+# both; its keys may be glob patterns:
+#
+#   {"add_mission/job_title_and_description": 240, "wait/login.*": 10}
+#
+#   AdvisedWait(driver, "login.email", 8).until(...)    # instead of WebDriverWait(driver, bounded(8))
+#   python timeouts.py automation_log.jsonl             # print the current advice
+#
+# A fallback chain (the same element tried with several selectors) shares one
+# key through a WaitChain, which records the chain's outcome only: the time to
+# the element when the first selector matched, or one failure when none did.
+# Expected misses of the earlier selectors are not failures of the key, and a
+# later match is not a sample: its time is mostly the earlier tries' timeouts,
+# which would feed the timeout back into itself.
+#
+#   with WaitChain(driver, "login.email", 8) as chain:
+#       for locator in EMAIL_SELECTORS:
+#           try:
+#               email = chain.until(EC.presence_of_element_located(locator))
+#               break
+#           except TimeoutException:
+#               continue
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OVERRIDES_PATH = "timeouts.json"
+WAIT_FLOW = "wait"
+DAY = 86400
+
+
+class Sample:
+    __slots__ = ("count", "p99", "failure_rate")
+
+    def __init__(self, count, p99, failure_rate):
+        self.count = count
+        self.p99 = p99
+        self.failure_rate = failure_rate
+
+
+class TimeoutAdvisor:
+    """Per-key timeouts from recorded latency distributions, with overrides."""
+
+    def __init__(self, samples=None, overrides=None, factor=3.0, floor=2.0, ceiling=300.0, min_samples=20,
+                 max_failure_rate=0.05, enabled=True):
+        self.samples = samples or {}
+        self.overrides = overrides or {}
+        self.factor = factor
+        self.floor = floor
+        self.ceiling = ceiling
+        self.min_samples = min_samples
+        self.max_failure_rate = max_failure_rate
+        # Disabled: only overrides and coded defaults apply
+        self.enabled = enabled
+
+    @classmethod
+    def from_env(cls):
+        """Configured by TIMEOUT_* variables; samples from the run logs in TIMEOUT_LOGS (os.pathsep separated)."""
+        def number(name, default):
+            value = os.getenv(name)
+            return float(value) if value else default
+        enabled = os.getenv("TIMEOUT_ADVISOR", "1") != "0"
+        paths = os.getenv("TIMEOUT_LOGS", DEFAULT_LOG_PATH).split(os.pathsep)
+        samples = load_samples(paths, number("TIMEOUT_WINDOW_DAYS", 14)) if enabled else {}
+        return cls(samples, load_overrides(os.getenv("TIMEOUT_OVERRIDES", DEFAULT_OVERRIDES_PATH)),
+                   factor=number("TIMEOUT_FACTOR", 3.0), floor=number("TIMEOUT_FLOOR", 2.0),
+                   ceiling=number("TIMEOUT_CEILING", 300.0), min_samples=int(number("TIMEOUT_MIN_SAMPLES", 20)),
+                   max_failure_rate=number("TIMEOUT_MAX_FAILURE_RATE", 0.05), enabled=enabled)
+
+    def override(self, key):
+        if key in self.overrides:
+            return self.overrides[key]
+        for pattern, seconds in self.overrides.items():
+            if fnmatch.fnmatchcase(key, pattern):
+                return seconds
+        return None
+
+    def learned(self, key, default):
+        """p99-based timeout for key, or None while there is not enough data."""
+        sample = self.samples.get(key)
+        if not self.enabled or sample is None or sample.count < self.min_samples:
+            return None
+        seconds = min(max(sample.p99 * self.factor, self.floor), self.ceiling)
+        if sample.failure_rate > self.max_failure_rate:
+            seconds = max(seconds, default)
+        return seconds
+
+    def timeout(self, key, default):
+        """Seconds to wait for key: override, else learned, else default."""
+        override = self.override(key)
+        if override is not None:
+            return override
+        learned = self.learned(key, default)
+        return default if learned is None else learned
+
+    def report(self):
+        """One line per key with data: samples, failure rate, p99 and the timeout it gets."""
+        lines = [f"{'key':<56}{'ok':>6}{'fail%':>7}{'p99':>8}{'timeout':>9}"]
+        for key in sorted(self.samples):
+            sample = self.samples[key]
+            override = self.override(key)
+            learned = self.learned(key, 0.0)
+            if override is not None:
+                advice = f"{override:>8.1f}s (override)"
+            elif learned is None:
+                advice = f"{'default':>9} ({sample.count}/{self.min_samples} samples)"
+            else:
+                advice = f"{learned:>8.1f}s"
+            lines.append(f"{key:<56}{sample.count:>6}{sample.failure_rate * 100:>6.1f}%{sample.p99:>7.1f}s {advice}")
+        return "\n".join(lines)
+
+
+def load_samples(paths, window_days=14):
+    """{"flow/step": Sample} from run-log timing events of the last window_days."""
+    try:
+        import numpy as np
+        from run_stats import StepTable, aggregate, load
+    except ImportError as e:
+        logger.warning("Timeout advisor disabled, cannot aggregate run logs: %s", e)
+        return {}
+    try:
+        table = load([path for path in paths if path])
+    except OSError as e:
+        logger.warning("Timeout advisor could not read run logs: %s", e)
+        return {}
+    if window_days:
+        recent = table.ts >= time.time() - window_days * DAY
+        table = StepTable(table.groups, table.group[recent], table.ts[recent], table.duration[recent],
+                          table.ok[recent])
+    if not len(table):
+        return {}
+    stats = aggregate(table, percentiles=(99,))
+    return {f"{flow}/{step}": Sample(int(stats["ok_count"][code]), float(stats["p99"][code]),
+                                     float(stats["failure_rate"][code]))
+            for code, (flow, step) in enumerate(table.groups)
+            if stats["count"][code] and not np.isnan(stats["p99"][code])}
+
+
+def load_overrides(path):
+    """{key or glob: seconds} from a JSON file; missing file means no overrides."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            overrides = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning("Ignoring timeout overrides %s: %s", path, e)
+        return {}
+    return {str(key): float(value) for key, value in overrides.items()}
+
+
+_advisor = None
+_advisor_lock = threading.Lock()
+
+
+def get_timeout_advisor():
+    """Process-wide advisor; the run logs are read once, on first use."""
+    global _advisor
+    with _advisor_lock:
+        if _advisor is None:
+            _advisor = TimeoutAdvisor.from_env()
+        return _advisor
+
+
+def advised(key, default):
+    return get_timeout_advisor().timeout(key, default)
+
+
+# -------------------- Waits --------------------
+def record_wait(name, seconds, ok):
+    get_run_log().emit("timing", name, None, seconds, flow=WAIT_FLOW, ok=ok)
+
+
+class AdvisedWait(WebDriverWait):
+    """WebDriverWait with the advised timeout for wait/<name> (capped by the budget); records its duration."""
+
+    def __init__(self, driver, name, default, poll_frequency=0.5, ignored_exceptions=None):
+        self.name = name
+        super().__init__(driver, bounded(advised(f"{WAIT_FLOW}/{name}", default)), poll_frequency,
+                         ignored_exceptions)
+
+    def until(self, method, message=""):
+        return self._timed(super().until, method, message)
+
+    def until_not(self, method, message=""):
+        return self._timed(super().until_not, method, message)
+
+    def _timed(self, wait, method, message):
+        started = time.monotonic()
+        ok = False
+        try:
+            value = wait(method, message)
+            ok = True
+            return value
+        finally:
+            record_wait(self.name, time.monotonic() - started, ok)
+
+
+class WaitChain:
+    """Fallback waits under one wait/<name> key; each try gets the advised timeout, only the outcome is recorded.
+
+    A match of the first try is recorded as the chain's time to the element; a
+    later match is not recorded at all (neither a sample nor a failure).
+    """
+
+    def __init__(self, driver, name, default, poll_frequency=0.5):
+        self.driver = driver
+        self.name = name
+        self.default = default
+        self.poll_frequency = poll_frequency
+        self.started = None
+        self.tries = 0
+        self.matched = False
+
+    def __enter__(self):
+        self.started = time.monotonic()
+        return self
+
+    def until(self, method, message=""):
+        self.tries += 1
+        timeout = bounded(advised(f"{WAIT_FLOW}/{self.name}", self.default))
+        value = WebDriverWait(self.driver, timeout, self.poll_frequency).until(method, message)
+        if not self.matched:
+            self.matched = True
+            if self.tries == 1:
+                record_wait(self.name, time.monotonic() - self.started, True)
+        return value
+
+    def __exit__(self, *exc):
+        if not self.matched:
+            record_wait(self.name, time.monotonic() - self.started, False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show the timeouts derived from recorded step and wait durations")
+    parser.add_argument("paths", nargs="*", help="run-log JSONL files (default: TIMEOUT_LOGS)")
+    args = parser.parse_args(argv)
+    if args.paths:
+        os.environ["TIMEOUT_LOGS"] = os.pathsep.join(args.paths)
+    print(get_timeout_advisor().report())
+
+
+if __name__ == "__main__":
+    sys.exit(main())
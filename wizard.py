@@ -0,0 +1,300 @@
+import time
+import logging
+
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException, WebDriverException
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from budget import DEFAULT_FLOW_BUDGET, Budget, current
+from failure_capture import capture_failure
+from locators import Locator, clickable, visible
+from network_observer import get_observer
+from page_metrics import format_summary, get_page_metrics
+from run_log import get_run_log, new_session_id
+from timeouts import advised
+
+# -------------------- Wizard Step Engine --------------------
+# A multi-step form is declared as a list of Steps instead of nested ifs and
+# fixed sleeps. For each step the engine:
+#
+#   1. waits for `ready` (a Locator, a (By, value) tuple or any WebDriverWait
+#      condition) and hands the element to the actions,
+#   2. runs the actions; an action returning False fails the step,
+#   3. waits for the `backend` call the actions triggered, resolving the next
+#      step's `ready` element while the call is in flight,
+#   4. with `advances=True`, waits until no loading indicator is left and the
+#      step shows it moved on: the page content or the URL changed, or the
+#      `ready` element (usually the Next button) went away, got disabled or
+#      changed its label; then checks `success`.
+#
+# The flow runs inside a Budget (budget.py), nested in the caller's budget if
+# one is active, and each step inside a child budget of `timeout` seconds (or
+# what timeouts.py advises for "<flow>/<step>"), so helper waits called by the
+# actions are capped too.
+# Every step is timed and written to the run log as a "timing" event, together
+# with the page metrics (navigation timing, Web Vitals…) collected during it.
+#
+#   wizard = Wizard("add_talent", [
+#       Step("upload", ready=BROWSE_FILES, actions=[click_ready], backend=CV_UPLOAD_PATTERN),
+#       Step("parse", ready=NEXT_STEP, actions=[click_ready], advances=True),
+#   ])
+#   result = wizard.run(driver)
+
+logger = logging.getLogger(__name__)
+
+LOADING_CSS = ".loading, .spinner, [class*='load']"
+
+# Cheap signature of what the current step shows: headings, labels and fields
+FINGERPRINT_JS = """
+const parts = [];
+for (const el of document.querySelectorAll('h1, h2, h3, h4, h5, label, input, textarea, select, [role="combobox"]')) {
+    if (!(el.offsetWidth || el.offsetHeight || el.getClientRects().length)) continue;
+    const key = el.getAttribute('placeholder') || el.getAttribute('name') || el.textContent || '';
+    parts.push(el.tagName + ':' + key.trim().slice(0, 40));
+}
+return parts.join('|');
+"""
+
+SETTLED_JS = "return document.readyState === 'complete' && !document.querySelector(arguments[0]);"
+
+
+def as_condition(target, default=clickable):
+    """Turn a Locator, (By, value) tuple or condition callable into a WebDriverWait condition."""
+    if target is None or callable(target) and not isinstance(target, Locator):
+        return target
+    if isinstance(target, Locator):
+        return default(target)
+    return EC.element_to_be_clickable(target) if default is clickable else EC.visibility_of_element_located(target)
+
+
+def call(function, *args, **kwargs):
+    """Action that runs function(driver, *args, **kwargs)."""
+    def action(run):
+        return function(run.driver, *args, **kwargs)
+    action.__name__ = getattr(function, "__name__", "action")
+    return action
+
+
+class Step:
+    """One wizard step declared as data; `timeout` is the step's time budget."""
+
+    def __init__(self, name, actions=(), ready=None, success=None, timeout=15, backend=None,
+                 backend_start=10, advances=False, optional=False):
+        self.name = name
+        self.actions = list(actions)
+        self.ready = as_condition(ready)
+        self.success = as_condition(success, default=visible)
+        self.timeout = timeout
+        self.backend = backend
+        self.backend_start = backend_start
+        self.advances = advances
+        # An optional step's failure is reported but does not stop the flow
+        self.optional = optional
+
+    def __repr__(self):
+        return f"Step({self.name!r})"
+
+
+class StepRun:
+    """What an action sees: the driver, the element `ready` returned and data shared by the flow."""
+
+    def __init__(self, driver, step, element, data):
+        self.driver = driver
+        self.step = step
+        self.element = element
+        self.data = data
+
+
+class StepResult:
+    __slots__ = ("name", "ok", "duration", "reason", "backend", "optional", "perf")
+
+    def __init__(self, name, ok, duration, reason=None, backend=None, optional=False):
+        self.name = name
+        self.ok = ok
+        self.duration = duration
+        self.reason = reason
+        self.backend = backend
+        self.optional = optional
+        self.perf = None
+
+    def __repr__(self):
+        state = "ok" if self.ok else f"failed: {self.reason}"
+        return f"StepResult({self.name!r}, {self.duration:.2f}s, {state})"
+
+
+class WizardResult:
+    def __init__(self, name, steps, budget=None):
+        self.name = name
+        self.steps = steps
+        self.budget = budget
+
+    @property
+    def ok(self):
+        return all(step.ok or step.optional for step in self.steps)
+
+    @property
+    def failed(self):
+        """The step that stopped the flow, or None."""
+        return next((step for step in self.steps if not (step.ok or step.optional)), None)
+
+    @property
+    def duration(self):
+        return sum(step.duration for step in self.steps)
+
+    def summary(self):
+        lines = [f"{self.name}: {'ok' if self.ok else 'FAILED'} in {self.duration:.1f}s"]
+        if self.budget is not None:
+            lines[0] += f" (budget {self.budget.seconds:.0f}s)"
+        for step in self.steps:
+            status = "ok" if step.ok else f"FAILED ({step.reason})"
+            lines.append(f"  {step.name:<28} {step.duration:6.2f}s  {status}")
+        return "\n".join(lines)
+
+
+class _Prefetch:
+    """Resolve a step's `ready` condition once, between backend polls."""
+
+    def __init__(self, driver, step):
+        self.driver = driver
+        self.condition = step.ready if step is not None else None
+        self.element = None
+
+    def __call__(self):
+        if self.condition is None or self.element is not None:
+            return
+        try:
+            self.element = self.condition(self.driver) or None
+        except WebDriverException:
+            pass
+
+
+def _element_state(element):
+    """Visibility, enabled state and label of element; "stale" once it left the page."""
+    if element is None or element is True:
+        return None
+    try:
+        return element.is_displayed(), element.is_enabled(), element.text
+    except StaleElementReferenceException:
+        return "stale"
+    except (WebDriverException, AttributeError):
+        return None
+
+
+def _page_state(driver, element):
+    """What moving to the next step changes: the content fingerprint, the URL, the clicked element."""
+    return driver.execute_script(FINGERPRINT_JS), driver.current_url, _element_state(element)
+
+
+def _still_usable(element):
+    if element is None or element is True:
+        return None
+    try:
+        return element if element.is_displayed() and element.is_enabled() else None
+    except (WebDriverException, AttributeError):
+        return None
+
+
+class Wizard:
+    """Execute a declared sequence of Steps on a driver."""
+
+    def __init__(self, name, steps, reporter=None, poll_frequency=0.25, budget=None):
+        self.name = name
+        self.steps = list(steps)
+        # Flow budget in seconds; steps share it and none may run past it
+        self.budget = budget or DEFAULT_FLOW_BUDGET
+        # Anything with log_step/log_problem (e.g. AutomationLogger); plain logging otherwise
+        self.reporter = reporter
+        self.poll_frequency = poll_frequency
+
+    def run(self, driver, data=None):
+        """Run every step in order, stopping at the first required step that fails."""
+        data = {} if data is None else data
+        session_id = getattr(self.reporter, "session_id", None) or new_session_id()
+        writer = getattr(self.reporter, "writer", None) or get_run_log()
+        results = []
+        prefetched = None
+        # A caller's budget (a session, a monitor run) caps the whole flow
+        parent = current()
+        flow = parent.child(self.name, self.budget) if parent is not None else Budget(self.name, self.budget)
+        page_metrics = get_page_metrics(driver)
+        with flow.enter():
+            for index, step in enumerate(self.steps):
+                next_step = self.steps[index + 1] if index + 1 < len(self.steps) else None
+                with flow.child(step.name, advised(f"{self.name}/{step.name}", step.timeout)).enter() as budget:
+                    result, prefetched = self._run_step(driver, step, next_step, prefetched, data, budget)
+                result.perf = page_metrics.collect()
+                writer.emit("timing", step.name, session_id, result.duration, flow=self.name,
+                            ok=result.ok, reason=result.reason, backend=result.backend, perf=result.perf)
+                self._report(driver, step, result)
+                results.append(result)
+                if not result.ok and not step.optional:
+                    break
+        return WizardResult(self.name, results, flow)
+
+    def _wait(self, driver, condition, deadline, message):
+        timeout = max(deadline - time.monotonic(), 0)
+        return WebDriverWait(driver, timeout, poll_frequency=self.poll_frequency).until(condition, message)
+
+    def _run_step(self, driver, step, next_step, prefetched, data, budget):
+        start = time.monotonic()
+        deadline = budget.deadline
+        backend = None
+
+        def result(ok, reason=None):
+            if not ok and budget.expired:
+                limit = budget.limiting()
+                reason = f"budget '{limit.path}' ({limit.seconds:g}s) exhausted: {reason}"
+            return StepResult(step.name, ok, time.monotonic() - start, reason, backend, step.optional)
+
+        if budget.expired:
+            return result(False, "no time left before the step started"), None
+        try:
+            element = None
+            if step.ready is not None:
+                element = _still_usable(prefetched) or self._wait(driver, step.ready, deadline, "not ready")
+            before = _page_state(driver, element) if step.advances else None
+            observer = get_observer(driver) if step.backend else None
+            mark = observer.mark() if observer is not None else None
+            run = StepRun(driver, step, element, data)
+            for action in step.actions:
+                if action(run) is False:
+                    return result(False, f"{getattr(action, '__name__', 'action')} returned False"), None
+            prefetch = _Prefetch(driver, next_step)
+            if observer is not None:
+                start_timeout = min(step.backend_start, max(deadline - time.monotonic(), 0))
+                timing = observer.wait_for_request(step.backend, since=mark, start_timeout=start_timeout,
+                                                   finish_timeout=max(deadline - time.monotonic(), 0),
+                                                   name=step.name, on_idle=prefetch)
+                if timing is not None:
+                    backend = timing.duration
+                elif not observer.available:
+                    time.sleep(start_timeout)
+            if step.advances:
+                self._wait(driver, lambda d: d.execute_script(SETTLED_JS, LOADING_CSS)
+                           and _page_state(d, element) != before, deadline, "page did not advance")
+            if step.success is not None:
+                self._wait(driver, step.success, deadline, "success check failed")
+        except TimeoutException as e:
+            return result(False, e.msg or "timed out"), None
+        except Exception as e:
+            return result(False, str(e).splitlines()[0] if str(e) else type(e).__name__), None
+        return result(True), prefetch.element
+
+    def _report(self, driver, step, result):
+        if result.ok:
+            message = f"{self.name}: {step.name} done in {result.duration:.1f}s"
+            if result.backend is not None:
+                message += f" (backend {result.backend:.1f}s)"
+            if result.perf is not None:
+                message += f" [{format_summary(result.perf)}]"
+            if self.reporter is not None:
+                self.reporter.log_step(message)
+            else:
+                logger.info(message)
+            return
+        message = f"{self.name}: step '{step.name}' failed after {result.duration:.1f}s: {result.reason}"
+        if self.reporter is not None:
+            self.reporter.log_problem(message)
+        else:
+            logger.error(message)
+            capture_failure(driver, message)